@@ -0,0 +1,325 @@
+"""
+Read-only search over Mail's Envelope Index database.
+
+Mail keeps message metadata in an SQLite database. Its message ROWIDs are the
+same IDs AppleScript reports, so results can be passed to every other tool.
+The database is copied (with SQLite's online backup, so the copy is a
+consistent read) before it is queried so Mail's own locks are never held,
+and the copy is reused for a short time.
+"""
+
+import logging
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+from .exceptions import MailIndexUnavailableError
+
+logger = logging.getLogger(__name__)
+
+# Mail stores its data in a versioned directory (V2 ... V10 so far)
+DEFAULT_MAIL_DIR = Path.home() / "Library" / "Mail"
+
+_DATABASE_NAME = "Envelope Index"
+
+# Columns the search query relies on, by table
+_REQUIRED_COLUMNS = {
+    "messages": {"subject", "sender", "date_received", "read", "mailbox"},
+    "subjects": {"subject"},
+    "addresses": {"address", "comment"},
+    "mailboxes": {"url"},
+}
+
+
+# The sender as search results show it: "Name <address>", or just the address
+_SENDER_SQL = (
+    "CASE WHEN a.comment <> '' THEN a.comment || ' <' || a.address || '>' ELSE a.address END"
+)
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so a query matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class EnvelopeIndex:
+    """Searches a periodically refreshed copy of Mail's Envelope Index."""
+
+    def __init__(self, mail_dir: Path = DEFAULT_MAIL_DIR, ttl: float = 30.0) -> None:
+        """
+        Initialize the index reader. Nothing is read until the first search.
+
+        Args:
+            mail_dir: Mail's data directory (holding V* subdirectories)
+            ttl: Seconds a copy of the database is reused before refreshing
+        """
+        self.mail_dir = mail_dir
+        self.ttl = ttl
+        # Guards the copy's state; _refresh_lock is held while a copy is made
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._snapshot_dir: Path | None = None
+        self._copied_at: float | None = None
+        self._has_deleted_column = False
+        # Set once the schema is found unusable; the copy is not retried
+        self._schema_error: str | None = None
+
+    def _find_database(self) -> Path:
+        """Return the Envelope Index of the newest Mail data version."""
+        candidates = []
+        for path in self.mail_dir.glob(f"V*/MailData/{_DATABASE_NAME}"):
+            match = re.fullmatch(r"V(\d+)", path.parent.parent.name)
+            if match:
+                candidates.append((int(match.group(1)), path))
+        if not candidates:
+            raise MailIndexUnavailableError(f"No {_DATABASE_NAME} found under {self.mail_dir}")
+        return max(candidates)[1]
+
+    def _snapshot(self) -> Path:
+        """
+        Return a fresh enough private copy of the database.
+
+        A stale copy is refreshed by backing the database up into a new file
+        and swapping it in, without holding the lock queries need, so a slow
+        copy of a large index does not stall other searches: while one caller
+        refreshes, the others keep reading the previous copy.
+
+        Raises:
+            MailIndexUnavailableError: If the database cannot be found or copied
+        """
+        with self._lock:
+            if self._schema_error is not None:
+                raise MailIndexUnavailableError(self._schema_error)
+            if self._snapshot_dir is None:
+                self._snapshot_dir = Path(tempfile.mkdtemp(prefix="apple-mail-mcp-index-"))
+            snapshot_dir = self._snapshot_dir
+            copy = snapshot_dir / _DATABASE_NAME
+            if self._is_fresh():
+                return copy
+            stale_copy_usable = self._copied_at is not None
+
+        if not self._refresh_lock.acquire(blocking=not stale_copy_usable):
+            return copy
+        try:
+            with self._lock:
+                # Refreshed by another caller while this one waited
+                if self._is_fresh():
+                    return copy
+
+            source = self._find_database()
+            new_copy = snapshot_dir / f"{_DATABASE_NAME}.new"
+            try:
+                new_copy.unlink(missing_ok=True)
+                # The backup reads the database and its write-ahead log in one
+                # read transaction, so the copy cannot mix pages from different
+                # commits
+                with closing(sqlite3.connect(f"{source.as_uri()}?mode=ro", uri=True)) as conn:
+                    with closing(sqlite3.connect(new_copy)) as copy_conn:
+                        conn.backup(copy_conn)
+            except (OSError, sqlite3.Error) as e:
+                raise MailIndexUnavailableError(f"Cannot copy {source}: {e}") from e
+
+            logger.debug("Refreshed copy of %s", source)
+            self._check_schema(new_copy)
+            with self._lock:
+                if self._snapshot_dir != snapshot_dir:
+                    raise MailIndexUnavailableError(f"{_DATABASE_NAME} reader was closed")
+                new_copy.replace(copy)
+                self._copied_at = time.monotonic()
+            return copy
+        finally:
+            self._refresh_lock.release()
+
+    def _is_fresh(self) -> bool:
+        """Check whether the current copy is within its TTL (caller holds the lock)."""
+        return self._copied_at is not None and time.monotonic() - self._copied_at < self.ttl
+
+    def _check_schema(self, database: Path) -> None:
+        """Ensure the copied database has the tables and columns the query uses."""
+        try:
+            with closing(sqlite3.connect(database)) as conn:
+                for table, columns in _REQUIRED_COLUMNS.items():
+                    found = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                    missing = columns - found
+                    if missing:
+                        self._schema_error = (
+                            f"Unsupported {_DATABASE_NAME} schema: "
+                            f"{table} lacks {', '.join(sorted(missing))}"
+                        )
+                        raise MailIndexUnavailableError(self._schema_error)
+                    if table == "messages":
+                        self._has_deleted_column = "deleted" in found
+        except sqlite3.Error as e:
+            raise MailIndexUnavailableError(f"Cannot read {_DATABASE_NAME}: {e}") from e
+
+    def search(
+        self, account_id: str, mailbox: str, query: str, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """
+        Find messages whose subject or sender contains a string.
+
+        Args:
+            account_id: Account ID (the AppleScript ``id`` of the account)
+            mailbox: Mailbox name
+            query: Text to look for (case-insensitive)
+            limit: Maximum results, newest first
+
+        Returns:
+            Message dictionaries shaped like search_messages results, with
+            date_received in ISO 8601 form
+
+        Raises:
+            MailIndexUnavailableError: If the index cannot be used, including
+                when it does not know the mailbox
+        """
+        pattern = f"%{_escape_like(query)}%"
+        return self._query(
+            account_id,
+            mailbox,
+            "(s.subject LIKE ? ESCAPE '\\' OR a.address LIKE ? ESCAPE '\\'"
+            " OR a.comment LIKE ? ESCAPE '\\')",
+            [pattern, pattern, pattern],
+            limit,
+        )
+
+    def find(
+        self,
+        account_id: str,
+        mailbox: str,
+        sender_contains: str | None = None,
+        subject_contains: str | None = None,
+        read_status: bool | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Find messages matching every given filter, like search_messages.
+
+        The sender filter is matched against the sender as search_messages
+        reports it ("Name <address>"), so both return the same messages.
+
+        Args:
+            account_id: Account ID (the AppleScript ``id`` of the account)
+            mailbox: Mailbox name
+            sender_contains: Text the sender must contain (case-insensitive)
+            subject_contains: Text the subject must contain (case-insensitive)
+            read_status: Only messages with this read status
+            limit: Maximum results, newest first (all if None)
+
+        Returns:
+            Message dictionaries shaped like search_messages results, with
+            date_received in ISO 8601 form
+
+        Raises:
+            MailIndexUnavailableError: If the index cannot be used, including
+                when it does not know the mailbox
+        """
+        conditions = []
+        params: list[Any] = []
+        if sender_contains:
+            conditions.append(f"{_SENDER_SQL} LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(sender_contains)}%")
+        if subject_contains:
+            conditions.append("s.subject LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escape_like(subject_contains)}%")
+        if read_status is not None:
+            conditions.append("m.read = ?")
+            params.append(int(read_status))
+        return self._query(
+            account_id, mailbox, " AND ".join(conditions) or "1", params, limit or -1
+        )
+
+    def _query(
+        self,
+        account_id: str,
+        mailbox: str,
+        condition: str,
+        params: list[Any],
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """
+        Run a message query against one mailbox of the database copy.
+
+        Args:
+            account_id: Account ID (the AppleScript ``id`` of the account)
+            mailbox: Mailbox name
+            condition: SQL condition over messages m, subjects s and addresses a
+            params: Values for the condition's placeholders
+            limit: Maximum results, newest first (-1 for all)
+
+        Returns:
+            Message dictionaries shaped like search_messages results
+
+        Raises:
+            MailIndexUnavailableError: If the index cannot be used, including
+                when it does not know the mailbox
+        """
+        database = self._snapshot()
+        try:
+            with closing(sqlite3.connect(database)) as conn:
+                mailbox_ids = [
+                    rowid
+                    for rowid, url in conn.execute("SELECT ROWID, url FROM mailboxes")
+                    if self._url_matches(url, account_id, mailbox)
+                ]
+                if not mailbox_ids:
+                    raise MailIndexUnavailableError(
+                        f"Mailbox {mailbox!r} not found in {_DATABASE_NAME}"
+                    )
+
+                placeholders = ", ".join("?" * len(mailbox_ids))
+                deleted_filter = "AND m.deleted = 0" if self._has_deleted_column else ""
+                rows = conn.execute(
+                    f"""
+                    SELECT m.ROWID, s.subject, a.address, a.comment, m.date_received, m.read
+                    FROM messages m
+                    JOIN subjects s ON m.subject = s.ROWID
+                    JOIN addresses a ON m.sender = a.ROWID
+                    WHERE m.mailbox IN ({placeholders}) {deleted_filter}
+                      AND {condition}
+                    ORDER BY m.date_received DESC
+                    LIMIT ?
+                    """,
+                    [*mailbox_ids, *params, limit],
+                ).fetchall()
+        except sqlite3.Error as e:
+            raise MailIndexUnavailableError(f"{_DATABASE_NAME} query failed: {e}") from e
+
+        return [
+            {
+                "id": str(rowid),
+                "subject": subject or "",
+                "sender": f"{comment} <{address}>" if comment else address or "",
+                "date_received": datetime.fromtimestamp(date_received).isoformat(),
+                "read_status": bool(read),
+            }
+            for rowid, subject, address, comment, date_received, read in rows
+        ]
+
+    @staticmethod
+    def _url_matches(url: str | None, account_id: str, mailbox: str) -> bool:
+        """Check whether a mailbox URL (e.g. imap://<account id>/INBOX) is the mailbox."""
+        if not url:
+            return False
+        parts = urlsplit(url)
+        return parts.netloc == account_id and unquote(parts.path).strip("/") == mailbox
+
+    def invalidate(self) -> None:
+        """Make the next search copy the database again, e.g. after messages changed."""
+        with self._lock:
+            self._copied_at = None
+
+    def close(self) -> None:
+        """Delete the database copy."""
+        with self._lock:
+            if self._snapshot_dir is not None:
+                shutil.rmtree(self._snapshot_dir, ignore_errors=True)
+                self._snapshot_dir = None
+                self._copied_at = None
@@ -33,6 +33,12 @@ class MailAppleScriptError(MailError):
     pass
 
 
+class MailIndexUnavailableError(MailError):
+    """Mail's Envelope Index is missing, unreadable or has an unknown schema."""
+
+    pass
+
+
 class MailPermissionError(MailError):
     """Permission denied for operation."""
 
@@ -2,45 +2,1311 @@
 AppleScript-based connector for Apple Mail.
 """
 
+import base64
+import codecs
+import concurrent.futures
+import functools
+import hashlib
+import itertools
 import json
 import logging
+import os
+import re
+import select
+import shutil
+import stat
 import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal, overload
 
+from .envelope_index import EnvelopeIndex
 from .exceptions import (
     MailAccountNotFoundError,
     MailAppleScriptError,
+    MailError,
+    MailIndexUnavailableError,
     MailMailboxNotFoundError,
     MailMessageNotFoundError,
 )
-from .utils import escape_applescript_string, sanitize_input
+from .security import (
+    MAX_ATTACHMENT_SIZE,
+    validate_attachment_size,
+    validate_attachment_type,
+)
+from .utils import (
+    FLAG_INDEXES,
+    find_invalid_email,
+    sanitize_input,
+    sanitize_mailbox_name,
+)
 
 logger = logging.getLogger(__name__)
 
+# Field and record separators (ASCII US/RS) used in structured script output.
+# Neither can appear in Mail metadata, unlike "|" or newlines.
+_FIELD_SEP = b"\x1f"
+_RECORD_SEP = b"\x1e"
+_SEPARATORS_APPLESCRIPT = """
+set fieldSep to ASCII character 31
+set recordSep to ASCII character 30
+"""
+
+# Replaces separator characters inside free text (subjects, senders, names) with
+# spaces so a field can never split a record. Text without them is returned as
+# is after a single containment check.
+_CLEAN_FIELD_HANDLER = """
+on cleanField(fieldText)
+    set fieldText to fieldText as text
+    if fieldText does not contain (ASCII character 30) and fieldText does not contain (ASCII character 31) then return fieldText
+    set AppleScript's text item delimiters to {ASCII character 30, ASCII character 31}
+    set fieldParts to text items of fieldText
+    set AppleScript's text item delimiters to " "
+    set fieldText to fieldParts as text
+    set AppleScript's text item delimiters to ""
+    return fieldText
+end cleanField
+"""
+
+# Joins message properties read in bulk (one list per property, in the
+# msg* globals) into separator-delimited records, keeping only messages whose
+# read status is wantedRead unless it is missing value. Dates are written as
+# ISO 8601 local time, the form the Envelope Index reader returns. The lists
+# are globals and read through "my" because item access on a plain local list
+# copies it, which makes the loop quadratic on large mailboxes.
+_MESSAGE_RECORDS_HANDLER = """
+global fieldSep, recordSep, msgIds, msgSubjects, msgSenders, msgDates, msgReads, resultList
+
+on messageRecords(msgCount, wantedRead)
+    set resultList to {}
+    repeat with i from 1 to msgCount
+        set msgRead to item i of my msgReads
+        if wantedRead is missing value or msgRead is wantedRead then
+            set end of my resultList to ((item i of my msgIds) as text) & fieldSep & my cleanField(item i of my msgSubjects) & fieldSep & my cleanField(item i of my msgSenders) & fieldSep & ((item i of my msgDates) as «class isot» as string) & fieldSep & msgRead
+        end if
+    end repeat
+    set AppleScript's text item delimiters to recordSep
+    set output to resultList as text
+    set AppleScript's text item delimiters to ""
+    return output
+end messageRecords
+"""
+
+# Errors raised when an account (typically Exchange) rejects a whose clause.
+# Mail reports these with either a straight or a typographic apostrophe.
+_WHOSE_ERROR_RE = re.compile(
+    r"illegal comparison or logical"
+    r"|^(?=.*can['’]t get items)(?=.*whose)"
+    r"|^(?=.*whose)(?=.*\(-1728\))",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Handler turning a comma-separated argv value into a list of integer IDs
+_ID_LIST_HANDLER = """
+on idList(idText)
+    if idText is "" then return {}
+    set AppleScript's text item delimiters to ","
+    set idItems to text items of idText
+    set AppleScript's text item delimiters to ""
+    set ids to {}
+    repeat with idItem in idItems
+        set end of ids to (idItem as integer)
+    end repeat
+    return ids
+end idList
+"""
+
+# Returns the IDs of idList that are not in removeIds.
+_WITHOUT_IDS_HANDLER = """
+on withoutIds(idList, removeIds)
+    set kept to {}
+    repeat with msgId in idList
+        if removeIds does not contain (contents of msgId) then set end of kept to contents of msgId
+    end repeat
+    return kept
+end withoutIds
+"""
+
+
+# Applies one action to messages grouped by mailbox. argv holds the
+# comma-separated IDs with no known location, the action name and its two
+# arguments, then (account, mailbox, IDs) triples (see
+# AppleMailConnector._run_message_action). Actions and their arguments:
+#   read        "true"/"false"
+#   flag        flag index, "true"/"false" flagged status
+#   move        destination account, destination mailbox
+#   copy_delete destination account, destination mailbox (Gmail-style move)
+#   delete      -
+# Each group gets one bulk action on `(messages of mb whose id is in idList)`,
+# falling back to `msg` references one at a time for mailboxes that reject the
+# whose clause. A group with an empty mailbox, and the unlocated IDs, are
+# searched one mailbox after another (within that account, or across all
+# accounts); IDs are dropped from the search once found, so a message moved or
+# deleted into a later mailbox is never acted on twice. The source never
+# changes, so it is parsed and compiled once however the action varies.
+_MESSAGE_ACTION_SCRIPT = f"""
+{_ID_LIST_HANDLER}
+{_WITHOUT_IDS_HANDLER}
+
+global actionName, actionArg1, actionArg2, destMailbox
+
+on actOnMatches(mb, idList)
+    tell application "Mail"
+        if actionName is "read" then
+            set read status of (messages of mb whose id is in idList) to (actionArg1 is "true")
+        else if actionName is "flag" then
+            set flag index of (messages of mb whose id is in idList) to (actionArg1 as integer)
+            set flagged status of (messages of mb whose id is in idList) to (actionArg2 is "true")
+        else if actionName is "move" then
+            move (messages of mb whose id is in idList) to destMailbox
+        else if actionName is "copy_delete" then
+            duplicate (messages of mb whose id is in idList) to destMailbox
+            delete (messages of mb whose id is in idList)
+        else if actionName is "delete" then
+            delete (messages of mb whose id is in idList)
+        end if
+    end tell
+end actOnMatches
+
+on actOnMessage(msg)
+    tell application "Mail"
+        if actionName is "read" then
+            set read status of msg to (actionArg1 is "true")
+        else if actionName is "flag" then
+            set flag index of msg to (actionArg1 as integer)
+            set flagged status of msg to (actionArg2 is "true")
+        else if actionName is "move" then
+            set mailbox of msg to destMailbox
+        else if actionName is "copy_delete" then
+            duplicate msg to destMailbox
+            delete msg
+        else if actionName is "delete" then
+            delete msg
+        end if
+    end tell
+end actOnMessage
+
+on applyTo(mb, idList)
+    tell application "Mail"
+        try
+            set foundIds to id of (messages of mb whose id is in idList)
+            if (count of foundIds) > 0 then my actOnMatches(mb, idList)
+            return foundIds
+        on error
+            set foundIds to {{}}
+            repeat with msgId in idList
+                try
+                    set msg to message id (contents of msgId) of mb
+                    my actOnMessage(msg)
+                    set end of foundIds to contents of msgId
+                end try
+            end repeat
+            return foundIds
+        end try
+    end tell
+end applyTo
+
+on searchMailboxes(mbList, idList)
+    set found to {{}}
+    set remaining to idList
+    repeat with mb in mbList
+        set foundIds to my applyTo(mb, remaining)
+        if (count of foundIds) > 0 then
+            set found to found & foundIds
+            set remaining to my withoutIds(remaining, foundIds)
+            if remaining is {{}} then exit repeat
+        end if
+    end repeat
+    return found
+end searchMailboxes
+
+on run argv
+    set actionName to item 2 of argv
+    set actionArg1 to item 3 of argv
+    set actionArg2 to item 4 of argv
+    set updateCount to 0
+    tell application "Mail"
+        if actionName is "move" or actionName is "copy_delete" then
+            set destMailbox to mailbox actionArg2 of account actionArg1
+        end if
+
+        repeat with groupStart from 5 to (count of argv) by 3
+            set groupMailbox to item (groupStart + 1) of argv
+            set groupIds to my idList(item (groupStart + 2) of argv)
+            try
+                set acc to account (item groupStart of argv)
+                if groupMailbox is "" then
+                    set foundIds to my searchMailboxes(mailboxes of acc, groupIds)
+                else
+                    set foundIds to my applyTo(mailbox groupMailbox of acc, groupIds)
+                end if
+                set updateCount to updateCount + (count of foundIds)
+            end try
+        end repeat
+
+        set remaining to my idList(item 1 of argv)
+        repeat with acc in accounts
+            if remaining is {{}} then exit repeat
+            set foundIds to my searchMailboxes(mailboxes of acc, remaining)
+            set updateCount to updateCount + (count of foundIds)
+            set remaining to my withoutIds(remaining, foundIds)
+        end repeat
+    end tell
+    return updateCount
+end run
+"""
+
+# Action arguments (flag index, flagged status) for each flag color, so
+# flag_message only looks them up
+_FLAG_ACTION_ARGS = {
+    color: (str(index), "false" if index < 0 else "true")
+    for color, index in FLAG_INDEXES.items()
+}
+
+# Sets msg to the message identified by the first three argv items (see
+# AppleMailConnector._locate_args). The cached location is tried first with a
+# direct `message id N` reference; otherwise each account is searched with one
+# whose query across all of its mailboxes, falling back to a per-mailbox
+# `message id N` lookup for accounts that reject it (e.g. Exchange).
+# An account with an empty mailbox restricts the search to that account.
+_LOCATE_MESSAGE_APPLESCRIPT = """
+set targetId to (item 1 of argv) as integer
+set cachedAccount to item 2 of argv
+set cachedMailbox to item 3 of argv
+set msg to missing value
+set searchAccounts to accounts
+if cachedAccount is not "" then
+    if cachedMailbox is "" then
+        set searchAccounts to {account cachedAccount}
+    else
+        try
+            set msg to message id targetId of mailbox cachedMailbox of account cachedAccount
+            get id of msg
+        on error
+            set msg to missing value
+        end try
+    end if
+end if
+if msg is missing value then
+    repeat with acc in searchAccounts
+        try
+            set mailboxHits to (messages of every mailbox of acc whose id is targetId)
+        on error
+            set mailboxHits to {}
+            repeat with mb in mailboxes of acc
+                try
+                    set candidate to message id targetId of mb
+                    get id of candidate
+                    set end of mailboxHits to {candidate}
+                end try
+                -- IDs are unique, so stop at the first mailbox holding it
+                if mailboxHits is not {} then exit repeat
+            end repeat
+        end try
+        repeat with hitList in mailboxHits
+            if (count of hitList) > 0 then
+                set msg to item 1 of hitList
+                exit repeat
+            end if
+        end repeat
+        if msg is not missing value then exit repeat
+    end repeat
+end if
+if msg is missing value then error "Message not found"
+"""
+
+# Returns the metadata of the message located from argv items 1-3. When item 4
+# is a file path the body is written there as UTF-8 rather than returned, so
+# large bodies skip AppleScript string concatenation and the stdout pipe.
+_GET_MESSAGE_SCRIPT = f"""
+{_CLEAN_FIELD_HANDLER}
+
+on run argv
+    {_SEPARATORS_APPLESCRIPT}
+    set bodyPath to item 4 of argv
+    tell application "Mail"
+        {_LOCATE_MESSAGE_APPLESCRIPT}
+        set mb to mailbox of msg
+
+        set msgId to id of msg as text
+        set msgSubject to my cleanField(subject of msg)
+        set msgSender to my cleanField(sender of msg)
+        set msgDate to date received of msg as text
+        set msgRead to read status of msg
+        set msgFlagged to flagged status of msg
+        if bodyPath is not "" then set msgContent to content of msg
+
+        set output to msgId & fieldSep & msgSubject & fieldSep & msgSender & fieldSep & msgDate & fieldSep & msgRead & fieldSep & msgFlagged & fieldSep & my cleanField(name of account of mb) & fieldSep & my cleanField(name of mb)
+    end tell
+    if bodyPath is not "" then
+        set bodyFile to open for access (POSIX file bodyPath) with write permission
+        try
+            set eof of bodyFile to 0
+            write msgContent to bodyFile as «class utf8»
+        on error errMsg number errNum
+            close access bodyFile
+            error errMsg number errNum
+        end try
+        close access bodyFile
+    end if
+    return output
+end run
+"""
+
+# Returns metadata records for many messages in one pass. argv holds the
+# comma-separated IDs with no known location, a body file path (or ""), then
+# (account, mailbox, IDs) triples. Each mailbox is queried once with
+# `whose id is in`; bodies are appended to the file in record order, each
+# followed by a record separator.
+_GET_MESSAGES_SCRIPT = f"""
+{_ID_LIST_HANDLER}
+{_WITHOUT_IDS_HANDLER}
+{_CLEAN_FIELD_HANDLER}
+
+global fieldSep, recordSep, bodyFile, resultList
+
+on writeBody(bodyText)
+    write bodyText to bodyFile as «class utf8»
+    write recordSep to bodyFile as «class utf8»
+end writeBody
+
+on collect(mb, idList)
+    tell application "Mail"
+        try
+            set matched to (messages of mb whose id is in idList)
+        on error
+            set matched to {{}}
+            repeat with msgId in idList
+                try
+                    set candidate to message id (contents of msgId) of mb
+                    get id of candidate
+                    set end of matched to candidate
+                end try
+            end repeat
+        end try
+        set foundIds to {{}}
+        set mbName to my cleanField(name of mb)
+        set accName to my cleanField(name of account of mb)
+        repeat with msg in matched
+            set msgId to id of msg
+            set end of foundIds to msgId
+            set msgSubject to my cleanField(subject of msg)
+            set msgSender to my cleanField(sender of msg)
+            set msgDate to date received of msg as text
+            set msgRead to read status of msg
+            set msgFlagged to flagged status of msg
+            set end of resultList to (msgId as text) & fieldSep & msgSubject & fieldSep & msgSender & fieldSep & msgDate & fieldSep & msgRead & fieldSep & msgFlagged & fieldSep & accName & fieldSep & mbName
+            if bodyFile is not missing value then my writeBody(my cleanField(content of msg))
+        end repeat
+        return foundIds
+    end tell
+end collect
+
+on collectFrom(mbList, idList)
+    set found to {{}}
+    set remaining to idList
+    repeat with mb in mbList
+        set foundIds to my collect(mb, remaining)
+        if (count of foundIds) > 0 then
+            set found to found & foundIds
+            set remaining to my withoutIds(remaining, foundIds)
+            if remaining is {{}} then exit repeat
+        end if
+    end repeat
+    return found
+end collectFrom
+
+on run argv
+    {_SEPARATORS_APPLESCRIPT}
+    set resultList to {{}}
+    set bodyFile to missing value
+    if (item 2 of argv) is not "" then
+        set bodyFile to open for access (POSIX file (item 2 of argv)) with write permission
+        set eof of bodyFile to 0
+    end if
+    try
+        tell application "Mail"
+            repeat with groupStart from 3 to (count of argv) by 3
+                set groupMailbox to item (groupStart + 1) of argv
+                set groupIds to my idList(item (groupStart + 2) of argv)
+                try
+                    set acc to account (item groupStart of argv)
+                    if groupMailbox is "" then
+                        my collectFrom(mailboxes of acc, groupIds)
+                    else
+                        my collect(mailbox groupMailbox of acc, groupIds)
+                    end if
+                end try
+            end repeat
+
+            set remaining to my idList(item 1 of argv)
+            repeat with acc in accounts
+                if remaining is {{}} then exit repeat
+                set remaining to my withoutIds(remaining, my collectFrom(mailboxes of acc, remaining))
+            end repeat
+        end tell
+    on error errMsg number errNum
+        if bodyFile is not missing value then close access bodyFile
+        error errMsg number errNum
+    end try
+    if bodyFile is not missing value then close access bodyFile
+
+    set AppleScript's text item delimiters to recordSep
+    set output to resultList as text
+    set AppleScript's text item delimiters to ""
+    return output
+end run
+"""
+
+# Returns the names of all accounts, one per record
+_ACCOUNT_NAMES_SCRIPT = f"""
+{_SEPARATORS_APPLESCRIPT}
+tell application "Mail"
+    set AppleScript's text item delimiters to recordSep
+    set output to (name of every account) as text
+    set AppleScript's text item delimiters to ""
+    return output
+end tell
+"""
+
+# Returns the ID of the account named in argv
+_ACCOUNT_ID_SCRIPT = """
+on run argv
+    tell application "Mail" to return id of account (item 1 of argv)
+end run
+"""
+
+# Returns one record per account: its name followed by its email addresses.
+# Each property is read for every account with a single Apple Event.
+_LIST_ACCOUNTS_SCRIPT = f"""
+{_CLEAN_FIELD_HANDLER}
+
+on run
+    {_SEPARATORS_APPLESCRIPT}
+    tell application "Mail"
+        set accountNames to name of every account
+        set accountEmails to email addresses of every account
+    end tell
+
+    set resultList to {{}}
+    repeat with i from 1 to count of accountNames
+        set fieldList to {{my cleanField(item i of accountNames)}}
+        repeat with addr in item i of accountEmails
+            set end of fieldList to my cleanField(addr)
+        end repeat
+        set AppleScript's text item delimiters to fieldSep
+        set end of resultList to fieldList as text
+    end repeat
+
+    set AppleScript's text item delimiters to recordSep
+    set output to resultList as text
+    set AppleScript's text item delimiters to ""
+    return output
+end run
+"""
+
+# Returns one (name, unread count) record per mailbox of the account in argv
+_LIST_MAILBOXES_SCRIPT = f"""
+{_CLEAN_FIELD_HANDLER}
+
+on run argv
+    {_SEPARATORS_APPLESCRIPT}
+    tell application "Mail"
+        set accountRef to account (item 1 of argv)
+        set mbNames to name of every mailbox of accountRef
+        set mbUnread to unread count of every mailbox of accountRef
+    end tell
+
+    set resultList to {{}}
+    repeat with i from 1 to count of mbNames
+        set end of resultList to my cleanField(item i of mbNames) & fieldSep & (item i of mbUnread)
+    end repeat
+
+    set AppleScript's text item delimiters to recordSep
+    set output to resultList as text
+    set AppleScript's text item delimiters to ""
+    return output
+end run
+"""
+
+# Creates mailbox argv item 3 in account item 1, inside mailbox item 2 or at
+# the top level when item 2 is empty
+_CREATE_MAILBOX_SCRIPT = """
+on run argv
+    set {accountName, parentName, mailboxName} to argv
+    tell application "Mail"
+        set accountRef to account accountName
+        if parentName is "" then
+            set containerRef to accountRef
+        else
+            set containerRef to mailbox parentName of accountRef
+        end if
+        make new mailbox at containerRef with properties {name:mailboxName}
+        return "success"
+    end tell
+end run
+"""
+
+# Returns name, MIME type, size and downloaded flag of each attachment of the
+# message located from argv items 1-3
+_GET_ATTACHMENTS_SCRIPT = f"""
+{_CLEAN_FIELD_HANDLER}
+
+on run argv
+    {_SEPARATORS_APPLESCRIPT}
+    tell application "Mail"
+        {_LOCATE_MESSAGE_APPLESCRIPT}
+        set attList to mail attachments of msg
+
+        set resultList to {{}}
+        repeat with att in attList
+            set attName to my cleanField(name of att)
+            set attType to MIME type of att
+            set attSize to file size of att
+            set attDownloaded to downloaded of att
+
+            set attData to attName & fieldSep & attType & fieldSep & attSize & fieldSep & attDownloaded
+            set end of resultList to attData
+        end repeat
+
+        -- Join records
+        set AppleScript's text item delimiters to recordSep
+        set output to resultList as text
+        set AppleScript's text item delimiters to ""
+
+        return output
+    end tell
+end run
+"""
+
+# Saves attachments of the message located from argv items 1-3 into the
+# directory in item 4 and returns how many were saved. Item 5 lists 1-based
+# attachment indices, comma-separated; "" saves them all.
+_SAVE_ATTACHMENTS_SCRIPT = f"""
+{_ID_LIST_HANDLER}
+
+on run argv
+    set saveDir to item 4 of argv
+    set wanted to my idList(item 5 of argv)
+    tell application "Mail"
+        {_LOCATE_MESSAGE_APPLESCRIPT}
+        set attList to mail attachments of msg
+        if wanted is not {{}} then
+            set picked to {{}}
+            repeat with attIndex in wanted
+                set end of picked to item attIndex of attList
+            end repeat
+            set attList to picked
+        end if
+        set saveCount to 0
+
+        repeat with att in attList
+            try
+                set attName to name of att
+                save att in (saveDir & "/" & attName)
+                set saveCount to saveCount + 1
+            end try
+        end repeat
+
+        return saveCount
+    end tell
+end run
+"""
+
+# Replies to the message located from argv items 1-3 and sends the reply,
+# returning its ID. Item 4 is the body and item 5 "true" to reply to all
+# recipients; Mail's reply command takes care of quoting the original.
+_REPLY_SCRIPT = f"""
+on run argv
+    set replyBody to item 4 of argv
+    set replyAll to (item 5 of argv) is "true"
+    tell application "Mail"
+        {_LOCATE_MESSAGE_APPLESCRIPT}
+        set replyMsg to reply msg reply to all replyAll
+        set content of replyMsg to replyBody
+        set replyId to id of replyMsg
+        send replyMsg
+        return replyId
+    end tell
+end run
+"""
+
+# Forwards the message located from argv items 1-3 and sends it, returning its
+# ID. Item 4 is text put before the forwarded content ("" for none); items 5-7
+# are the linefeed-separated To, CC and BCC addresses.
+_FORWARD_SCRIPT = f"""
+on run argv
+    set fwdBody to item 4 of argv
+    set toList to paragraphs of (item 5 of argv)
+    set ccList to paragraphs of (item 6 of argv)
+    set bccList to paragraphs of (item 7 of argv)
+    tell application "Mail"
+        {_LOCATE_MESSAGE_APPLESCRIPT}
+        set fwdMsg to forward msg
+        if fwdBody is not "" then
+            set origContent to content of fwdMsg
+            set content of fwdMsg to fwdBody & return & return & origContent
+        end if
+
+        repeat with addr in toList
+            make new to recipient at end of to recipients of fwdMsg with properties {{address:(contents of addr)}}
+        end repeat
+        repeat with addr in ccList
+            make new cc recipient at end of cc recipients of fwdMsg with properties {{address:(contents of addr)}}
+        end repeat
+        repeat with addr in bccList
+            make new bcc recipient at end of bcc recipients of fwdMsg with properties {{address:(contents of addr)}}
+        end repeat
+
+        set fwdId to id of fwdMsg
+        send fwdMsg
+        return fwdId
+    end tell
+end run
+"""
+
+# Maximum number of message locations remembered by a connector
+_LOCATION_CACHE_SIZE = 4096
+
+# Maximum number of search_messages results kept for reuse
+_SEARCH_CACHE_SIZE = 256
+
+# Number of distinct one-off script hashes remembered while waiting to see a
+# script a second time before compiling it (see _compiled_script)
+_SEEN_SCRIPTS_SIZE = 256
+
+# Where the server remembers accounts that reject whose clauses between runs
+DEFAULT_WHOSE_CACHE_PATH = (
+    Path.home() / "Library" / "Caches" / "apple-mail-mcp" / "whose_unsupported.json"
+)
+
+
+def _read_properties_block(target: str, prelude: str = "") -> str:
+    """
+    Build AppleScript reading every search property of some messages in bulk.
+
+    ``target`` is re-evaluated by each read, so mail arriving, leaving or
+    changing read status between the reads would shift the lists against
+    each other. The reads are therefore repeated (up to three times) until
+    every list has one item per ID and the IDs read last still match the
+    first ones. An empty target makes the script return "".
+
+    Args:
+        target: AppleScript expression for the messages (e.g. a range)
+        prelude: Statements run before each attempt (e.g. counting the range)
+
+    Returns:
+        AppleScript statements filling the msg* globals
+    """
+    return f"""
+                set readAttempts to 0
+                repeat
+                    {prelude}
+                    set msgIds to id of {target}
+                    set idCount to count of msgIds
+                    if idCount is 0 then return ""
+                    set msgSubjects to subject of {target}
+                    set msgSenders to sender of {target}
+                    set msgDates to date received of {target}
+                    set msgReads to read status of {target}
+                    if (count of msgSubjects) = idCount and (count of msgSenders) = idCount ¬
+                        and (count of msgDates) = idCount and (count of msgReads) = idCount ¬
+                        and (id of {target}) = msgIds then exit repeat
+                    set readAttempts to readAttempts + 1
+                    if readAttempts is 3 then error "Mailbox changed while reading messages"
+                end repeat
+            """
+
+
+@functools.lru_cache(maxsize=2)
+def _list_script(has_limit: bool) -> str:
+    """
+    Build the unfiltered search script, which lists a mailbox's messages.
+
+    Without a whose clause the messages form a plain range, so each property
+    is read for the whole range with one Apple Event (``subject of messages
+    1 thru n``) instead of one event per message and property.
+
+    Args:
+        has_limit: Only list the first ``item 6 of argv`` messages
+
+    Returns:
+        AppleScript source
+    """
+    limit_block = ""
+    if has_limit:
+        limit_block = """
+                    set limitCount to (item 6 of argv) as integer
+                    if msgCount > limitCount then set msgCount to limitCount
+            """
+    # Counted again on every attempt, in case messages were removed meanwhile
+    prelude = f"""
+                    set msgCount to count of messages of mailboxRef
+                    {limit_block}
+                    if msgCount is 0 then return ""
+            """
+
+    return f"""
+        {_CLEAN_FIELD_HANDLER}
+        {_MESSAGE_RECORDS_HANDLER}
+
+        on run argv
+            {_SEPARATORS_APPLESCRIPT}
+            set {{accountName, mailboxName}} to items 1 thru 2 of argv
+            tell application "Mail"
+                set mailboxRef to mailbox mailboxName of account accountName
+                {_read_properties_block("messages 1 thru msgCount of mailboxRef", prelude)}
+            end tell
+
+            return messageRecords(count of msgIds, missing value)
+        end run
+        """
+
+
+@functools.lru_cache(maxsize=3)
+def _direct_fetch_script(read_status: bool | None) -> str:
+    """
+    Build the script fetching the newest messages by index, with no whose clause.
+
+    Exchange rejects even equality whose clauses, so every property of the
+    scanned range is read in bulk and read status is checked while the
+    records are joined. The account, mailbox and scan limit arrive as argv
+    items 1-3.
+
+    Args:
+        read_status: Only return messages with this read status
+
+    Returns:
+        AppleScript source
+    """
+    wanted_read = "missing value"
+    if read_status is not None:
+        wanted_read = "true" if read_status else "false"
+    # Counted again on every attempt, in case messages were removed meanwhile
+    prelude = """
+                    set fetchCount to count of messages of mailboxRef
+                    if fetchCount > scanLimit then set fetchCount to scanLimit
+                    if fetchCount < 1 then return ""
+            """
+
+    return f"""
+        {_CLEAN_FIELD_HANDLER}
+        {_MESSAGE_RECORDS_HANDLER}
+
+        on run argv
+            {_SEPARATORS_APPLESCRIPT}
+            tell application "Mail"
+                set accountRef to account (item 1 of argv)
+                set mailboxRef to mailbox (item 2 of argv) of accountRef
+                set scanLimit to (item 3 of argv) as integer
+                {_read_properties_block("messages 1 thru fetchCount of mailboxRef", prelude)}
+            end tell
+
+            return messageRecords(count of msgIds, {wanted_read})
+        end run
+        """
+
+
+@functools.lru_cache(maxsize=16)
+def _search_script(
+    has_sender: bool, has_subject: bool, has_read_status: bool, has_limit: bool
+) -> str:
+    """
+    Build the whose-clause search script for a combination of filters.
+
+    Filter values arrive through argv (account, mailbox, sender, subject,
+    read status, limit), so there are only 16 distinct scripts and each is
+    built once. Searches with no filter are plain listings served by
+    ``_list_script``.
+
+    Args:
+        has_sender: Filter on sender
+        has_subject: Filter on subject
+        has_read_status: Filter on read status
+        has_limit: Truncate the matches to the limit
+
+    Returns:
+        AppleScript source
+    """
+    conditions = []
+    if has_sender:
+        conditions.append("sender contains senderFilter")
+    if has_subject:
+        conditions.append("subject contains subjectFilter")
+    if has_read_status:
+        conditions.append("read status is statusFilter")
+
+    if not conditions:
+        return _list_script(has_limit)
+
+    message_expression = f'(messages of mailboxRef whose {" and ".join(conditions)})'
+
+    limit_block = ""
+    if has_limit:
+        limit_block = """
+                set limitCount to (item 6 of argv) as integer
+                if msgCount > limitCount then set msgCount to limitCount
+            """
+
+    return f"""
+        {_CLEAN_FIELD_HANDLER}
+        {_MESSAGE_RECORDS_HANDLER}
+
+        on run argv
+            {_SEPARATORS_APPLESCRIPT}
+            set {{accountName, mailboxName, senderFilter, subjectFilter}} to items 1 thru 4 of argv
+            set statusFilter to (item 5 of argv) is "true"
+            tell application "Mail"
+                set accountRef to account accountName
+                set mailboxRef to mailbox mailboxName of accountRef
+                -- Each property of the matches is read with one Apple Event
+                set matchedRef to a reference to {message_expression}
+                {_read_properties_block("matchedRef")}
+                set msgCount to idCount
+                {limit_block}
+            end tell
+
+            return messageRecords(msgCount, missing value)
+        end run
+        """
+
+
+# Sends an outgoing message. Every value arrives through argv rather than being
+# spliced into the source: subject, body, then linefeed-separated To, CC and BCC
+# addresses and attachment POSIX paths.
+_SEND_EMAIL_SCRIPT = """
+on run argv
+    set {msgSubject, msgBody, toText, ccText, bccText, attachmentText} to argv
+    set toList to paragraphs of toText
+    set ccList to paragraphs of ccText
+    set bccList to paragraphs of bccText
+    set attachmentFiles to {}
+    repeat with filePath in paragraphs of attachmentText
+        set end of attachmentFiles to POSIX file (contents of filePath)
+    end repeat
+
+    tell application "Mail"
+        set theMessage to make new outgoing message with properties {subject:msgSubject, content:msgBody, visible:false}
+
+        tell theMessage
+            repeat with addr in toList
+                make new to recipient with properties {address:(contents of addr)}
+            end repeat
+
+            repeat with addr in ccList
+                make new cc recipient with properties {address:(contents of addr)}
+            end repeat
+
+            repeat with addr in bccList
+                make new bcc recipient with properties {address:(contents of addr)}
+            end repeat
+
+            repeat with attachmentFile in attachmentFiles
+                make new attachment with properties {file name:(contents of attachmentFile)} at after last paragraph
+            end repeat
+
+            send
+        end tell
+
+        return "sent"
+    end tell
+end run
+"""
+
+
+# Bytes read from the worker's stdout at a time
+_WORKER_READ_SIZE = 64 * 1024
+
+# Dispatcher run by the persistent worker. Each request is one line holding the
+# base64-encoded script source followed by its space-separated base64-encoded
+# arguments; each reply is one line: "O" or "E" followed by the base64-encoded
+# result or error message.
+_WORKER_DISPATCHER = """
+use AppleScript version "2.4"
+use framework "Foundation"
+use scripting additions
+
+on run
+    set stdinHandle to current application's NSFileHandle's fileHandleWithStandardInput()
+    set stdoutHandle to current application's NSFileHandle's fileHandleWithStandardOutput()
+    set pending to ""
+    repeat
+        repeat while pending does not contain linefeed
+            set chunk to stdinHandle's availableData()
+            if (chunk's |length|()) = 0 then return
+            set pending to pending & ((current application's NSString's alloc()'s initWithData:chunk encoding:(current application's NSUTF8StringEncoding)) as text)
+        end repeat
+        set splitAt to offset of linefeed in pending
+        if splitAt > 1 then
+            set request to text 1 thru (splitAt - 1) of pending
+        else
+            set request to ""
+        end if
+        if splitAt < (length of pending) then
+            set pending to text (splitAt + 1) thru -1 of pending
+        else
+            set pending to ""
+        end if
+        set reply to (my handleRequest(request)) & linefeed
+        set replyData to ((current application's NSString's stringWithString:reply)'s dataUsingEncoding:(current application's NSUTF8StringEncoding))
+        stdoutHandle's writeData:replyData
+    end repeat
+end run
+
+on handleRequest(request)
+    try
+        set AppleScript's text item delimiters to space
+        set requestParts to text items of request
+        set AppleScript's text item delimiters to ""
+        set scriptArgs to {}
+        repeat with encodedArg in rest of requestParts
+            set end of scriptArgs to my decodeBase64(contents of encodedArg)
+        end repeat
+        set scriptResult to run script (my decodeBase64(item 1 of requestParts)) with parameters scriptArgs
+        try
+            set scriptText to scriptResult as text
+        on error
+            set scriptText to ""
+        end try
+        return "O" & my encodeBase64(scriptText)
+    on error errMsg number errNum
+        return "E" & my encodeBase64(errMsg & " (" & errNum & ")")
+    end try
+end handleRequest
+
+on decodeBase64(encoded)
+    set decodedData to current application's NSData's alloc()'s initWithBase64EncodedString:encoded options:0
+    return (current application's NSString's alloc()'s initWithData:decodedData encoding:(current application's NSUTF8StringEncoding)) as text
+end decodeBase64
+
+on encodeBase64(plainText)
+    set plainData to (current application's NSString's stringWithString:plainText)'s dataUsingEncoding:(current application's NSUTF8StringEncoding)
+    return (plainData's base64EncodedStringWithOptions:0) as text
+end encodeBase64
+"""
+
+
+class _AppleScriptWorker:
+    """
+    Long-lived osascript process that runs scripts sent over stdin.
+
+    Keeping one process alive avoids a fork/exec per call and lets the Apple
+    Event connection to Mail stay warm between operations. The process runs
+    one script at a time; a call arriving while it is busy is handed back to
+    the caller to run as a one-shot osascript, so concurrent callers are not
+    serialized behind it.
+    """
+
+    def __init__(self, idle_timeout: float | None = None) -> None:
+        """
+        Initialize the worker (the process starts on first use).
+
+        Args:
+            idle_timeout: Seconds without a request after which the process
+                is shut down, to be restarted by the next call (None keeps
+                it running until close)
+        """
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._lock = threading.Lock()
+        # Set when osascript cannot be launched at all, so later calls go
+        # straight to the one-shot fallback instead of retrying the spawn
+        self._unavailable = False
+        self._idle_timeout = idle_timeout
+        self._idle_timer: threading.Timer | None = None
+        self._last_used = 0.0
+
+    def _start(self) -> subprocess.Popen[bytes]:
+        """Start the worker process if it is not already running."""
+        if self._proc is None or self._proc.poll() is not None:
+            try:
+                self._proc = subprocess.Popen(
+                    ["/usr/bin/osascript", "-e", _WORKER_DISPATCHER],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+            except OSError:
+                self._unavailable = True
+                raise
+        return self._proc
+
+    def execute(
+        self, script: str, timeout: float, args: list[str] | None = None
+    ) -> tuple[bool, bytes] | None:
+        """
+        Run a script in the worker.
+
+        Args:
+            script: AppleScript code to execute
+            timeout: Timeout in seconds
+            args: Arguments passed to the script's run handler
+
+        Returns:
+            Tuple of (succeeded, UTF-8 output or error message), or None if
+            the worker is unavailable or busy and the caller should fall back
+
+        Raises:
+            subprocess.TimeoutExpired: If the worker does not reply in time
+        """
+        request = b" ".join(
+            base64.b64encode(part.encode("utf-8")) for part in [script, *(args or [])]
+        ) + b"\n"
+
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if self._unavailable:
+                return None
+            try:
+                proc = self._start()
+                assert proc.stdin is not None and proc.stdout is not None
+                proc.stdin.write(request)
+                proc.stdin.flush()
+
+                # The whole reply line is read under one deadline, so a worker
+                # stalling partway through a reply times out too
+                deadline = time.monotonic() + timeout
+                fd = proc.stdout.fileno()
+                chunks: list[bytes] = []
+                while not (chunks and chunks[-1].endswith(b"\n")):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stop()
+                        raise subprocess.TimeoutExpired("osascript worker", timeout)
+                    ready, _, _ = select.select([fd], [], [], remaining)
+                    if ready:
+                        chunk = os.read(fd, _WORKER_READ_SIZE)
+                        if not chunk:
+                            break
+                        chunks.append(chunk)
+                reply = b"".join(chunks)
+            except OSError as e:
+                logger.warning("AppleScript worker unavailable: %s", e)
+                self._stop()
+                return None
+
+            if not reply.endswith(b"\n"):
+                logger.warning("AppleScript worker exited unexpectedly")
+                self._stop()
+                return None
+
+            self._schedule_idle_close()
+        finally:
+            self._lock.release()
+
+        status, payload = reply[:1], reply[1:].strip()
+        return status == b"O", base64.b64decode(payload)
+
+    def _schedule_idle_close(self) -> None:
+        """Restart the idle countdown after a request (caller holds the lock)."""
+        self._last_used = time.monotonic()
+        if self._idle_timeout is None or self._idle_timer is not None:
+            return
+        self._idle_timer = threading.Timer(self._idle_timeout, self._close_if_idle)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _close_if_idle(self) -> None:
+        """Stop the process if no request arrived during the idle timeout."""
+        assert self._idle_timeout is not None
+        with self._lock:
+            self._idle_timer = None
+            idle_for = time.monotonic() - self._last_used
+            if idle_for >= self._idle_timeout:
+                logger.debug("Stopping AppleScript worker after %.0fs idle", idle_for)
+                self._stop()
+            elif self._proc is not None:
+                # Used since the timer started; wait out the rest of the window
+                self._idle_timer = threading.Timer(
+                    self._idle_timeout - idle_for, self._close_if_idle
+                )
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+
+    def _stop(self) -> None:
+        """Terminate the worker process (caller holds the lock)."""
+        if self._proc is not None:
+            if self._proc.poll() is None:
+                self._proc.kill()
+                self._proc.wait()
+            self._proc = None
+
+    def close(self) -> None:
+        """Shut down the worker process."""
+        with self._lock:
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            self._stop()
+
+
+class _ProbeGroup:
+    """
+    The osascript processes started by one ``_probe_accounts`` call.
+
+    Probes run as one-shot processes registered here, so that once one of
+    them finds the message the others can be killed instead of being left
+    to scan the rest of their accounts.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty, running group."""
+        self._lock = threading.Lock()
+        self._processes: list[subprocess.Popen[bytes]] = []
+        self._finished = False
+
+    @property
+    def finished(self) -> bool:
+        """Whether the probing is over and remaining probes are killed."""
+        return self._finished
+
+    def run(
+        self, command: list[str], stdin: bytes | None, timeout: float
+    ) -> subprocess.CompletedProcess[bytes] | None:
+        """
+        Run an osascript command as a probe of this group.
+
+        Args:
+            command: osascript command line
+            stdin: Script source to send, or None for a compiled script
+            timeout: Seconds before the probe is killed
+
+        Returns:
+            The completed process, or None if the group finished before or
+            while it ran
+
+        Raises:
+            subprocess.TimeoutExpired: If the probe ran out of time
+        """
+        with self._lock:
+            if self._finished:
+                return None
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE if stdin is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            self._processes.append(process)
+        try:
+            stdout, stderr = process.communicate(stdin, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        if self._finished:
+            return None
+        return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+    def finish(self) -> None:
+        """Stop starting probes and kill the ones still running."""
+        with self._lock:
+            self._finished = True
+            processes = list(self._processes)
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+
 
 class AppleMailConnector:
     """Interface to Apple Mail via AppleScript."""
 
-    def __init__(self, timeout: int = 60) -> None:
+    def __init__(
+        self,
+        timeout: int = 60,
+        persistent: bool = False,
+        whose_cache_path: Path | None = None,
+        envelope_index: EnvelopeIndex | None = None,
+        mailbox_cache_ttl: float = 30.0,
+        search_cache_ttl: float = 5.0,
+        index_search: bool = False,
+        worker_idle_timeout: float | None = 30.0,
+    ) -> None:
         """
         Initialize the Mail connector.
 
         Args:
             timeout: Timeout in seconds for AppleScript operations
+            persistent: Run scripts in a long-lived osascript worker (started on
+                first use) instead of spawning a process per call
+            whose_cache_path: JSON file used to remember accounts that reject
+                whose clauses across restarts (not persisted if None)
+            envelope_index: Reader for Mail's Envelope Index used by
+                search_messages_fts (one for the default location if None)
+            mailbox_cache_ttl: Seconds list_mailboxes results are reused for
+                an account (0 disables the cache)
+            search_cache_ttl: Seconds a search_messages result is reused for
+                the same arguments (0 disables the cache)
+            index_search: Answer search_messages from the Envelope Index when
+                it is readable, falling back to AppleScript otherwise. Off by
+                default: the index copy is refreshed only every 30 seconds,
+                so its results may not yet show a message action just taken
+            worker_idle_timeout: Seconds the persistent worker may sit idle
+                before it is shut down (None keeps it until close)
         """
         self.timeout = timeout
-        self._whose_unsupported_accounts: set[str] = set()
-
-    def _run_applescript(self, script: str) -> str:
+        self._whose_cache_path = whose_cache_path
+        self._whose_unsupported_accounts: set[str] = self._load_whose_unsupported()
+        # message id -> (account, mailbox), learned from search/get results
+        self._message_locations: OrderedDict[str, tuple[str, str]] = OrderedDict()
+        # Guards _message_locations; the server calls in from several threads
+        self._locations_lock = threading.Lock()
+        # Account names, fetched on first use by _get_account_names
+        self._account_names: list[str] | None = None
+        # Account name -> account ID (the netloc of its mailbox URLs)
+        self._account_ids: dict[str, str] = {}
+        # Account name -> (monotonic fetch time, list_mailboxes result)
+        self._mailbox_cache: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        self._mailbox_cache_ttl = mailbox_cache_ttl
+        # search_messages arguments -> (monotonic fetch time, results)
+        self._search_cache: OrderedDict[tuple[Any, ...], tuple[float, list[dict[str, Any]]]] = (
+            OrderedDict()
+        )
+        self._search_cache_ttl = search_cache_ttl
+        self._search_cache_lock = threading.Lock()
+        self._envelope_index = envelope_index or EnvelopeIndex()
+        self._index_search = index_search
+        self._worker = _AppleScriptWorker(worker_idle_timeout) if persistent else None
+        # script hash -> compiled .scpt (None if osacompile rejected it)
+        self._compiled_scripts: dict[str, Path | None] = {}
+        # hashes of scripts run once; compiled when seen a second time
+        self._seen_scripts: OrderedDict[str, None] = OrderedDict()
+        # hashes of scripts osacompile is working on, run via stdin meanwhile
+        self._compiling: set[str] = set()
+        self._compile_dir: Path | None = None
+        self._compile_lock = threading.Lock()
+        # The _ProbeGroup a probe thread belongs to (see _probe_accounts)
+        self._probe_local = threading.local()
+
+    @overload
+    def _run_applescript(
+        self, script: str, binary: Literal[False] = False, args: list[str] | None = None
+    ) -> str: ...
+
+    @overload
+    def _run_applescript(
+        self, script: str, binary: Literal[True], args: list[str] | None = None
+    ) -> bytes: ...
+
+    def _run_applescript(
+        self, script: str, binary: bool = False, args: list[str] | None = None
+    ) -> str | bytes:
         """
         Execute AppleScript and return output.
 
         Args:
             script: AppleScript code to execute
+            binary: Return raw stdout bytes (only the trailing newline removed)
+                for scripts that emit separator-delimited output
+            args: Arguments passed to the script's ``on run argv`` handler, so
+                user data never has to be embedded in script source
 
         Returns:
-            Script output as string
+            Script output as string, or bytes if binary is True
 
         Raises:
             MailAppleScriptError: If script execution fails
@@ -49,34 +1315,49 @@ class AppleMailConnector:
             MailMessageNotFoundError: If message not found
         """
         try:
-            logger.debug(f"Executing AppleScript: {script[:200]}...")
-
-            result = subprocess.run(
-                ["/usr/bin/osascript", "-"],
-                input=script,
-                text=True,
-                capture_output=True,
-                timeout=self.timeout,
-            )
-
-            if result.returncode != 0:
-                error_msg = result.stderr.strip()
-                logger.error(f"AppleScript error: {error_msg}")
-
-                # Parse error and raise appropriate exception
-                if "Can't get account" in error_msg:
-                    raise MailAccountNotFoundError(error_msg)
-                elif "Can't get mailbox" in error_msg:
-                    raise MailMailboxNotFoundError(error_msg)
-                elif "Can't get message" in error_msg:
-                    raise MailMessageNotFoundError(error_msg)
+            logger.debug("Executing AppleScript: %.200s...", script)
+
+            output: bytes | None = None
+            probe_group: _ProbeGroup | None = getattr(self._probe_local, "group", None)
+            # Probes stay out of the worker so a losing one can be killed
+            if self._worker is not None and probe_group is None:
+                reply = self._worker.execute(script, self.timeout, args)
+                if reply is not None:
+                    succeeded, output = reply
+                    if not succeeded:
+                        self._raise_script_error(output.decode("utf-8", "replace").strip())
+
+            if output is None:
+                compiled = self._compiled_script(script)
+                if compiled is not None:
+                    command = ["/usr/bin/osascript", str(compiled), *(args or [])]
+                    stdin = None
                 else:
-                    raise MailAppleScriptError(error_msg)
+                    command = ["/usr/bin/osascript", "-", *(args or [])]
+                    stdin = script.encode("utf-8")
+
+                if probe_group is not None:
+                    probed = probe_group.run(command, stdin, self.timeout)
+                    if probed is None:
+                        raise MailMessageNotFoundError("Message found by another probe")
+                    result = probed
+                elif stdin is None:
+                    result = subprocess.run(command, capture_output=True, timeout=self.timeout)
+                else:
+                    result = subprocess.run(
+                        command, input=stdin, capture_output=True, timeout=self.timeout
+                    )
+
+                if result.returncode != 0:
+                    self._raise_script_error(result.stderr.decode("utf-8", "replace").strip())
 
-            output = result.stdout.strip()
-            logger.debug(f"AppleScript output: {output[:200]}...")
-            return output
+                output = result.stdout
 
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("AppleScript output: %r...", output[:200])
+            if binary:
+                return output.rstrip(b"\n")
+            return output.decode("utf-8").strip()
         except subprocess.TimeoutExpired:
             raise MailAppleScriptError(f"Script execution timeout after {self.timeout}s")
         except Exception as e:
@@ -85,86 +1366,249 @@ class AppleMailConnector:
                 raise
             raise MailAppleScriptError(f"Unexpected error: {str(e)}")
 
-    def list_accounts(self) -> list[dict[str, Any]]:
+    def _compiled_script(self, script: str) -> Path | None:
+        """
+        Return a compiled copy of a script that is run repeatedly.
+
+        Scripts take their user data through argv, so most calls reuse the
+        same source text. The first run of a script goes through stdin as
+        usual; on the second it is compiled once with osacompile and later
+        runs skip parsing entirely. One-off scripts (e.g. ones embedding a
+        mailbox name) therefore never pay for a compile.
+
+        Args:
+            script: AppleScript source
+
+        Returns:
+            Path to the compiled script, or None to run the source via stdin
+        """
+        key = hashlib.sha1(script.encode("utf-8")).hexdigest()
+        # Only the bookkeeping runs under the lock; osacompile runs outside it
+        # so a slow compile never holds up other scripts
+        with self._compile_lock:
+            if key in self._compiled_scripts:
+                return self._compiled_scripts[key]
+            if key in self._compiling:
+                return None
+            if key not in self._seen_scripts:
+                self._seen_scripts[key] = None
+                if len(self._seen_scripts) > _SEEN_SCRIPTS_SIZE:
+                    self._seen_scripts.popitem(last=False)
+                return None
+            del self._seen_scripts[key]
+            try:
+                if self._compile_dir is None:
+                    self._compile_dir = Path(tempfile.mkdtemp(prefix="apple-mail-mcp-"))
+            except OSError as e:
+                logger.debug("osacompile unavailable: %s", e)
+                self._compiled_scripts[key] = None
+                return None
+            compile_dir = self._compile_dir
+            self._compiling.add(key)
+
+        compiled: Path | None = None
+        try:
+            source = compile_dir / f"{key}.applescript"
+            source.write_text(script, encoding="utf-8")
+            target = compile_dir / f"{key}.scpt"
+            result = subprocess.run(
+                ["/usr/bin/osacompile", "-o", str(target), str(source)],
+                capture_output=True,
+                timeout=self.timeout,
+            )
+            source.unlink(missing_ok=True)
+            if result.returncode == 0:
+                compiled = target
+            else:
+                logger.debug("osacompile failed: %s", result.stderr.decode("utf-8", "replace"))
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug("osacompile unavailable: %s", e)
+
+        with self._compile_lock:
+            self._compiling.discard(key)
+            # close() removed the directory while this script was compiling
+            if self._compile_dir != compile_dir:
+                return None
+            self._compiled_scripts[key] = compiled
+            return compiled
+
+    def _get_account_names(self) -> list[str]:
+        """Return the names of all accounts, fetched once and then cached."""
+        if self._account_names is None:
+            result = self._run_applescript(_ACCOUNT_NAMES_SCRIPT, binary=True)
+            self._account_names = [
+                name.decode("utf-8") for name in result.split(_RECORD_SEP) if name
+            ]
+        return self._account_names
+
+    def _probe_accounts(
+        self, script: str, args: list[str], account_names: list[str]
+    ) -> bytes:
         """
-        List all mail accounts.
+        Run a locate script against every account in parallel.
+
+        Each probe is a separate osascript process restricted to one account
+        (see ``_LOCATE_MESSAGE_APPLESCRIPT``); the first one to find the
+        message wins and the processes of the others are killed.
+
+        Args:
+            script: Script built around ``_LOCATE_MESSAGE_APPLESCRIPT``
+            args: Script arguments starting with ``_locate_args`` output; the
+                location items are replaced with each account in turn
+            account_names: Accounts to probe
 
         Returns:
-            List of account dictionaries with name and email addresses
+            Output of the first successful probe
+
+        Raises:
+            MailError: If no probe found the message (a probe failure other
+                than "Message not found" is preferred, since the message may
+                be in that account)
         """
-        script = """
-        tell application "Mail"
-            set accountList to {}
-            repeat with acc in accounts
-                set accountInfo to {accountName:(name of acc), emailAddresses:(email addresses of acc)}
-                set end of accountList to accountInfo
-            end repeat
+        group = _ProbeGroup()
 
-            -- Convert to JSON-like format
-            set output to ""
-            repeat with acc in accountList
-                set output to output & "{name:'" & accountName of acc & "',emails:["
-                repeat with addr in emailAddresses of acc
-                    set output to output & "'" & addr & "',"
-                end repeat
-                set output to output & "]}|"
-            end repeat
+        def probe(name: str) -> bytes:
+            self._probe_local.group = group
+            try:
+                return self._run_applescript(script, True, [args[0], name, "", *args[3:]])
+            finally:
+                self._probe_local.group = None
 
-            return output
-        end tell
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(account_names))
+        try:
+            futures = [executor.submit(probe, name) for name in account_names]
+            errors: list[MailError] = []
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    return future.result()
+                except MailError as e:
+                    errors.append(e)
+        finally:
+            group.finish()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        raise next((e for e in errors if "Message not found" not in str(e)), errors[0])
+
+    def _run_located(self, script: str, args: list[str]) -> bytes:
+        """
+        Run a script built around ``_LOCATE_MESSAGE_APPLESCRIPT``.
+
+        Without a known location, every account is probed at once, each probe
+        as a one-shot osascript call (never the persistent worker) so the
+        losing ones can be killed. The locate step fails before the script
+        acts on the message, so probes in the wrong accounts have no side
+        effects.
+
+        Args:
+            script: Script built around ``_LOCATE_MESSAGE_APPLESCRIPT``
+            args: Script arguments starting with ``_locate_args`` output
+
+        Returns:
+            Raw script output
+        """
+        account_names: list[str] = []
+        if not args[1]:
+            account_names = self._get_account_names()
+        if len(account_names) > 1:
+            return self._probe_accounts(script, args, account_names)
+        return self._run_applescript(script, binary=True, args=args)
+
+    @staticmethod
+    def _raise_script_error(error_msg: str) -> None:
+        """Raise the exception matching an AppleScript error message."""
+        logger.error("AppleScript error: %s", error_msg)
+
+        # Parse error and raise appropriate exception
+        if "Can't get account" in error_msg:
+            raise MailAccountNotFoundError(error_msg)
+        elif "Can't get mailbox" in error_msg:
+            raise MailMailboxNotFoundError(error_msg)
+        elif "Can't get message" in error_msg:
+            raise MailMessageNotFoundError(error_msg)
+        else:
+            raise MailAppleScriptError(error_msg)
+
+    def close(self) -> None:
+        """Shut down the persistent worker and drop compiled scripts and index copies."""
+        if self._worker is not None:
+            self._worker.close()
+        self._envelope_index.close()
+        with self._compile_lock:
+            if self._compile_dir is not None:
+                shutil.rmtree(self._compile_dir, ignore_errors=True)
+                self._compile_dir = None
+            self._compiled_scripts.clear()
+            self._seen_scripts.clear()
+
+    def __enter__(self) -> "AppleMailConnector":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def list_accounts(self) -> list[dict[str, Any]]:
         """
+        List all mail accounts and refresh the cached account names.
 
-        result = self._run_applescript(script)
+        Returns:
+            List of account dictionaries with name and emails (addresses)
+        """
+        result = self._run_applescript(_LIST_ACCOUNTS_SCRIPT, binary=True)
 
-        # Parse the result
-        accounts = []
-        for account_str in result.split("|"):
-            if not account_str:
+        accounts: list[dict[str, Any]] = []
+        for record in result.split(_RECORD_SEP):
+            if not record:
                 continue
-            # Simple parsing - in production, use more robust parsing
-            # For now, we'll return raw result and handle in tools
-            accounts.append({"raw": account_str})
+            name, *emails = (field.decode("utf-8") for field in record.split(_FIELD_SEP))
+            accounts.append({"name": name, "emails": [email for email in emails if email]})
 
+        self._account_names = [account["name"] for account in accounts]
         return accounts
 
-    def list_mailboxes(self, account: str) -> list[dict[str, Any]]:
+    def list_mailboxes(self, account: str, refresh: bool = False) -> list[dict[str, Any]]:
         """
         List all mailboxes for an account.
 
+        Results are reused for ``mailbox_cache_ttl`` seconds; creating a
+        mailbox or acting on messages drops them early.
+
         Args:
             account: Account name
+            refresh: Bypass the cache and query Mail
 
         Returns:
-            List of mailbox dictionaries
+            List of mailbox dictionaries with name and unread_count
 
         Raises:
             MailAccountNotFoundError: If account doesn't exist
         """
-        account_safe = escape_applescript_string(sanitize_input(account))
-
-        script = f"""
-        tell application "Mail"
-            set accountRef to account "{account_safe}"
-            set mailboxList to {{}}
-
-            repeat with mb in mailboxes of accountRef
-                set mbInfo to {{mbName:(name of mb), unreadCount:(unread count of mb)}}
-                set end of mailboxList to mbInfo
-            end repeat
-
-            return mailboxList
-        end tell
-        """
-
-        result = self._run_applescript(script)
+        cached = self._mailbox_cache.get(account)
+        if (
+            not refresh
+            and cached is not None
+            and time.monotonic() - cached[0] < self._mailbox_cache_ttl
+        ):
+            return [dict(mailbox) for mailbox in cached[1]]
+
+        result = self._run_applescript(
+            _LIST_MAILBOXES_SCRIPT, binary=True, args=[sanitize_input(account)]
+        )
 
-        # TODO: Parse AppleScript records properly
-        # For now return raw
-        return [{"raw": result}]
+        mailboxes = [
+            {"name": fields[0].decode("utf-8"), "unread_count": self._parse_count(fields[1])}
+            for fields in (record.split(_FIELD_SEP) for record in result.split(_RECORD_SEP))
+            if len(fields) >= 2
+        ]
+        self._mailbox_cache[account] = (time.monotonic(), mailboxes)
+        return [dict(mailbox) for mailbox in mailboxes]
 
     def _search_messages_direct(
-        self, account: str, mailbox: str, scan_limit: int = 200
-    ) -> str:
+        self,
+        account: str,
+        mailbox: str,
+        scan_limit: int = 200,
+        read_status: bool | None = None,
+    ) -> bytes:
         """
         Fetch messages by index (no whose clause). Works on Exchange accounts.
 
@@ -172,292 +1616,735 @@ class AppleMailConnector:
             account: Sanitized account name
             mailbox: Sanitized mailbox name
             scan_limit: Max messages to fetch
+            read_status: Only return messages with this read status
 
         Returns:
-            Raw pipe-delimited output string
+            Raw separator-delimited output bytes
         """
-        account_safe = escape_applescript_string(sanitize_input(account))
-        mailbox_safe = escape_applescript_string(sanitize_input(mailbox))
+        args = [sanitize_input(account), sanitize_input(mailbox), str(scan_limit)]
+        return self._run_applescript(
+            _direct_fetch_script(read_status), binary=True, args=args
+        )
 
-        script = f"""
-        tell application "Mail"
-            set accountRef to account "{account_safe}"
-            set mailboxRef to mailbox "{mailbox_safe}" of accountRef
-            set msgCount to count of messages of mailboxRef
-            set fetchCount to msgCount
-            if fetchCount > {scan_limit} then set fetchCount to {scan_limit}
-            if fetchCount < 1 then return ""
-            set recentMsgs to messages 1 thru fetchCount of mailboxRef
-            set resultList to {{}}
-            repeat with msg in recentMsgs
-                set msgId to id of msg as text
-                set msgSubject to subject of msg
-                set msgSender to sender of msg
-                set msgDate to date received of msg as text
-                set msgRead to read status of msg
-                set msgData to msgId & "|" & msgSubject & "|" & msgSender & "|" & msgDate & "|" & msgRead
-                set end of resultList to msgData
-            end repeat
-            set AppleScript's text item delimiters to linefeed
-            set output to resultList as text
-            set AppleScript's text item delimiters to ""
-            return output
-        end tell
+    @staticmethod
+    def _iter_message_results(result: bytes) -> Iterator[dict[str, Any]]:
         """
+        Lazily parse separator-delimited message results.
 
-        return self._run_applescript(script)
+        Records are located with ``bytes.find`` and parsed one at a time, so a
+        consumer that stops early (e.g. after ``limit`` matches) never splits
+        or decodes the rest of the output.
+        """
+        start = 0
+        end = 0
+        while end != -1:
+            end = result.find(_RECORD_SEP, start)
+            record = result[start:] if end == -1 else result[start:end]
+            start = end + 1
+            fields = record.split(_FIELD_SEP)
+            if len(fields) >= 5:
+                yield {
+                    "id": fields[0].decode("utf-8"),
+                    "subject": fields[1].decode("utf-8"),
+                    "sender": fields[2].decode("utf-8"),
+                    "date_received": fields[3].decode("utf-8"),
+                    "read_status": fields[4] == b"true",
+                }
 
     @staticmethod
-    def _parse_message_results(result: str) -> list[dict[str, Any]]:
-        """Parse pipe-delimited message results into list of dicts."""
+    def _parse_message_results(result: bytes) -> list[dict[str, Any]]:
+        """
+        Parse separator-delimited message results into list of dicts.
+
+        Every record is needed here, so the output is decoded once and split
+        with ``str.split`` rather than decoding field by field as
+        ``_iter_message_results`` does.
+        """
+        field_sep = _FIELD_SEP.decode()
         messages = []
-        if result:
-            for line in result.split("\n"):
-                if not line:
-                    continue
-                parts = line.split("|")
-                if len(parts) >= 5:
-                    messages.append({
-                        "id": parts[0],
-                        "subject": parts[1],
-                        "sender": parts[2],
-                        "date_received": parts[3],
-                        "read_status": parts[4].lower() == "true",
-                    })
+        for record in result.decode("utf-8").split(_RECORD_SEP.decode()):
+            fields = record.split(field_sep)
+            if len(fields) >= 5:
+                messages.append({
+                    "id": fields[0],
+                    "subject": fields[1],
+                    "sender": fields[2],
+                    "date_received": fields[3],
+                    "read_status": fields[4] == "true",
+                })
         return messages
 
     @staticmethod
     def _filter_messages(
-        messages: list[dict[str, Any]],
+        messages: Iterable[dict[str, Any]],
         sender_contains: str | None,
         subject_contains: str | None,
         read_status: bool | None,
         limit: int | None,
     ) -> list[dict[str, Any]]:
         """Apply Python-side filtering to message list."""
-        filtered = []
-        for msg in messages:
-            if sender_contains and sender_contains.lower() not in msg["sender"].lower():
-                continue
-            if subject_contains and subject_contains.lower() not in msg["subject"].lower():
-                continue
+        sender_lower = sender_contains.lower() if sender_contains else None
+        subject_lower = subject_contains.lower() if subject_contains else None
+
+        def matches(msg: dict[str, Any]) -> bool:
+            # Cheapest check first; lower-case fields only when a filter needs them
             if read_status is not None and msg["read_status"] != read_status:
-                continue
-            filtered.append(msg)
-            if limit and len(filtered) >= limit:
-                break
-        return filtered
+                return False
+            if sender_lower and sender_lower not in msg["sender"].lower():
+                return False
+            if subject_lower and subject_lower not in msg["subject"].lower():
+                return False
+            return True
+
+        return list(itertools.islice(filter(matches, messages), limit or None))
+
+    @classmethod
+    def _filter_direct_results(
+        cls,
+        result: bytes,
+        sender_contains: str | None,
+        subject_contains: str | None,
+        read_status: bool | None,
+        limit: int | None,
+    ) -> list[dict[str, Any]]:
+        """
+        Filter raw direct-fetch output, skipping parsing when nothing can match.
+
+        Every text filter must match for a message to be kept, so if any ASCII
+        filter string is missing from the whole (lower-cased) output there are
+        no matches and no record is parsed. Non-ASCII filters are not
+        prechecked because ``bytes.lower`` only folds ASCII letters.
+        """
+        lowered: bytes | None = None
+        for needle in (sender_contains, subject_contains):
+            if needle and needle.isascii():
+                if lowered is None:
+                    lowered = result.lower()
+                if needle.lower().encode("ascii") not in lowered:
+                    return []
+
+        return cls._filter_messages(
+            cls._iter_message_results(result),
+            sender_contains, subject_contains, read_status, limit,
+        )
+
+    @staticmethod
+    def _parse_count(value: str | bytes) -> int:
+        """Parse an integer from script output, treating anything else as 0."""
+        try:
+            return int(value)
+        except ValueError:
+            return 0
 
     @staticmethod
     def _validate_message_id(message_id: str) -> str:
         """Validate message ID and return a safe numeric literal string."""
         message_id_safe = sanitize_input(message_id).strip()
-        if not message_id_safe or not message_id_safe.isdigit():
+        # isdigit() alone accepts non-ASCII digits that AppleScript cannot coerce
+        if not (message_id_safe.isascii() and message_id_safe.isdigit()):
             raise ValueError(f"Invalid message ID: {message_id}")
         return message_id_safe
 
-    def _format_message_id_list(self, message_ids: list[str]) -> str:
-        """Format a validated list of message IDs for AppleScript list literals."""
-        return ", ".join(self._validate_message_id(message_id) for message_id in message_ids)
+    def _remember_location(self, message_id: str, account: str, mailbox: str) -> None:
+        """Record where a message lives, evicting the least recently used entry."""
+        with self._locations_lock:
+            self._message_locations[message_id] = (account, mailbox)
+            self._message_locations.move_to_end(message_id)
+            if len(self._message_locations) > _LOCATION_CACHE_SIZE:
+                self._message_locations.popitem(last=False)
+
+    def _remember_locations(
+        self, messages: list[dict[str, Any]], account: str, mailbox: str
+    ) -> None:
+        """Record the account and mailbox that returned each message."""
+        for msg in messages:
+            self._remember_location(msg["id"], account, mailbox)
+
+    def _cached_location(self, message_id: str) -> tuple[str, str] | None:
+        """Return a message's cached (account, mailbox), marking it recently used."""
+        with self._locations_lock:
+            location = self._message_locations.get(message_id)
+            if location is not None:
+                self._message_locations.move_to_end(message_id)
+        return location
+
+    def _forget_locations(self, message_ids: list[str]) -> None:
+        """Drop cached locations for messages that were moved or deleted."""
+        with self._locations_lock:
+            for message_id in message_ids:
+                self._message_locations.pop(message_id, None)
+
+    def _group_message_ids(
+        self,
+        message_ids: list[str],
+        account: str | None = None,
+        mailbox: str | None = None,
+    ) -> tuple[dict[tuple[str, str], list[str]], list[str]]:
+        """
+        Group validated message IDs by their known (account, mailbox).
+
+        Args:
+            message_ids: Message IDs to group
+            account: Account holding all of the messages, if known
+            mailbox: Mailbox holding all of the messages, if known
+
+        Returns:
+            Tuple of (IDs grouped by location, IDs with no known location).
+            A group's mailbox is empty when only its account is known.
+            Repeated IDs appear once.
+        """
+        groups: dict[tuple[str, str], list[str]] = {}
+        unknown: list[str] = []
+        for message_id in dict.fromkeys(message_ids):
+            message_id_safe = self._validate_message_id(message_id)
+            if account and mailbox:
+                location: tuple[str, str] | None = (account, mailbox)
+            else:
+                location = self._cached_location(message_id_safe)
+            if location is None and account:
+                # Only the account is known: search just its mailboxes
+                location = (account, "")
+            if location is None:
+                unknown.append(message_id_safe)
+            else:
+                groups.setdefault(location, []).append(message_id_safe)
+        return groups, unknown
+
+    def _run_message_action(
+        self,
+        action: str,
+        message_ids: list[str],
+        account: str | None = None,
+        mailbox: str | None = None,
+        action_args: tuple[str, str] = ("", ""),
+    ) -> int:
+        """
+        Run ``_MESSAGE_ACTION_SCRIPT`` over messages grouped by location.
+
+        Args:
+            action: Action name understood by the script (read, flag, move,
+                copy_delete or delete)
+            message_ids: Message IDs to act on
+            account: Account holding all of the messages, if known
+            mailbox: Mailbox holding all of the messages, if known
+            action_args: The action's two arguments
+
+        Returns:
+            Number of messages acted on
+        """
+        groups, unknown = self._group_message_ids(message_ids, account, mailbox)
+
+        # argv: unknown IDs, action and its arguments, then (account, mailbox,
+        # IDs) per group
+        args = [",".join(unknown), action, *action_args]
+        for (group_account, group_mailbox), group_ids in groups.items():
+            args += [
+                sanitize_input(group_account),
+                sanitize_input(group_mailbox),
+                ",".join(group_ids),
+            ]
+
+        # Reading, moving and deleting all change unread counts and search
+        # results. The Envelope Index copy is left to its TTL, which already
+        # bounds how stale it gets, rather than re-copied after every action.
+        self._mailbox_cache.clear()
+        with self._search_cache_lock:
+            self._search_cache.clear()
+        result = self._run_applescript(_MESSAGE_ACTION_SCRIPT, args=args)
+        return self._parse_count(result)
+
+    def _locate_args(
+        self,
+        message_id_safe: str,
+        account: str | None = None,
+        mailbox: str | None = None,
+    ) -> list[str]:
+        """
+        Build the argv prefix expected by ``_LOCATE_MESSAGE_APPLESCRIPT``.
+
+        Args:
+            message_id_safe: Validated numeric message ID
+            account: Account holding the message, if the caller knows it
+            mailbox: Mailbox holding the message (used with ``account``)
+
+        Returns:
+            [message ID, account, mailbox]. A given account and mailbox win;
+            otherwise the cached location is used (if it agrees with a given
+            account), then the account alone, then empty strings
+        """
+        if account and mailbox:
+            return [message_id_safe, sanitize_input(account), sanitize_input(mailbox)]
+        cached = self._cached_location(message_id_safe)
+        if cached is not None and (not account or cached[0] == account):
+            return [message_id_safe, *cached]
+        return [message_id_safe, sanitize_input(account or ""), ""]
+
+    @staticmethod
+    def _is_whose_error(error_msg: str) -> bool:
+        """Check if an AppleScript error is a whose-clause incompatibility."""
+        return _WHOSE_ERROR_RE.search(error_msg) is not None
+
+    def _load_whose_unsupported(self) -> set[str]:
+        """Load the persisted set of accounts that reject whose clauses."""
+        if self._whose_cache_path is None:
+            return set()
+        try:
+            return set(json.loads(self._whose_cache_path.read_text()))
+        except FileNotFoundError:
+            return set()
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Ignoring unreadable whose cache %s: %s", self._whose_cache_path, e)
+            return set()
+
+    def _mark_whose_unsupported(self, account: str) -> None:
+        """Remember that an account rejects whose clauses, persisting if configured."""
+        self._whose_unsupported_accounts.add(account)
+        if self._whose_cache_path is None:
+            return
+        try:
+            self._whose_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._whose_cache_path.write_text(
+                json.dumps(sorted(self._whose_unsupported_accounts))
+            )
+        except OSError as e:
+            logger.warning("Could not write whose cache %s: %s", self._whose_cache_path, e)
+
+    def search_messages(
+        self,
+        account: str,
+        mailbox: str = "INBOX",
+        sender_contains: str | None = None,
+        subject_contains: str | None = None,
+        read_status: bool | None = None,
+        limit: int | None = None,
+        scan_limit: int = 200,
+    ) -> list[dict[str, Any]]:
+        """
+        Search for messages matching criteria.
+
+        Results are reused for search_cache_ttl seconds for the same
+        arguments, until a message action changes them.
+
+        With index_search enabled, a copy of Mail's Envelope Index answers
+        first. Otherwise, or when the index cannot be used, uses efficient
+        whose-based AppleScript query for IMAP/iCloud accounts. Automatically
+        falls back to index-based fetch with Python filtering for Exchange
+        accounts where whose clauses are unsupported.
+
+        Args:
+            account: Account name
+            mailbox: Mailbox name
+            sender_contains: Filter by sender
+            subject_contains: Filter by subject
+            read_status: Filter by read status (True=read, False=unread)
+            limit: Maximum results
+            scan_limit: Max messages to scan in fallback mode
+
+        Returns:
+            List of message dictionaries, with date_received in ISO 8601
+            local time whichever path answered
+
+        Raises:
+            MailAccountNotFoundError: If account doesn't exist
+            MailMailboxNotFoundError: If mailbox doesn't exist
+        """
+        key = (account, mailbox, sender_contains, subject_contains, read_status, limit, scan_limit)
+        with self._search_cache_lock:
+            cached = self._search_cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self._search_cache_ttl:
+                self._search_cache.move_to_end(key)
+                messages = cached[1]
+            else:
+                messages = None
+        if messages is not None:
+            self._remember_locations(messages, account, mailbox)
+            return [dict(msg) for msg in messages]
+
+        messages = self._search_messages_uncached(
+            account, mailbox, sender_contains, subject_contains, read_status, limit, scan_limit
+        )
+        if self._search_cache_ttl > 0:
+            with self._search_cache_lock:
+                self._search_cache[key] = (time.monotonic(), messages)
+                self._search_cache.move_to_end(key)
+                if len(self._search_cache) > _SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+        return [dict(msg) for msg in messages]
+
+    def _search_messages_uncached(
+        self,
+        account: str,
+        mailbox: str,
+        sender_contains: str | None,
+        subject_contains: str | None,
+        read_status: bool | None,
+        limit: int | None,
+        scan_limit: int,
+    ) -> list[dict[str, Any]]:
+        """Run search_messages against the Envelope Index or Mail (see search_messages)."""
+        if self._index_search:
+            try:
+                messages = self._envelope_index.find(
+                    self._get_account_id(account),
+                    mailbox,
+                    sender_contains=sender_contains,
+                    subject_contains=subject_contains,
+                    read_status=read_status,
+                    limit=limit,
+                )
+            except MailIndexUnavailableError as e:
+                logger.debug("Envelope Index unavailable, searching with AppleScript: %s", e)
+            else:
+                self._remember_locations(messages, account, mailbox)
+                return messages
+
+        # If account is known to not support whose, skip straight to direct fetch
+        if account in self._whose_unsupported_accounts:
+            logger.debug("Account '%s' cached as whose-unsupported, using direct fetch", account)
+            result = self._search_messages_direct(account, mailbox, scan_limit, read_status)
+            messages = self._filter_direct_results(
+                result, sender_contains, subject_contains, read_status, limit
+            )
+            self._remember_locations(messages, account, mailbox)
+            return messages
+
+        # Try whose-based approach first. Filter values are passed as script
+        # arguments, so the script text only depends on which filters are set.
+        script = _search_script(
+            bool(sender_contains),
+            bool(subject_contains),
+            read_status is not None,
+            bool(limit),
+        )
+        args = [
+            sanitize_input(account),
+            sanitize_input(mailbox),
+            sanitize_input(sender_contains or ""),
+            sanitize_input(subject_contains or ""),
+            "true" if read_status else "false",
+            str(limit or 0),
+        ]
+
+        try:
+            result = self._run_applescript(script, binary=True, args=args)
+        except MailAppleScriptError as e:
+            if self._is_whose_error(str(e)):
+                logger.info(
+                    "Account '%s' does not support whose clause, falling back to direct fetch",
+                    account,
+                )
+                self._mark_whose_unsupported(account)
+                result = self._search_messages_direct(account, mailbox, scan_limit, read_status)
+                messages = self._filter_direct_results(
+                    result, sender_contains, subject_contains, read_status, limit
+                )
+                self._remember_locations(messages, account, mailbox)
+                return messages
+            raise
 
-    @staticmethod
-    def _is_whose_error(error_msg: str) -> bool:
-        """Check if an AppleScript error is a whose-clause incompatibility."""
-        msg = str(error_msg)
-        normalized = msg.replace("Can’t", "Can't").replace("can’t", "can't")
-        lowered = normalized.lower()
+        messages = self._parse_message_results(result)
+        self._remember_locations(messages, account, mailbox)
+        return messages
 
-        if "illegal comparison or logical" in lowered:
-            return True
-        if "can't get items" in lowered and "whose" in lowered:
-            return True
-        if "whose" in lowered and "(-1728)" in lowered:
-            return True
-        return False
+    def _get_account_id(self, account: str) -> str:
+        """Return an account's ID, fetched once per account and then cached."""
+        if account not in self._account_ids:
+            self._account_ids[account] = self._run_applescript(
+                _ACCOUNT_ID_SCRIPT, args=[sanitize_input(account)]
+            )
+        return self._account_ids[account]
 
-    def search_messages(
+    def search_messages_fts(
         self,
         account: str,
         mailbox: str = "INBOX",
-        sender_contains: str | None = None,
-        subject_contains: str | None = None,
-        read_status: bool | None = None,
-        limit: int | None = None,
-        scan_limit: int = 200,
+        query: str = "",
+        limit: int = 50,
     ) -> list[dict[str, Any]]:
         """
-        Search for messages matching criteria.
+        Find messages whose subject or sender contains a string.
 
-        Uses efficient whose-based AppleScript query for IMAP/iCloud accounts.
-        Automatically falls back to index-based fetch with Python filtering for
-        Exchange accounts where whose clauses are unsupported.
+        Queries a copy of Mail's Envelope Index database, which answers in
+        milliseconds where a whose clause walks every message in Mail. When
+        the index cannot be used (no Full Disk Access, unknown schema, or a
+        mailbox it does not list) this falls back to search_messages, once
+        for the subject and once for the sender.
 
         Args:
             account: Account name
             mailbox: Mailbox name
-            sender_contains: Filter by sender
-            subject_contains: Filter by subject
-            read_status: Filter by read status (True=read, False=unread)
+            query: Text to look for in subject or sender (case-insensitive)
             limit: Maximum results
-            scan_limit: Max messages to scan in fallback mode
 
         Returns:
-            List of message dictionaries
+            List of message dictionaries with date_received in ISO 8601
+            local time. From the index they are newest first; the fallback
+            returns search_messages results
 
         Raises:
             MailAccountNotFoundError: If account doesn't exist
-            MailMailboxNotFoundError: If mailbox doesn't exist
+            MailMailboxNotFoundError: If mailbox doesn't exist (fallback only)
         """
-        # If account is known to not support whose, skip straight to direct fetch
-        if account in self._whose_unsupported_accounts:
-            logger.debug(f"Account '{account}' cached as whose-unsupported, using direct fetch")
-            result = self._search_messages_direct(account, mailbox, scan_limit)
-            messages = self._parse_message_results(result)
-            return self._filter_messages(
-                messages, sender_contains, subject_contains, read_status, limit
+        try:
+            messages = self._envelope_index.search(
+                self._get_account_id(account), mailbox, query, limit
             )
+        except MailIndexUnavailableError as e:
+            logger.info("Envelope Index unavailable, searching with AppleScript: %s", e)
+            by_subject = self.search_messages(
+                account, mailbox, subject_contains=query, limit=limit
+            )
+            by_sender = self.search_messages(account, mailbox, sender_contains=query, limit=limit)
+            messages = []
+            seen: set[str] = set()
+            for msg in itertools.chain(by_subject, by_sender):
+                if msg["id"] not in seen and len(messages) < limit:
+                    seen.add(msg["id"])
+                    messages.append(msg)
+
+        self._remember_locations(messages, account, mailbox)
+        return messages
 
-        # Try whose-based approach first
-        account_safe = escape_applescript_string(sanitize_input(account))
-        mailbox_safe = escape_applescript_string(sanitize_input(mailbox))
-
-        # Build whose clause
-        conditions = []
-        if sender_contains:
-            sender_safe = escape_applescript_string(sanitize_input(sender_contains))
-            conditions.append(f'sender contains "{sender_safe}"')
-
-        if subject_contains:
-            subject_safe = escape_applescript_string(sanitize_input(subject_contains))
-            conditions.append(f'subject contains "{subject_safe}"')
-
-        if read_status is not None:
-            status = "true" if read_status else "false"
-            conditions.append(f"read status is {status}")
+    def get_message(
+        self,
+        message_id: str,
+        include_content: bool = True,
+        account: str | None = None,
+        max_body_bytes: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Get full message details.
 
-        if conditions:
-            message_expression = f'(messages of mailboxRef whose {" and ".join(conditions)})'
-        else:
-            message_expression = "messages of mailboxRef"
-
-        limit_block = ""
-        if limit:
-            limit_block = f"""
-            set msgCount to count of matchedMessages
-            if msgCount > {limit} then
-                set matchedMessages to items 1 thru {limit} of matchedMessages
-            end if
-            """
+        Args:
+            message_id: Message ID
+            include_content: Include message body
+            account: Account holding the message, if known; only its
+                mailboxes are searched when the location is not cached
+            max_body_bytes: Return at most this many bytes of the body
+                (UTF-8); the rest can be read with get_message_body_chunk
 
-        script = f"""
-        tell application "Mail"
-            set accountRef to account "{account_safe}"
-            set mailboxRef to mailbox "{mailbox_safe}" of accountRef
-            set matchedMessages to {message_expression}
-            {limit_block}
-
-            set resultList to {{}}
-            repeat with msg in matchedMessages
-                set msgId to id of msg as text
-                set msgSubject to subject of msg
-                set msgSender to sender of msg
-                set msgDate to date received of msg as text
-                set msgRead to read status of msg
-
-                set msgData to msgId & "|" & msgSubject & "|" & msgSender & "|" & msgDate & "|" & msgRead
-                set end of resultList to msgData
-            end repeat
+        Returns:
+            Message dictionary. "truncated" tells whether the body was cut
+            short, in which case "next_offset" is where the rest starts
 
-            -- Join with newlines
-            set AppleScript's text item delimiters to linefeed
-            set output to resultList as text
-            set AppleScript's text item delimiters to ""
+        Raises:
+            MailMessageNotFoundError: If message doesn't exist
+            ValueError: If max_body_bytes is not positive
+        """
+        if max_body_bytes is not None and max_body_bytes < 1:
+            raise ValueError("max_body_bytes must be positive")
+        body_slice = (0, max_body_bytes) if include_content else None
+        message, (content, next_offset, body_bytes) = self._read_message(
+            message_id, account, body_slice
+        )
+        message["content"] = content
+        message["truncated"] = next_offset < body_bytes
+        if message["truncated"]:
+            message["next_offset"] = next_offset
+        return message
 
-            return output
-        end tell
+    def get_message_body_chunk(
+        self,
+        message_id: str,
+        offset: int = 0,
+        length: int = 65536,
+        account: str | None = None,
+    ) -> dict[str, Any]:
         """
+        Read part of a message body, for bodies too large to fetch at once.
 
-        try:
-            result = self._run_applescript(script)
-        except MailAppleScriptError as e:
-            if self._is_whose_error(str(e)):
-                logger.info(
-                    f"Account '{account}' does not support whose clause, "
-                    "falling back to direct fetch"
-                )
-                self._whose_unsupported_accounts.add(account)
-                result = self._search_messages_direct(account, mailbox, scan_limit)
-                messages = self._parse_message_results(result)
-                return self._filter_messages(
-                    messages, sender_contains, subject_contains, read_status, limit
-                )
-            raise
+        Offsets count bytes of the UTF-8 body and are moved to character
+        boundaries, so passing each chunk's next_offset as the following
+        offset joins the chunks up exactly.
 
-        return self._parse_message_results(result)
+        Args:
+            message_id: Message ID
+            offset: Byte offset to start at
+            length: Maximum number of bytes to return (at least 4, so a
+                chunk always holds a whole character)
+            account: Account holding the message, if known
+
+        Returns:
+            Dictionary with content, offset, next_offset, body_bytes (the
+            body's total size) and has_more
 
-    def get_message(self, message_id: str, include_content: bool = True) -> dict[str, Any]:
+        Raises:
+            MailMessageNotFoundError: If message doesn't exist
+            ValueError: If offset is negative or length is below 4
         """
-        Get full message details.
+        if offset < 0:
+            raise ValueError("offset must not be negative")
+        if length < 4:
+            raise ValueError("length must be at least 4 bytes")
+        _, (content, next_offset, body_bytes) = self._read_message(
+            message_id, account, (offset, length)
+        )
+        return {
+            "id": message_id,
+            "content": content,
+            "offset": min(offset, body_bytes),
+            "next_offset": next_offset,
+            "body_bytes": body_bytes,
+            "has_more": next_offset < body_bytes,
+        }
+
+    def _read_message(
+        self,
+        message_id: str,
+        account: str | None,
+        body_slice: tuple[int, int | None] | None,
+    ) -> tuple[dict[str, Any], tuple[str, int, int]]:
+        """
+        Run ``_GET_MESSAGE_SCRIPT`` and read back part of the body it wrote.
 
         Args:
             message_id: Message ID
-            include_content: Include message body
+            account: Account holding the message, if known
+            body_slice: (byte offset, maximum bytes or None for the rest) of
+                the body to return, or None to skip the body entirely
 
         Returns:
-            Message dictionary
+            The message's header fields, and the body slice as returned by
+            ``_read_body_slice`` (("", 0, 0) without a body)
 
         Raises:
             MailMessageNotFoundError: If message doesn't exist
         """
         message_id_safe = self._validate_message_id(message_id)
 
-        # Note: Direct message ID lookup is tricky in AppleScript
-        # We need to search through mailboxes
-        # For now, we'll use a simplified approach
+        body_path = ""
+        if body_slice is not None:
+            fd, body_path = tempfile.mkstemp(prefix="apple-mail-mcp-", suffix=".txt")
+            os.close(fd)
 
-        content_clause = 'set msgContent to content of msg' if include_content else 'set msgContent to ""'
+        try:
+            args = [*self._locate_args(message_id_safe, account), body_path]
+            result = self._run_located(_GET_MESSAGE_SCRIPT, args)
+            body = ("", 0, 0)
+            if body_slice is not None:
+                body = self._read_body_slice(Path(body_path), *body_slice)
+        finally:
+            if body_path:
+                Path(body_path).unlink(missing_ok=True)
 
-        script = f"""
-        tell application "Mail"
-            -- Search all accounts for message
-            repeat with acc in accounts
-                repeat with mb in mailboxes of acc
-                    try
-                        set msg to first message of mb whose id is {message_id_safe}
-
-                        set msgId to id of msg as text
-                        set msgSubject to subject of msg
-                        set msgSender to sender of msg
-                        set msgDate to date received of msg as text
-                        set msgRead to read status of msg
-                        set msgFlagged to flagged status of msg
-                        {content_clause}
-
-                        return msgId & "|" & msgSubject & "|" & msgSender & "|" & msgDate & "|" & msgRead & "|" & msgFlagged & "|" & msgContent
-                    end try
-                end repeat
-            end repeat
+        # Parse result
+        parts = result.split(_FIELD_SEP)
+        if len(parts) >= 8:
+            msg_id = parts[0].decode("utf-8")
+            self._remember_location(msg_id, parts[6].decode("utf-8"), parts[7].decode("utf-8"))
+            message = {
+                "id": msg_id,
+                "subject": parts[1].decode("utf-8"),
+                "sender": parts[2].decode("utf-8"),
+                "date_received": parts[3].decode("utf-8"),
+                "read_status": parts[4] == b"true",
+                "flagged": parts[5] == b"true",
+            }
+            return message, body
 
-            error "Message not found"
-        end tell
+        raise MailMessageNotFoundError(f"Could not parse message: {message_id}")
+
+    @staticmethod
+    def _read_body_slice(path: Path, offset: int, length: int | None) -> tuple[str, int, int]:
         """
+        Decode part of a UTF-8 body file without reading the rest of it.
 
-        result = self._run_applescript(script)
+        A start inside a character skips to the next one, and a character
+        cut off at the end is left for the following slice.
 
-        # Parse result
-        parts = result.split("|", 6)  # Max 7 parts
-        if len(parts) >= 6:
-            return {
-                "id": parts[0],
-                "subject": parts[1],
-                "sender": parts[2],
-                "date_received": parts[3],
-                "read_status": parts[4].lower() == "true",
-                "flagged": parts[5].lower() == "true",
-                "content": parts[6] if len(parts) > 6 else "",
+        Args:
+            path: Body file written by the script
+            offset: Byte offset to start at
+            length: Maximum number of bytes to read, or None for the rest
+
+        Returns:
+            (text, byte offset just past the text, total size of the file)
+        """
+        with open(path, "rb") as body_file:
+            body_bytes = os.fstat(body_file.fileno()).st_size
+            start = min(offset, body_bytes)
+            body_file.seek(start)
+            data = body_file.read(-1 if length is None else length)
+
+        # UTF-8 continuation bytes look like 0b10xxxxxx
+        skip = 0
+        while skip < min(len(data), 3) and data[skip] & 0xC0 == 0x80:
+            skip += 1
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        end = start + len(data)
+        text = decoder.decode(data[skip:], final=end >= body_bytes)
+        return text, end - len(decoder.getstate()[0]), body_bytes
+
+    def get_messages(
+        self,
+        message_ids: list[str],
+        include_content: bool = False,
+        account: str | None = None,
+        mailbox: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get details of several messages with a single script.
+
+        Each mailbox is searched once for all requested IDs, using locations
+        from ``account``/``mailbox`` or earlier results where known.
+
+        Args:
+            message_ids: Message IDs to fetch
+            include_content: Include message bodies
+            account: Account holding the messages, if known
+            mailbox: Mailbox holding the messages, if known
+
+        Returns:
+            Message dictionaries in request order; IDs that were not found
+            are omitted
+        """
+        if not message_ids:
+            return []
+
+        groups, unknown = self._group_message_ids(message_ids, account, mailbox)
+
+        body_path = ""
+        if include_content:
+            fd, body_path = tempfile.mkstemp(prefix="apple-mail-mcp-", suffix=".txt")
+            os.close(fd)
+
+        try:
+            # argv: unknown IDs, body path, then (account, mailbox, IDs) per group
+            args = [",".join(unknown), body_path]
+            for (group_account, group_mailbox), group_ids in groups.items():
+                args += [
+                    sanitize_input(group_account),
+                    sanitize_input(group_mailbox),
+                    ",".join(group_ids),
+                ]
+            result = self._run_applescript(_GET_MESSAGES_SCRIPT, binary=True, args=args)
+            bodies = Path(body_path).read_bytes().split(_RECORD_SEP) if body_path else []
+        finally:
+            if body_path:
+                Path(body_path).unlink(missing_ok=True)
+
+        found: dict[str, dict[str, Any]] = {}
+        for index, record in enumerate(result.split(_RECORD_SEP)):
+            parts = record.split(_FIELD_SEP)
+            if len(parts) < 8:
+                continue
+            msg_id = parts[0].decode("utf-8")
+            self._remember_location(msg_id, parts[6].decode("utf-8"), parts[7].decode("utf-8"))
+            found[msg_id] = {
+                "id": msg_id,
+                "subject": parts[1].decode("utf-8"),
+                "sender": parts[2].decode("utf-8"),
+                "date_received": parts[3].decode("utf-8"),
+                "read_status": parts[4] == b"true",
+                "flagged": parts[5] == b"true",
+                "content": bodies[index].decode("utf-8") if index < len(bodies) else "",
             }
 
-        raise MailMessageNotFoundError(f"Could not parse message: {message_id}")
+        return [
+            found[message_id]
+            for message_id in dict.fromkeys(map(self._validate_message_id, message_ids))
+            if message_id in found
+        ]
 
     def send_email(
         self,
@@ -483,51 +2370,39 @@ class AppleMailConnector:
         Raises:
             MailAppleScriptError: If send fails
         """
-        subject_safe = escape_applescript_string(sanitize_input(subject))
-        body_safe = escape_applescript_string(sanitize_input(body))
-
-        # Build recipient lists
-        to_list = ", ".join(f'"{escape_applescript_string(addr)}"' for addr in to)
-        cc_list = ", ".join(f'"{escape_applescript_string(addr)}"' for addr in (cc or []))
-        bcc_list = ", ".join(f'"{escape_applescript_string(addr)}"' for addr in (bcc or []))
-
-        script = f"""
-        tell application "Mail"
-            set theMessage to make new outgoing message with properties {{subject:"{subject_safe}", content:"{body_safe}", visible:false}}
-
-            tell theMessage
-                -- Add To recipients
-                repeat with addr in {{{to_list}}}
-                    make new to recipient with properties {{address:addr}}
-                end repeat
-
-                -- Add CC recipients
-                repeat with addr in {{{cc_list}}}
-                    make new cc recipient with properties {{address:addr}}
-                end repeat
-
-                -- Add BCC recipients
-                repeat with addr in {{{bcc_list}}}
-                    make new bcc recipient with properties {{address:addr}}
-                end repeat
-
-                send
-            end tell
-
-            return "sent"
-        end tell
-        """
-
-        result = self._run_applescript(script)
+        args = [
+            sanitize_input(subject),
+            sanitize_input(body),
+            "\n".join(to),
+            "\n".join(cc or []),
+            "\n".join(bcc or []),
+            "",
+        ]
+
+        result = self._run_applescript(_SEND_EMAIL_SCRIPT, args=args)
         return result == "sent"
 
-    def mark_as_read(self, message_ids: list[str], read: bool = True) -> int:
+    def mark_as_read(
+        self,
+        message_ids: list[str],
+        read: bool = True,
+        account: str | None = None,
+        mailbox: str | None = None,
+    ) -> int:
         """
         Mark messages as read or unread.
 
+        Messages are updated with one bulk ``whose id is in`` set per
+        (account, mailbox) group. Locations come from ``account``/``mailbox``
+        when given, otherwise from earlier search_messages/get_message results;
+        only messages with no known location fall back to scanning every
+        mailbox.
+
         Args:
             message_ids: List of message IDs
             read: True for read, False for unread
+            account: Account holding the messages, if known
+            mailbox: Mailbox holding the messages, if known
 
         Returns:
             Number of messages updated
@@ -539,33 +2414,9 @@ class AppleMailConnector:
             return 0
 
         status = "true" if read else "false"
-
-        # Build list of IDs
-        id_list = self._format_message_id_list(message_ids)
-
-        script = f"""
-        tell application "Mail"
-            set idList to {{{id_list}}}
-            set updateCount to 0
-
-            repeat with msgId in idList
-                repeat with acc in accounts
-                    repeat with mb in mailboxes of acc
-                        try
-                            set msg to first message of mb whose id is msgId
-                            set read status of msg to {status}
-                            set updateCount to updateCount + 1
-                        end try
-                    end repeat
-                end repeat
-            end repeat
-
-            return updateCount
-        end tell
-        """
-
-        result = self._run_applescript(script)
-        return int(result) if result.isdigit() else 0
+        return self._run_message_action(
+            "read", message_ids, account, mailbox, action_args=(status, "")
+        )
 
     def send_email_with_attachments(
         self,
@@ -575,7 +2426,7 @@ class AppleMailConnector:
         attachments: list[Path],
         cc: list[str] | None = None,
         bcc: list[str] | None = None,
-        max_attachment_size: int = 25 * 1024 * 1024,
+        max_attachment_size: int = MAX_ATTACHMENT_SIZE,
     ) -> bool:
         """
         Send an email with file attachments.
@@ -597,17 +2448,18 @@ class AppleMailConnector:
             ValueError: If attachment exceeds size limit
             MailAppleScriptError: If send fails
         """
-        from .security import validate_attachment_size, validate_attachment_type
-
         # Validate all attachments exist and are within size limit
         for attachment_path in attachments:
-            if not attachment_path.exists():
-                raise FileNotFoundError(f"Attachment not found: {attachment_path}")
+            # One stat per file answers existence, type and size
+            try:
+                file_stat = attachment_path.stat()
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Attachment not found: {attachment_path}") from None
 
-            if not attachment_path.is_file():
+            if not stat.S_ISREG(file_stat.st_mode):
                 raise ValueError(f"Attachment is not a file: {attachment_path}")
 
-            file_size = attachment_path.stat().st_size
+            file_size = file_stat.st_size
             if not validate_attachment_size(file_size, max_attachment_size):
                 raise ValueError(
                     f"Attachment {attachment_path.name} exceeds size limit "
@@ -619,53 +2471,16 @@ class AppleMailConnector:
                     f"Attachment type not allowed: {attachment_path.name}"
                 )
 
-        subject_safe = escape_applescript_string(sanitize_input(subject))
-        body_safe = escape_applescript_string(sanitize_input(body))
-
-        # Build recipient lists
-        to_list = ", ".join(f'"{escape_applescript_string(addr)}"' for addr in to)
-        cc_list = ", ".join(f'"{escape_applescript_string(addr)}"' for addr in (cc or []))
-        bcc_list = ", ".join(f'"{escape_applescript_string(addr)}"' for addr in (bcc or []))
-
-        # Build attachment list (convert to POSIX file references)
-        attachment_list = ", ".join(
-            f'POSIX file "{escape_applescript_string(str(path.absolute()))}"'
-            for path in attachments
-        )
-
-        script = f"""
-        tell application "Mail"
-            set theMessage to make new outgoing message with properties {{subject:"{subject_safe}", content:"{body_safe}", visible:false}}
-
-            tell theMessage
-                -- Add To recipients
-                repeat with addr in {{{to_list}}}
-                    make new to recipient with properties {{address:addr}}
-                end repeat
-
-                -- Add CC recipients
-                repeat with addr in {{{cc_list}}}
-                    make new cc recipient with properties {{address:addr}}
-                end repeat
-
-                -- Add BCC recipients
-                repeat with addr in {{{bcc_list}}}
-                    make new bcc recipient with properties {{address:addr}}
-                end repeat
-
-                -- Add attachments
-                repeat with filePath in {{{attachment_list}}}
-                    make new attachment with properties {{file name:filePath}} at after last paragraph
-                end repeat
-
-                send
-            end tell
-
-            return "sent"
-        end tell
-        """
+        args = [
+            sanitize_input(subject),
+            sanitize_input(body),
+            "\n".join(to),
+            "\n".join(cc or []),
+            "\n".join(bcc or []),
+            "\n".join(str(path.absolute()) for path in attachments),
+        ]
 
-        result = self._run_applescript(script)
+        result = self._run_applescript(_SEND_EMAIL_SCRIPT, args=args)
         return result == "sent"
 
     def get_attachments(self, message_id: str) -> list[dict[str, Any]]:
@@ -683,58 +2498,21 @@ class AppleMailConnector:
         """
         message_id_safe = self._validate_message_id(message_id)
 
-        script = f"""
-        tell application "Mail"
-            -- Search all accounts for message
-            repeat with acc in accounts
-                repeat with mb in mailboxes of acc
-                    try
-                        set msg to first message of mb whose id is {message_id_safe}
-                        set attList to mail attachments of msg
-
-                        set resultList to {{}}
-                        repeat with att in attList
-                            set attName to name of att
-                            set attType to MIME type of att
-                            set attSize to file size of att
-                            set attDownloaded to downloaded of att
-
-                            set attData to attName & "|" & attType & "|" & attSize & "|" & attDownloaded
-                            set end of resultList to attData
-                        end repeat
-
-                        -- Join with newlines
-                        set AppleScript's text item delimiters to linefeed
-                        set output to resultList as text
-                        set AppleScript's text item delimiters to ""
-
-                        return output
-                    end try
-                end repeat
-            end repeat
-
-            error "Message not found"
-        end tell
-        """
-
-        result = self._run_applescript(script)
+        result = self._run_applescript(
+            _GET_ATTACHMENTS_SCRIPT, binary=True, args=self._locate_args(message_id_safe)
+        )
 
         # Parse results
-        attachments = []
-        if result:
-            for line in result.split("\n"):
-                if not line:
-                    continue
-                parts = line.split("|")
-                if len(parts) >= 4:
-                    attachments.append({
-                        "name": parts[0],
-                        "mime_type": parts[1],
-                        "size": int(parts[2]) if parts[2].isdigit() else 0,
-                        "downloaded": parts[3].lower() == "true",
-                    })
-
-        return attachments
+        return [
+            {
+                "name": fields[0].decode("utf-8"),
+                "mime_type": fields[1].decode("utf-8"),
+                "size": self._parse_count(fields[2]),
+                "downloaded": fields[3] == b"true",
+            }
+            for fields in (record.split(_FIELD_SEP) for record in result.split(_RECORD_SEP))
+            if len(fields) >= 4
+        ]
 
     def save_attachments(
         self,
@@ -775,45 +2553,17 @@ class AppleMailConnector:
             raise ValueError(f"Invalid save directory: {e}")
 
         message_id_safe = self._validate_message_id(message_id)
-        dir_safe = escape_applescript_string(str(save_directory))
 
-        # Build index filter if specified
+        # 1-based indices for AppleScript; "" selects every attachment
+        indices = ""
         if attachment_indices is not None:
-            # Convert to 1-based indexing for AppleScript
-            indices_str = ", ".join(str(i + 1) for i in attachment_indices)
-            index_filter = f"items {{{indices_str}}} of"
-        else:
-            index_filter = ""
-
-        script = f"""
-        tell application "Mail"
-            -- Search all accounts for message
-            repeat with acc in accounts
-                repeat with mb in mailboxes of acc
-                    try
-                        set msg to first message of mb whose id is {message_id_safe}
-                        set attList to {index_filter} mail attachments of msg
-                        set saveCount to 0
-
-                        repeat with att in attList
-                            try
-                                set attName to name of att
-                                save att in ("{dir_safe}/" & attName)
-                                set saveCount to saveCount + 1
-                            end try
-                        end repeat
-
-                        return saveCount
-                    end try
-                end repeat
-            end repeat
-
-            error "Message not found"
-        end tell
-        """
+            if not attachment_indices:
+                return 0
+            indices = ",".join(str(i + 1) for i in attachment_indices)
 
-        result = self._run_applescript(script)
-        return int(result) if result.isdigit() else 0
+        args = [*self._locate_args(message_id_safe), str(save_directory), indices]
+        result = self._run_applescript(_SAVE_ATTACHMENTS_SCRIPT, args=args)
+        return self._parse_count(result)
 
     def move_messages(
         self,
@@ -821,15 +2571,23 @@ class AppleMailConnector:
         destination_mailbox: str,
         account: str,
         gmail_mode: bool = False,
+        source_mailbox: str | None = None,
     ) -> int:
         """
         Move messages to a different mailbox.
 
+        Messages are moved with one batched ``whose id is in`` action per
+        source mailbox. Source mailboxes come from ``source_mailbox`` when
+        given, otherwise from earlier search_messages/get_message results;
+        only messages with no known location fall back to scanning every
+        mailbox.
+
         Args:
             message_ids: List of message IDs to move
             destination_mailbox: Name of destination mailbox
             account: Account name
             gmail_mode: Use Gmail-specific handling (copy + delete)
+            source_mailbox: Mailbox in ``account`` holding the messages, if known
 
         Returns:
             Number of messages moved
@@ -841,76 +2599,35 @@ class AppleMailConnector:
         if not message_ids:
             return 0
 
-        from .utils import sanitize_input
-
-        account_safe = escape_applescript_string(sanitize_input(account))
-        mailbox_safe = escape_applescript_string(sanitize_input(destination_mailbox))
-        id_list = self._format_message_id_list(message_ids)
-
-        if gmail_mode:
-            # Gmail requires copy + delete approach to properly handle labels
-            script = f"""
-            tell application "Mail"
-                set accountRef to account "{account_safe}"
-                set destMailbox to mailbox "{mailbox_safe}" of accountRef
-                set idList to {{{id_list}}}
-                set moveCount to 0
-
-                repeat with msgId in idList
-                    repeat with acc in accounts
-                        repeat with mb in mailboxes of acc
-                            try
-                                set msg to first message of mb whose id is msgId
-                                duplicate msg to destMailbox
-                                delete msg
-                                set moveCount to moveCount + 1
-                            end try
-                        end repeat
-                    end repeat
-                end repeat
-
-                return moveCount
-            end tell
-            """
-        else:
-            # Standard IMAP move
-            script = f"""
-            tell application "Mail"
-                set accountRef to account "{account_safe}"
-                set destMailbox to mailbox "{mailbox_safe}" of accountRef
-                set idList to {{{id_list}}}
-                set moveCount to 0
-
-                repeat with msgId in idList
-                    repeat with acc in accounts
-                        repeat with mb in mailboxes of acc
-                            try
-                                set msg to first message of mb whose id is msgId
-                                set mailbox of msg to destMailbox
-                                set moveCount to moveCount + 1
-                            end try
-                        end repeat
-                    end repeat
-                end repeat
-
-                return moveCount
-            end tell
-            """
-
-        result = self._run_applescript(script)
-        return int(result) if result.isdigit() else 0
+        # Gmail requires copy + delete approach to properly handle labels;
+        # otherwise a standard IMAP move
+        count = self._run_message_action(
+            "copy_delete" if gmail_mode else "move",
+            message_ids,
+            account if source_mailbox else None,
+            source_mailbox,
+            action_args=(sanitize_input(account), sanitize_input(destination_mailbox)),
+        )
+        self._forget_locations(message_ids)
+        return count
 
     def flag_message(
         self,
         message_ids: list[str],
         flag_color: str,
+        account: str | None = None,
+        mailbox: str | None = None,
     ) -> int:
         """
         Set flag color on messages.
 
+        Messages are grouped by location as in mark_as_read.
+
         Args:
             message_ids: List of message IDs to flag
             flag_color: Flag color (none, orange, red, yellow, blue, green, purple, gray)
+            account: Account holding the messages, if known
+            mailbox: Mailbox holding the messages, if known
 
         Returns:
             Number of messages flagged
@@ -921,39 +2638,13 @@ class AppleMailConnector:
         if not message_ids:
             return 0
 
-        from .utils import get_flag_index, validate_flag_color
-
-        if not validate_flag_color(flag_color):
+        action_args = _FLAG_ACTION_ARGS.get(flag_color.lower())
+        if action_args is None:
             raise ValueError(f"Invalid flag color: {flag_color}")
 
-        flag_index = get_flag_index(flag_color)
-        flagged_status = "true" if flag_color != "none" else "false"
-        id_list = self._format_message_id_list(message_ids)
-
-        script = f"""
-        tell application "Mail"
-            set idList to {{{id_list}}}
-            set flagCount to 0
-
-            repeat with msgId in idList
-                repeat with acc in accounts
-                    repeat with mb in mailboxes of acc
-                        try
-                            set msg to first message of mb whose id is msgId
-                            set flag index of msg to {flag_index}
-                            set flagged status of msg to {flagged_status}
-                            set flagCount to flagCount + 1
-                        end try
-                    end repeat
-                end repeat
-            end repeat
-
-            return flagCount
-        end tell
-        """
-
-        result = self._run_applescript(script)
-        return int(result) if result.isdigit() else 0
+        return self._run_message_action(
+            "flag", message_ids, account, mailbox, action_args=action_args
+        )
 
     def create_mailbox(
         self,
@@ -977,36 +2668,14 @@ class AppleMailConnector:
             MailAccountNotFoundError: If account doesn't exist
             MailAppleScriptError: If mailbox already exists
         """
-        from .utils import sanitize_mailbox_name
-
         # Validate and sanitize name
         sanitized_name = sanitize_mailbox_name(name)
         if not sanitized_name:
             raise ValueError(f"Invalid mailbox name: {name}")
 
-        account_safe = escape_applescript_string(sanitize_input(account))
-        name_safe = escape_applescript_string(sanitized_name)
-
-        if parent_mailbox:
-            parent_safe = escape_applescript_string(sanitize_input(parent_mailbox))
-            script = f"""
-            tell application "Mail"
-                set accountRef to account "{account_safe}"
-                set parentMailbox to mailbox "{parent_safe}" of accountRef
-                make new mailbox at parentMailbox with properties {{name:"{name_safe}"}}
-                return "success"
-            end tell
-            """
-        else:
-            script = f"""
-            tell application "Mail"
-                set accountRef to account "{account_safe}"
-                make new mailbox at accountRef with properties {{name:"{name_safe}"}}
-                return "success"
-            end tell
-            """
-
-        result = self._run_applescript(script)
+        args = [sanitize_input(account), sanitize_input(parent_mailbox or ""), sanitized_name]
+        self._mailbox_cache.pop(account, None)
+        result = self._run_applescript(_CREATE_MAILBOX_SCRIPT, args=args)
         return result == "success"
 
     def delete_messages(
@@ -1014,14 +2683,20 @@ class AppleMailConnector:
         message_ids: list[str],
         permanent: bool = False,
         skip_bulk_check: bool = True,
+        account: str | None = None,
+        mailbox: str | None = None,
     ) -> int:
         """
         Delete messages (move to trash or permanent delete).
 
+        Messages are grouped by location as in mark_as_read.
+
         Args:
             message_ids: List of message IDs to delete
             permanent: If True, permanently delete (bypass trash)
             skip_bulk_check: If False, enforce bulk operation limits
+            account: Account holding the messages, if known
+            mailbox: Mailbox holding the messages, if known
 
         Returns:
             Number of messages deleted
@@ -1039,55 +2714,10 @@ class AppleMailConnector:
                 "Maximum is 100 without skip_bulk_check=True"
             )
 
-        id_list = self._format_message_id_list(message_ids)
-
-        if permanent:
-            # Permanent delete (not recommended, requires extra caution)
-            script = f"""
-            tell application "Mail"
-                set idList to {{{id_list}}}
-                set deleteCount to 0
-
-                repeat with msgId in idList
-                    repeat with acc in accounts
-                        repeat with mb in mailboxes of acc
-                            try
-                                set msg to first message of mb whose id is msgId
-                                delete msg
-                                set deleteCount to deleteCount + 1
-                            end try
-                        end repeat
-                    end repeat
-                end repeat
-
-                return deleteCount
-            end tell
-            """
-        else:
-            # Move to trash (standard delete)
-            script = f"""
-            tell application "Mail"
-                set idList to {{{id_list}}}
-                set deleteCount to 0
-
-                repeat with msgId in idList
-                    repeat with acc in accounts
-                        repeat with mb in mailboxes of acc
-                            try
-                                set msg to first message of mb whose id is msgId
-                                delete msg
-                                set deleteCount to deleteCount + 1
-                            end try
-                        end repeat
-                    end repeat
-                end repeat
-
-                return deleteCount
-            end tell
-            """
-
-        result = self._run_applescript(script)
-        return int(result) if result.isdigit() else 0
+        # Both modes issue Mail's delete command, as the per-message scripts did
+        count = self._run_message_action("delete", message_ids, account, mailbox)
+        self._forget_locations(message_ids)
+        return count
 
     def reply_to_message(
         self,
@@ -1095,6 +2725,8 @@ class AppleMailConnector:
         body: str,
         reply_all: bool = False,
         quote_original: bool = True,
+        account: str | None = None,
+        mailbox: str | None = None,
     ) -> str:
         """
         Reply to a message.
@@ -1104,6 +2736,8 @@ class AppleMailConnector:
             body: Reply body text
             reply_all: If True, reply to all recipients; if False, reply only to sender
             quote_original: If True, include original message quoted
+            account: Account holding the message, if known (e.g. from search)
+            mailbox: Mailbox holding the message, if known
 
         Returns:
             Message ID of the reply
@@ -1111,42 +2745,15 @@ class AppleMailConnector:
         Raises:
             MailMessageNotFoundError: If message doesn't exist
         """
-        body_safe = escape_applescript_string(sanitize_input(body))
         message_id_safe = self._validate_message_id(message_id)
-        reply_type = "reply to all" if reply_all else "reply"
-
-        # Apple Mail's reply command automatically handles quoting if opened in editor
-        # We'll create a reply and set its content
-        script = f"""
-        tell application "Mail"
-            repeat with acc in accounts
-                repeat with mb in mailboxes of acc
-                    try
-                        set origMsg to first message of mb whose id is {message_id_safe}
-
-                        -- Create reply message
-                        set replyMsg to {reply_type} origMsg
-
-                        -- Set body content
-                        set content of replyMsg to "{body_safe}"
-
-                        -- Get the message ID
-                        set replyId to id of replyMsg
-
-                        -- Send the message
-                        send replyMsg
-
-                        return replyId
-                    end try
-                end repeat
-            end repeat
-
-            error "Message not found"
-        end tell
-        """
+        args = [
+            *self._locate_args(message_id_safe, account, mailbox),
+            sanitize_input(body),
+            "true" if reply_all else "false",
+        ]
 
-        result = self._run_applescript(script)
-        return result
+        result = self._run_located(_REPLY_SCRIPT, args)
+        return result.decode("utf-8").strip()
 
     def forward_message(
         self,
@@ -1156,6 +2763,8 @@ class AppleMailConnector:
         cc: list[str] | None = None,
         bcc: list[str] | None = None,
         include_attachments: bool = True,
+        account: str | None = None,
+        mailbox: str | None = None,
     ) -> str:
         """
         Forward a message to recipients.
@@ -1167,6 +2776,8 @@ class AppleMailConnector:
             cc: Optional CC recipients
             bcc: Optional BCC recipients
             include_attachments: If True, include original attachments
+            account: Account holding the message, if known (e.g. from search)
+            mailbox: Mailbox holding the message, if known
 
         Returns:
             Message ID of the forwarded message
@@ -1175,84 +2786,23 @@ class AppleMailConnector:
             ValueError: If no recipients or invalid emails
             MailMessageNotFoundError: If message doesn't exist
         """
-        from .utils import format_applescript_list, sanitize_input, validate_email
-
         if not to:
             raise ValueError("At least one recipient required")
 
         # Validate all email addresses
-        for email in to:
-            if not validate_email(email):
-                raise ValueError(f"Invalid email address: {email}")
-
-        if cc:
-            for email in cc:
-                if not validate_email(email):
-                    raise ValueError(f"Invalid CC email address: {email}")
+        for label, emails in (("", to), ("CC ", cc or []), ("BCC ", bcc or [])):
+            invalid = find_invalid_email(emails)
+            if invalid is not None:
+                raise ValueError(f"Invalid {label}email address: {invalid}")
 
-        if bcc:
-            for email in bcc:
-                if not validate_email(email):
-                    raise ValueError(f"Invalid BCC email address: {email}")
-
-        body_safe = escape_applescript_string(sanitize_input(body))
         message_id_safe = self._validate_message_id(message_id)
-        to_list = format_applescript_list(to)
-        cc_list = format_applescript_list(cc) if cc else '""'
-        bcc_list = format_applescript_list(bcc) if bcc else '""'
-
-        script = f"""
-        tell application "Mail"
-            repeat with acc in accounts
-                repeat with mb in mailboxes of acc
-                    try
-                        set origMsg to first message of mb whose id is {message_id_safe}
-
-                        -- Create forward message
-                        set fwdMsg to forward origMsg
-
-                        -- Add body text before forwarded content
-                        if "{body_safe}" is not "" then
-                            set origContent to content of fwdMsg
-                            set content of fwdMsg to "{body_safe}" & return & return & origContent
-                        end if
-
-                        -- Set recipients
-                        set toRecipients to {to_list}
-                        repeat with recipientAddr in toRecipients
-                            make new to recipient at end of to recipients of fwdMsg with properties {{address:recipientAddr}}
-                        end repeat
-
-                        -- Set CC if provided
-                        if {cc_list} is not "" then
-                            set ccRecipients to {cc_list}
-                            repeat with recipientAddr in ccRecipients
-                                make new cc recipient at end of cc recipients of fwdMsg with properties {{address:recipientAddr}}
-                            end repeat
-                        end if
-
-                        -- Set BCC if provided
-                        if {bcc_list} is not "" then
-                            set bccRecipients to {bcc_list}
-                            repeat with recipientAddr in bccRecipients
-                                make new bcc recipient at end of bcc recipients of fwdMsg with properties {{address:recipientAddr}}
-                            end repeat
-                        end if
-
-                        -- Get the message ID
-                        set fwdId to id of fwdMsg
-
-                        -- Send the message
-                        send fwdMsg
-
-                        return fwdId
-                    end try
-                end repeat
-            end repeat
-
-            error "Message not found"
-        end tell
-        """
-
-        result = self._run_applescript(script)
-        return result
+        args = [
+            *self._locate_args(message_id_safe, account, mailbox),
+            sanitize_input(body),
+            "\n".join(to),
+            "\n".join(cc or []),
+            "\n".join(bcc or []),
+        ]
+
+        result = self._run_located(_FORWARD_SCRIPT, args)
+        return result.decode("utf-8").strip()
@@ -2,20 +2,70 @@
 Security utilities for Apple Mail MCP.
 """
 
+import atexit
 import logging
+import threading
+import time
+from collections import defaultdict, deque
 from datetime import datetime
+from itertools import chain, islice
 from typing import Any
 
-from .utils import validate_email
+from .utils import iter_invalid_emails
 
 logger = logging.getLogger(__name__)
 
+# Executable extensions blocked from attachments unless explicitly allowed
+_DANGEROUS_EXTENSIONS = frozenset({
+    '.exe', '.bat', '.cmd', '.com', '.scr', '.pif',
+    '.vbs', '.vbe', '.js', '.jse', '.wsf', '.wsh',
+    '.msi', '.msp', '.scf', '.lnk', '.inf', '.reg',
+    '.ps1', '.psm1', '.app', '.deb', '.rpm', '.sh',
+    '.bash', '.csh', '.ksh', '.zsh', '.command'
+})
+
+
+# Default attachment size limit in bytes (25MB, Mail's usual server limit)
+MAX_ATTACHMENT_SIZE = 25 * 1024 * 1024
+
+# Audit log lines are emitted in batches of this many operations, or once the
+# oldest buffered line is this many seconds old
+_FLUSH_EVERY = 64
+_FLUSH_INTERVAL = 5.0
+
 
 class OperationLogger:
-    """Log operations for audit trail."""
+    """Log operations for audit trail, keeping the most recent entries."""
 
-    def __init__(self) -> None:
-        self.operations: list[dict[str, Any]] = []
+    def __init__(
+        self, max_entries: int = 10_000, flush_interval: float = _FLUSH_INTERVAL
+    ) -> None:
+        """
+        Initialize the logger.
+
+        Args:
+            max_entries: Number of entries kept; older ones are discarded
+            flush_interval: Most seconds a log line is buffered before writing
+        """
+        # (timestamp_ns, operation, parameters, result) records; dictionaries
+        # are only built for the entries get_recent_operations returns
+        self.operations: deque[tuple[int, str, dict[str, Any], str]] = deque(
+            maxlen=max_entries
+        )
+        # Monotonic times of logged operations, per operation name, so rate
+        # checks never scan the audit entries
+        self._by_op: defaultdict[str, deque[float]] = defaultdict(
+            lambda: deque(maxlen=max_entries)
+        )
+        self._lock = threading.Lock()
+        # (timestamp_ns, operation, result) records not yet written to the log
+        self._pending: list[tuple[int, str, str]] = []
+        # Batches are written by a background thread (started with the first
+        # buffered line) so tool calls never wait on log handler I/O. It wakes
+        # for each full batch and otherwise every flush_interval seconds.
+        self._flush_interval = flush_interval
+        self._flush_wanted = threading.Event()
+        self._flusher: threading.Thread | None = None
 
     def log_operation(
         self, operation: str, parameters: dict[str, Any], result: str = "success"
@@ -23,19 +73,69 @@ class OperationLogger:
         """
         Log an operation with timestamp.
 
+        The entry is added to the audit trail immediately; the log line is
+        buffered and written by a background thread once a batch is full or
+        flush_interval seconds have passed (see flush).
+
         Args:
             operation: Operation name
             parameters: Operation parameters
             result: Result status (success/failure/cancelled)
         """
-        entry = {
-            "timestamp": datetime.now().isoformat(),
-            "operation": operation,
-            "parameters": parameters,
-            "result": result,
-        }
-        self.operations.append(entry)
-        logger.info(f"Operation logged: {operation} - {result}")
+        timestamp_ns = time.time_ns()
+        with self._lock:
+            self.operations.append((timestamp_ns, operation, parameters, result))
+            self._by_op[operation].append(time.monotonic())
+            if not logger.isEnabledFor(logging.INFO):
+                return
+            self._pending.append((timestamp_ns, operation, result))
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="operation-log-flusher", daemon=True
+                )
+                self._flusher.start()
+            if len(self._pending) < _FLUSH_EVERY:
+                return
+        self._flush_wanted.set()
+
+    def _flush_loop(self) -> None:
+        """Write buffered lines as batches fill or time passes, for the life of the process."""
+        while True:
+            self._flush_wanted.wait(timeout=self._flush_interval)
+            self._flush_wanted.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered operations to the log as a single record, each with its own time."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            logger.info(
+                "Operations logged:\n%s",
+                "\n".join(
+                    f"{datetime.fromtimestamp(timestamp_ns / 1e9).isoformat()} "
+                    f"{operation} - {result}"
+                    for timestamp_ns, operation, result in pending
+                ),
+            )
+
+    def count_recent(self, operation: str, window_seconds: float) -> int:
+        """
+        Count operations of one name logged within the last window_seconds.
+
+        Args:
+            operation: Operation name
+            window_seconds: Time window in seconds
+
+        Returns:
+            Number of matching operations in the window
+        """
+        cutoff = time.monotonic() - window_seconds
+        with self._lock:
+            times = self._by_op[operation]
+            while times and times[0] <= cutoff:
+                times.popleft()
+            return len(times)
 
     def get_recent_operations(self, limit: int = 10) -> list[dict[str, Any]]:
         """
@@ -45,13 +145,26 @@ class OperationLogger:
             limit: Maximum number of operations to return
 
         Returns:
-            List of recent operations
+            List of recent operations, oldest first, each with an ISO 8601
+            timestamp
         """
-        return self.operations[-limit:]
+        recent = list(islice(reversed(self.operations), limit))
+        recent.reverse()
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(timestamp_ns / 1e9).isoformat(),
+                "operation": operation,
+                "parameters": parameters,
+                "result": result,
+            }
+            for timestamp_ns, operation, parameters, result in recent
+        ]
 
 
 # Global operation logger instance
 operation_logger = OperationLogger()
+# Buffered lines are written even when the server exits without main's cleanup
+atexit.register(operation_logger.flush)
 
 
 def require_confirmation(
@@ -83,11 +196,11 @@ def require_confirmation(
     # explicit user action.
     #
     if confirmed:
-        logger.info(f"Confirmation acknowledged for: {operation}")
+        logger.info("Confirmation acknowledged for: %s", operation)
         return True
 
-    logger.warning(f"Confirmation requested for: {operation}")
-    logger.warning(f"Details: {details}")
+    # One record; the details repr is only built if a handler emits it
+    logger.warning("Confirmation requested for: %s; details: %r", operation, details)
     return False
 
 
@@ -109,18 +222,20 @@ def validate_send_operation(
     if not to:
         return False, "At least one 'to' recipient is required"
 
-    # Validate all email addresses
-    all_recipients = to + (cc or []) + (bcc or [])
-    invalid_emails = [email for email in all_recipients if not validate_email(email)]
-
-    if invalid_emails:
-        return False, f"Invalid email addresses: {', '.join(invalid_emails)}"
-
-    # Check for reasonable limits (prevent spam)
+    # Check for reasonable limits (prevent spam) first, which also bounds the
+    # validation work below
     max_recipients = 100
-    if len(all_recipients) > max_recipients:
+    if len(to) + len(cc or ()) + len(bcc or ()) > max_recipients:
         return False, f"Too many recipients (max: {max_recipients})"
 
+    # Validate all email addresses. The scan stops at the first invalid one
+    # and resumes from there only to list the rest for the error message.
+    invalid = iter_invalid_emails(chain(to, cc or (), bcc or ()))
+    first_invalid = next(invalid, None)
+    if first_invalid is not None:
+        invalid_emails = [first_invalid, *invalid]
+        return False, f"Invalid email addresses: {', '.join(invalid_emails)}"
+
     return True, ""
 
 
@@ -148,6 +263,8 @@ def rate_limit_check(operation: str, window_seconds: int = 60, max_operations: i
     """
     Check if operation should be rate limited.
 
+    Operations are counted as they are logged with operation_logger.
+
     Args:
         operation: Operation name
         window_seconds: Time window in seconds
@@ -156,15 +273,12 @@ def rate_limit_check(operation: str, window_seconds: int = 60, max_operations: i
     Returns:
         True if allowed, False if rate limited
     """
-    # TODO: Implement actual rate limiting with timing
-    # For now, just log and return True
-
-    recent_ops = [
-        op for op in operation_logger.operations if op["operation"] == operation
-    ]
-
-    if len(recent_ops) > max_operations:
-        logger.warning(f"Rate limit check for {operation}: {len(recent_ops)} recent operations")
+    recent = operation_logger.count_recent(operation, window_seconds)
+    if recent >= max_operations:
+        logger.warning(
+            "Rate limit reached for %s: %d operations in %ss", operation, recent, window_seconds
+        )
+        return False
 
     return True
 
@@ -186,27 +300,18 @@ def validate_attachment_type(filename: str, allow_executables: bool = False) ->
         >>> validate_attachment_type("malware.exe")
         False
     """
-    # Dangerous executable extensions (block by default)
-    dangerous_extensions = {
-        '.exe', '.bat', '.cmd', '.com', '.scr', '.pif',
-        '.vbs', '.vbe', '.js', '.jse', '.wsf', '.wsh',
-        '.msi', '.msp', '.scf', '.lnk', '.inf', '.reg',
-        '.ps1', '.psm1', '.app', '.deb', '.rpm', '.sh',
-        '.bash', '.csh', '.ksh', '.zsh', '.command'
-    }
-
-    filename_lower = filename.lower()
-
-    # Check for dangerous extensions
-    for ext in dangerous_extensions:
-        if filename_lower.endswith(ext):
-            return allow_executables
+    # Every listed extension has a single dot, so only the text after the last
+    # dot matters. rpartition (unlike os.path.splitext) also catches bare
+    # names such as ".bash".
+    _, dot, extension = filename.rpartition(".")
+    if dot and dot + extension.lower() in _DANGEROUS_EXTENSIONS:
+        return allow_executables
 
     # All other types are allowed
     return True
 
 
-def validate_attachment_size(size_bytes: int, max_size: int = 25 * 1024 * 1024) -> bool:
+def validate_attachment_size(size_bytes: int, max_size: int = MAX_ATTACHMENT_SIZE) -> bool:
     """
     Validate attachment file size.
 
@@ -2,10 +2,16 @@
 FastMCP server for Apple Mail integration.
 """
 
+import asyncio
+import functools
+import inspect
 import logging
-from typing import Any
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar, get_type_hints
 
 from fastmcp import FastMCP
+from pydantic import TypeAdapter, ValidationError
 
 from .exceptions import (
     MailAccountNotFoundError,
@@ -13,7 +19,7 @@ from .exceptions import (
     MailMailboxNotFoundError,
     MailMessageNotFoundError,
 )
-from .mail_connector import AppleMailConnector
+from .mail_connector import DEFAULT_WHOSE_CACHE_PATH, AppleMailConnector
 from .security import (
     operation_logger,
     require_confirmation,
@@ -32,16 +38,81 @@ logger = logging.getLogger(__name__)
 mcp = FastMCP("apple-mail")
 
 # Initialize mail connector
-mail = AppleMailConnector()
+mail = AppleMailConnector(persistent=True, whose_cache_path=DEFAULT_WHOSE_CACHE_PATH)
+
+# Most connector calls (and so osascript processes) running at once
+_MAX_CONCURRENT_MAIL_CALLS = 4
+_mail_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_MAIL_CALLS)
+
+# Largest body chunk get_message_body_chunk returns
+_MAX_BODY_CHUNK_BYTES = 1024 * 1024
+
+# Most message IDs one bulk tool call accepts
+_MAX_BULK_IDS = 100
+
+# Characters of the body shown when asking to confirm a send, and the suffix
+# appended (indexed by whether the body was cut)
+_PREVIEW_LENGTH = 100
+_PREVIEW_SUFFIX = ("", "...")
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+
+async def _run_blocking(func: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs) -> _T:
+    """
+    Run a blocking connector call in a worker thread.
+
+    Keeps the event loop free to serve other requests while AppleScript runs,
+    with at most ``_MAX_CONCURRENT_MAIL_CALLS`` calls in flight.
+
+    Args:
+        func: Connector method to call
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns
+    """
+    async with _mail_semaphore:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+def _error_response(error_type: str, error: str) -> dict[str, Any]:
+    """Build the standard failure response returned by every tool."""
+    return {"success": False, "error": error, "error_type": error_type}
+
+
+def _validation_error(error: str) -> dict[str, Any]:
+    """Build the response for arguments rejected before any work is done."""
+    logger.error("Validation failed: %s", error)
+    return _error_response("validation_error", error)
+
+
+def _project(result: dict[str, Any], fields: list[str] | None) -> dict[str, Any]:
+    """Keep only the requested keys of a successful response.
+
+    Failures are returned whole so the caller always sees the error, and
+    ``success`` is kept even when not requested.
+    """
+    if fields is None or not result.get("success"):
+        return result
+    return {key: value for key, value in result.items() if key == "success" or key in fields}
+
+
+def _body_preview(body: str) -> str:
+    """Return the start of a message body for a send confirmation."""
+    return body[:_PREVIEW_LENGTH] + _PREVIEW_SUFFIX[len(body) > _PREVIEW_LENGTH]
 
 
 @mcp.tool()
-def list_mailboxes(account: str) -> dict[str, Any]:
+async def list_mailboxes(account: str, refresh: bool = False) -> dict[str, Any]:
     """
     List all mailboxes for an account.
 
     Args:
         account: Account name (e.g., "Gmail", "iCloud")
+        refresh: Skip the short-lived mailbox cache (default: False)
 
     Returns:
         Dictionary containing mailboxes list
@@ -51,9 +122,9 @@ def list_mailboxes(account: str) -> dict[str, Any]:
         {"mailboxes": [{"name": "INBOX", "unread_count": 5}, ...]}
     """
     try:
-        logger.info(f"Listing mailboxes for account: {account}")
+        logger.info("Listing mailboxes for account: %s", account)
 
-        mailboxes = mail.list_mailboxes(account)
+        mailboxes = await _run_blocking(mail.list_mailboxes, account, refresh=refresh)
 
         operation_logger.log_operation(
             "list_mailboxes",
@@ -68,23 +139,16 @@ def list_mailboxes(account: str) -> dict[str, Any]:
         }
 
     except MailAccountNotFoundError as e:
-        logger.error(f"Account not found: {e}")
-        return {
-            "success": False,
-            "error": f"Account '{account}' not found",
-            "error_type": "account_not_found",
-        }
+        logger.error("Account not found: %s", e)
+        return _error_response("account_not_found", f"Account '{account}' not found")
     except Exception as e:
-        logger.error(f"Error listing mailboxes: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
-        }
+        error = str(e)
+        logger.error("Error listing mailboxes: %s", error)
+        return _error_response("unknown", error)
 
 
 @mcp.tool()
-def search_messages(
+async def search_messages(
     account: str,
     mailbox: str = "INBOX",
     sender_contains: str | None = None,
@@ -112,11 +176,12 @@ def search_messages(
     """
     try:
         logger.info(
-            f"Searching messages in {account}/{mailbox} with filters: "
-            f"sender={sender_contains}, subject={subject_contains}, read={read_status}"
+            "Searching messages in %s/%s with filters: sender=%s, subject=%s, read=%s",
+            account, mailbox, sender_contains, subject_contains, read_status,
         )
 
-        messages = mail.search_messages(
+        messages = await _run_blocking(
+            mail.search_messages,
             account=account,
             mailbox=mailbox,
             sender_contains=sender_contains,
@@ -148,29 +213,90 @@ def search_messages(
         }
 
     except (MailAccountNotFoundError, MailMailboxNotFoundError) as e:
-        logger.error(f"Not found error: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "not_found",
-        }
+        error = str(e)
+        logger.error("Not found error: %s", error)
+        return _error_response("not_found", error)
     except Exception as e:
-        logger.error(f"Error searching messages: {e}")
+        error = str(e)
+        logger.error("Error searching messages: %s", error)
+        return _error_response("unknown", error)
+
+
+@mcp.tool()
+async def search_messages_fts(
+    account: str,
+    query: str,
+    mailbox: str = "INBOX",
+    limit: int = 50,
+) -> dict[str, Any]:
+    """
+    Quickly find messages whose subject or sender contains text.
+
+    Reads Mail's own message index, which is much faster than search_messages
+    on large mailboxes (needs Full Disk Access; falls back to a regular
+    search otherwise).
+
+    Args:
+        account: Account name (e.g., "Gmail", "iCloud")
+        query: Text to find in the subject or sender
+        mailbox: Mailbox name (default: "INBOX")
+        limit: Maximum results to return (default: 50)
+
+    Returns:
+        Dictionary containing matching messages, newest first
+
+    Example:
+        >>> search_messages_fts("Gmail", "invoice", limit=10)
+        {"success": True, "messages": [...], "count": 3}
+    """
+    try:
+        logger.info("Index search in %s/%s for: %s", account, mailbox, query)
+
+        messages = await _run_blocking(
+            mail.search_messages_fts, account=account, mailbox=mailbox, query=query, limit=limit
+        )
+
+        operation_logger.log_operation(
+            "search_messages_fts",
+            {"account": account, "mailbox": mailbox, "query": query},
+            "success"
+        )
+
         return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
+            "success": True,
+            "account": account,
+            "mailbox": mailbox,
+            "messages": messages,
+            "count": len(messages),
         }
 
+    except (MailAccountNotFoundError, MailMailboxNotFoundError) as e:
+        error = str(e)
+        logger.error("Not found error: %s", error)
+        return _error_response("not_found", error)
+    except Exception as e:
+        error = str(e)
+        logger.error("Error searching messages: %s", error)
+        return _error_response("unknown", error)
+
 
 @mcp.tool()
-def get_message(message_id: str, include_content: bool = True) -> dict[str, Any]:
+async def get_message(
+    message_id: str,
+    include_content: bool = True,
+    account: str | None = None,
+    max_body_bytes: int = 65536,
+) -> dict[str, Any]:
     """
     Get full details of a specific message.
 
     Args:
         message_id: Message ID from search results
         include_content: Include message body (default: true)
+        account: Account holding the message (optional, speeds up lookup)
+        max_body_bytes: Longest body returned, in bytes (default: 65536). Longer
+            bodies are cut short with "truncated" set; read the rest with
+            get_message_body_chunk starting at "next_offset"
 
     Returns:
         Dictionary containing message details
@@ -180,9 +306,15 @@ def get_message(message_id: str, include_content: bool = True) -> dict[str, Any]
         {"success": True, "message": {...}}
     """
     try:
-        logger.info(f"Getting message: {message_id}")
+        logger.info("Getting message: %s", message_id)
 
-        message = mail.get_message(message_id, include_content=include_content)
+        message = await _run_blocking(
+            mail.get_message,
+            message_id,
+            include_content=include_content,
+            account=account,
+            max_body_bytes=max_body_bytes,
+        )
 
         operation_logger.log_operation(
             "get_message",
@@ -195,24 +327,129 @@ def get_message(message_id: str, include_content: bool = True) -> dict[str, Any]
             "message": message,
         }
 
+    except ValueError as e:
+        return _validation_error(str(e))
     except MailMessageNotFoundError as e:
-        logger.error(f"Message not found: {e}")
-        return {
-            "success": False,
-            "error": f"Message '{message_id}' not found",
-            "error_type": "message_not_found",
-        }
+        logger.error("Message not found: %s", e)
+        return _error_response("message_not_found", f"Message '{message_id}' not found")
     except Exception as e:
-        logger.error(f"Error getting message: {e}")
+        error = str(e)
+        logger.error("Error getting message: %s", error)
+        return _error_response("unknown", error)
+
+
+@mcp.tool()
+async def get_message_body_chunk(
+    message_id: str,
+    offset: int = 0,
+    length: int = 65536,
+    account: str | None = None,
+) -> dict[str, Any]:
+    """
+    Read part of a message body, for bodies get_message truncated.
+
+    Args:
+        message_id: Message ID from search results
+        offset: Byte offset to start at, e.g. get_message's "next_offset"
+        length: Maximum bytes to return (4 to 1048576, default: 65536)
+        account: Account holding the message (optional, speeds up lookup)
+
+    Returns:
+        Dictionary with the chunk's content, next_offset to continue from,
+        the body's total size in bytes and whether more remains
+
+    Example:
+        >>> get_message_body_chunk("12345", offset=65536)
+        {"success": True, "content": "...", "next_offset": 131072,
+         "body_bytes": 200000, "has_more": True, ...}
+    """
+    if length > _MAX_BODY_CHUNK_BYTES:
+        return _validation_error(f"length cannot exceed {_MAX_BODY_CHUNK_BYTES} bytes")
+
+    try:
+        logger.info("Reading body of message %s from byte %s", message_id, offset)
+
+        chunk = await _run_blocking(
+            mail.get_message_body_chunk, message_id, offset=offset, length=length, account=account
+        )
+
+        operation_logger.log_operation(
+            "get_message_body_chunk",
+            {"message_id": message_id, "offset": offset, "length": length},
+            "success"
+        )
+
+        return {"success": True, **chunk}
+
+    except ValueError as e:
+        return _validation_error(str(e))
+    except MailMessageNotFoundError as e:
+        logger.error("Message not found: %s", e)
+        return _error_response("message_not_found", f"Message '{message_id}' not found")
+    except Exception as e:
+        error = str(e)
+        logger.error("Error reading message body: %s", error)
+        return _error_response("unknown", error)
+
+
+@mcp.tool()
+async def get_messages(
+    message_ids: list[str],
+    include_content: bool = False,
+    account: str | None = None,
+    mailbox: str | None = None,
+) -> dict[str, Any]:
+    """
+    Get details of several messages at once.
+
+    Args:
+        message_ids: Message IDs from search results
+        include_content: Include message bodies (default: false)
+        account: Account holding the messages (optional, speeds up lookup)
+        mailbox: Mailbox holding the messages (optional, speeds up lookup)
+
+    Returns:
+        Dictionary containing the messages found, in request order
+
+    Example:
+        >>> get_messages(["12345", "12346"])
+        {"success": True, "messages": [...], "requested": 2}
+    """
+    is_valid, error_msg = validate_bulk_operation(len(message_ids), max_items=_MAX_BULK_IDS)
+    if not is_valid:
+        return _validation_error(error_msg)
+
+    try:
+        logger.info("Getting %s messages", len(message_ids))
+
+        messages = await _run_blocking(
+            mail.get_messages,
+            message_ids,
+            include_content=include_content,
+            account=account,
+            mailbox=mailbox,
+        )
+
+        operation_logger.log_operation(
+            "get_messages",
+            {"count": len(message_ids)},
+            "success"
+        )
+
         return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
+            "success": True,
+            "messages": messages,
+            "requested": len(message_ids),
         }
 
+    except Exception as e:
+        error = str(e)
+        logger.error("Error getting messages: %s", error)
+        return _error_response("unknown", error)
+
 
 @mcp.tool()
-def send_email(
+async def send_email(
     subject: str,
     body: str,
     to: list[str],
@@ -245,28 +482,26 @@ def send_email(
         ... )
         {"success": True, "message": "Email sent successfully"}
     """
+    cc = cc or []
+    bcc = bcc or []
+
     try:
         # Validate operation
         is_valid, error_msg = validate_send_operation(to, cc, bcc)
         if not is_valid:
-            logger.error(f"Validation failed: {error_msg}")
-            return {
-                "success": False,
-                "error": error_msg,
-                "error_type": "validation_error",
-            }
+            return _validation_error(error_msg)
 
         # Require confirmation
         confirmation_details = {
             "subject": subject,
             "to": to,
-            "cc": cc or [],
-            "bcc": bcc or [],
-            "body_preview": body[:100] + "..." if len(body) > 100 else body,
+            "cc": cc,
+            "bcc": bcc,
+            "body_preview": _body_preview(body),
         }
 
-        logger.info(f"Requesting confirmation to send email: {subject}")
-        logger.info(f"Recipients: {to}, CC: {cc}, BCC: {bcc}")
+        logger.info("Requesting confirmation to send email: %s", subject)
+        logger.info("Recipients: %s, CC: %s, BCC: %s", to, cc, bcc)
 
         if not require_confirmation(
             "send_email",
@@ -288,7 +523,8 @@ def send_email(
             }
 
         # Send the email
-        result = mail.send_email(
+        result = await _run_blocking(
+            mail.send_email,
             subject=subject,
             body=body,
             to=to,
@@ -302,11 +538,7 @@ def send_email(
                 {"subject": subject, "to": to, "cc": cc, "bcc": bcc},
                 "failure",
             )
-            return {
-                "success": False,
-                "error": "Apple Mail did not confirm email delivery",
-                "error_type": "send_error",
-            }
+            return _error_response("send_error", "Apple Mail did not confirm email delivery")
 
         operation_logger.log_operation(
             "send_email",
@@ -319,39 +551,43 @@ def send_email(
             "message": "Email sent successfully",
             "details": {
                 "subject": subject,
-                "recipients": len(to) + len(cc or []) + len(bcc or []),
+                "recipients": len(to) + len(cc) + len(bcc),
             },
         }
 
     except MailAppleScriptError as e:
-        logger.error(f"Error sending email: {e}")
+        error = str(e)
+        logger.error("Error sending email: %s", error)
         operation_logger.log_operation(
             "send_email",
             {"subject": subject},
             "failure"
         )
-        return {
-            "success": False,
-            "error": f"Failed to send email: {str(e)}",
-            "error_type": "send_error",
-        }
+        return _error_response("send_error", f"Failed to send email: {error}")
     except Exception as e:
-        logger.error(f"Unexpected error sending email: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
-        }
+        error = str(e)
+        logger.error("Unexpected error sending email: %s", error)
+        return _error_response("unknown", error)
 
 
 @mcp.tool()
-def mark_as_read(message_ids: list[str], read: bool = True) -> dict[str, Any]:
+async def mark_as_read(
+    message_ids: list[str],
+    read: bool = True,
+    account: str | None = None,
+    mailbox: str | None = None,
+    return_fields: list[str] | None = None,
+) -> dict[str, Any]:
     """
     Mark messages as read or unread.
 
     Args:
         message_ids: List of message IDs to update
         read: True to mark as read, False to mark as unread (default: true)
+        account: Account holding the messages (optional, speeds up lookup)
+        mailbox: Mailbox holding the messages (optional, speeds up lookup)
+        return_fields: Keys to keep in a successful response, e.g. ["updated"]
+            (optional, default: all; "success" is always kept)
 
     Returns:
         Dictionary indicating success and number of messages updated
@@ -360,20 +596,16 @@ def mark_as_read(message_ids: list[str], read: bool = True) -> dict[str, Any]:
         >>> mark_as_read(["12345", "12346"], read=True)
         {"success": True, "updated": 2}
     """
-    try:
-        # Validate bulk operation
-        is_valid, error_msg = validate_bulk_operation(len(message_ids), max_items=100)
-        if not is_valid:
-            logger.error(f"Validation failed: {error_msg}")
-            return {
-                "success": False,
-                "error": error_msg,
-                "error_type": "validation_error",
-            }
+    is_valid, error_msg = validate_bulk_operation(len(message_ids), max_items=_MAX_BULK_IDS)
+    if not is_valid:
+        return _validation_error(error_msg)
 
-        logger.info(f"Marking {len(message_ids)} messages as {'read' if read else 'unread'}")
+    try:
+        logger.info("Marking %s messages as %s", len(message_ids), "read" if read else "unread")
 
-        count = mail.mark_as_read(message_ids, read=read)
+        count = await _run_blocking(
+            mail.mark_as_read, message_ids, read=read, account=account, mailbox=mailbox
+        )
 
         operation_logger.log_operation(
             "mark_as_read",
@@ -381,23 +613,20 @@ def mark_as_read(message_ids: list[str], read: bool = True) -> dict[str, Any]:
             "success"
         )
 
-        return {
+        return _project({
             "success": True,
             "updated": count,
             "requested": len(message_ids),
-        }
+        }, return_fields)
 
     except Exception as e:
-        logger.error(f"Error marking messages: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
-        }
+        error = str(e)
+        logger.error("Error marking messages: %s", error)
+        return _error_response("unknown", error)
 
 
 @mcp.tool()
-def send_email_with_attachments(
+async def send_email_with_attachments(
     subject: str,
     body: str,
     to: list[str],
@@ -432,7 +661,8 @@ def send_email_with_attachments(
         ... )
         {"success": True, "message": "Email sent with 1 attachment(s)"}
     """
-    from pathlib import Path
+    cc = cc or []
+    bcc = bcc or []
 
     try:
         # Convert string paths to Path objects
@@ -441,34 +671,31 @@ def send_email_with_attachments(
         # Validate operation
         is_valid, error_msg = validate_send_operation(to, cc, bcc)
         if not is_valid:
-            logger.error(f"Validation failed: {error_msg}")
-            return {
-                "success": False,
-                "error": error_msg,
-                "error_type": "validation_error",
-            }
-
-        # Validate attachments exist
-        missing_files = [str(p) for p in attachment_paths if not p.exists()]
+            return _validation_error(error_msg)
+
+        # Validate attachments exist, checking them in parallel since each
+        # check can wait on a slow (e.g. network) volume
+        exists = await asyncio.gather(*(asyncio.to_thread(p.exists) for p in attachment_paths))
+        missing_files = [
+            str(p) for p, found in zip(attachment_paths, exists, strict=True) if not found
+        ]
         if missing_files:
-            return {
-                "success": False,
-                "error": f"Attachment files not found: {', '.join(missing_files)}",
-                "error_type": "file_not_found",
-            }
+            return _error_response(
+                "file_not_found", f"Attachment files not found: {', '.join(missing_files)}"
+            )
 
         # Require confirmation
         confirmation_details = {
             "subject": subject,
             "to": to,
-            "cc": cc or [],
-            "bcc": bcc or [],
+            "cc": cc,
+            "bcc": bcc,
             "attachments": [p.name for p in attachment_paths],
-            "body_preview": body[:100] + "..." if len(body) > 100 else body,
+            "body_preview": _body_preview(body),
         }
 
-        logger.info(f"Requesting confirmation to send email with attachments: {subject}")
-        logger.info(f"Recipients: {to}, Attachments: {len(attachments)}")
+        logger.info("Requesting confirmation to send email with attachments: %s", subject)
+        logger.info("Recipients: %s, Attachments: %s", to, len(attachments))
 
         if not require_confirmation(
             "send_email_with_attachments",
@@ -490,7 +717,8 @@ def send_email_with_attachments(
             }
 
         # Send the email
-        result = mail.send_email_with_attachments(
+        result = await _run_blocking(
+            mail.send_email_with_attachments,
             subject=subject,
             body=body,
             to=to,
@@ -505,11 +733,7 @@ def send_email_with_attachments(
                 {"subject": subject, "to": to, "attachments": len(attachments)},
                 "failure",
             )
-            return {
-                "success": False,
-                "error": "Apple Mail did not confirm email delivery",
-                "error_type": "send_error",
-            }
+            return _error_response("send_error", "Apple Mail did not confirm email delivery")
 
         operation_logger.log_operation(
             "send_email_with_attachments",
@@ -522,46 +746,37 @@ def send_email_with_attachments(
             "message": f"Email sent with {len(attachments)} attachment(s)",
             "details": {
                 "subject": subject,
-                "recipients": len(to) + len(cc or []) + len(bcc or []),
+                "recipients": len(to) + len(cc) + len(bcc),
                 "attachments": len(attachments),
             },
         }
 
     except (FileNotFoundError, ValueError) as e:
-        logger.error(f"Validation error: {e}")
+        error = str(e)
+        logger.error("Validation error: %s", error)
         operation_logger.log_operation(
             "send_email_with_attachments",
             {"subject": subject},
             "failure"
         )
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "validation_error",
-        }
+        return _error_response("validation_error", error)
     except MailAppleScriptError as e:
-        logger.error(f"Error sending email: {e}")
+        error = str(e)
+        logger.error("Error sending email: %s", error)
         operation_logger.log_operation(
             "send_email_with_attachments",
             {"subject": subject},
             "failure"
         )
-        return {
-            "success": False,
-            "error": f"Failed to send email: {str(e)}",
-            "error_type": "send_error",
-        }
+        return _error_response("send_error", f"Failed to send email: {error}")
     except Exception as e:
-        logger.error(f"Unexpected error sending email with attachments: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
-        }
+        error = str(e)
+        logger.error("Unexpected error sending email with attachments: %s", error)
+        return _error_response("unknown", error)
 
 
 @mcp.tool()
-def get_attachments(message_id: str) -> dict[str, Any]:
+async def get_attachments(message_id: str) -> dict[str, Any]:
     """
     Get list of attachments from a message.
 
@@ -587,9 +802,9 @@ def get_attachments(message_id: str) -> dict[str, Any]:
         }
     """
     try:
-        logger.info(f"Getting attachments for message: {message_id}")
+        logger.info("Getting attachments for message: %s", message_id)
 
-        attachments = mail.get_attachments(message_id)
+        attachments = await _run_blocking(mail.get_attachments, message_id)
 
         operation_logger.log_operation(
             "get_attachments",
@@ -604,23 +819,16 @@ def get_attachments(message_id: str) -> dict[str, Any]:
         }
 
     except MailMessageNotFoundError as e:
-        logger.error(f"Message not found: {e}")
-        return {
-            "success": False,
-            "error": f"Message '{message_id}' not found",
-            "error_type": "message_not_found",
-        }
+        logger.error("Message not found: %s", e)
+        return _error_response("message_not_found", f"Message '{message_id}' not found")
     except Exception as e:
-        logger.error(f"Error getting attachments: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
-        }
+        error = str(e)
+        logger.error("Error getting attachments: %s", error)
+        return _error_response("unknown", error)
 
 
 @mcp.tool()
-def save_attachments(
+async def save_attachments(
     message_id: str,
     save_directory: str,
     attachment_indices: list[int] | None = None,
@@ -643,31 +851,27 @@ def save_attachments(
         >>> save_attachments("12345", "/Users/me/Downloads", [0, 2])
         {"success": True, "saved": 2, "directory": "/Users/me/Downloads"}
     """
-    from pathlib import Path
-
     try:
         save_path = Path(save_directory)
 
-        # Validate directory
-        if not save_path.exists():
-            return {
-                "success": False,
-                "error": f"Directory does not exist: {save_directory}",
-                "error_type": "directory_not_found",
-            }
+        # Validate directory, both checks in one trip off the event loop
+        exists, is_dir = await asyncio.to_thread(
+            lambda: (save_path.exists(), save_path.is_dir())
+        )
+        if not exists:
+            return _error_response(
+                "directory_not_found", f"Directory does not exist: {save_directory}"
+            )
 
-        if not save_path.is_dir():
-            return {
-                "success": False,
-                "error": f"Path is not a directory: {save_directory}",
-                "error_type": "invalid_directory",
-            }
+        if not is_dir:
+            return _error_response(
+                "invalid_directory", f"Path is not a directory: {save_directory}"
+            )
 
-        logger.info(
-            f"Saving attachments from message {message_id} to {save_directory}"
-        )
+        logger.info("Saving attachments from message %s to %s", message_id, save_directory)
 
-        count = mail.save_attachments(
+        count = await _run_blocking(
+            mail.save_attachments,
             message_id=message_id,
             save_directory=save_path,
             attachment_indices=attachment_indices,
@@ -690,34 +894,26 @@ def save_attachments(
         }
 
     except (FileNotFoundError, ValueError) as e:
-        logger.error(f"Validation error: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "validation_error",
-        }
+        error = str(e)
+        logger.error("Validation error: %s", error)
+        return _error_response("validation_error", error)
     except MailMessageNotFoundError as e:
-        logger.error(f"Message not found: {e}")
-        return {
-            "success": False,
-            "error": f"Message '{message_id}' not found",
-            "error_type": "message_not_found",
-        }
+        logger.error("Message not found: %s", e)
+        return _error_response("message_not_found", f"Message '{message_id}' not found")
     except Exception as e:
-        logger.error(f"Error saving attachments: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
-        }
+        error = str(e)
+        logger.error("Error saving attachments: %s", error)
+        return _error_response("unknown", error)
 
 
 @mcp.tool()
-def move_messages(
+async def move_messages(
     message_ids: list[str],
     destination_mailbox: str,
     account: str,
     gmail_mode: bool = False,
+    source_mailbox: str | None = None,
+    return_fields: list[str] | None = None,
 ) -> dict[str, Any]:
     """
     Move messages to a different mailbox/folder.
@@ -727,6 +923,9 @@ def move_messages(
         destination_mailbox: Name of destination mailbox (use "/" for nested: "Projects/Client Work")
         account: Account name containing the messages
         gmail_mode: Use Gmail-specific move handling (copy + delete) for label-based systems
+        source_mailbox: Mailbox currently holding the messages (optional, speeds up lookup)
+        return_fields: Keys to keep in a successful response, e.g. ["count"]
+            (optional, default: all; "success" is always kept)
 
     Returns:
         Dictionary with success status and number of messages moved
@@ -738,60 +937,60 @@ def move_messages(
             account="Gmail"
         )
     """
-    try:
-        if not message_ids:
-            return {
-                "success": True,
-                "count": 0,
-                "message": "No messages to move",
-            }
+    if not message_ids:
+        return _project({
+            "success": True,
+            "count": 0,
+            "message": "No messages to move",
+        }, return_fields)
+    is_valid, error_msg = validate_bulk_operation(len(message_ids), max_items=_MAX_BULK_IDS)
+    if not is_valid:
+        return _validation_error(error_msg)
 
+    try:
         logger.info(
-            f"Moving {len(message_ids)} message(s) to {destination_mailbox} in account {account}"
+            "Moving %s message(s) to %s in account %s",
+            len(message_ids), destination_mailbox, account,
         )
 
         # Move the messages
-        count = mail.move_messages(
+        count = await _run_blocking(
+            mail.move_messages,
             message_ids=message_ids,
             destination_mailbox=destination_mailbox,
             account=account,
             gmail_mode=gmail_mode,
+            source_mailbox=source_mailbox,
         )
 
-        return {
+        return _project({
             "success": True,
             "count": count,
             "destination": destination_mailbox,
             "account": account,
-        }
+        }, return_fields)
 
     except MailMailboxNotFoundError as e:
-        logger.error(f"Mailbox not found: {e}")
-        return {
-            "success": False,
-            "error": f"Mailbox '{destination_mailbox}' not found in account '{account}'",
-            "error_type": "mailbox_not_found",
-        }
+        logger.error("Mailbox not found: %s", e)
+        return _error_response(
+            "mailbox_not_found", f"Mailbox '{destination_mailbox}' not found in account '{account}'"
+        )
     except MailAccountNotFoundError as e:
-        logger.error(f"Account not found: {e}")
-        return {
-            "success": False,
-            "error": f"Account '{account}' not found",
-            "error_type": "account_not_found",
-        }
+        logger.error("Account not found: %s", e)
+        return _error_response("account_not_found", f"Account '{account}' not found")
     except Exception as e:
-        logger.error(f"Error moving messages: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
-        }
+        error = str(e)
+        logger.error("Error moving messages: %s", error)
+        return _error_response("unknown", error)
 
 
 @mcp.tool()
-def flag_message(
+async def flag_message(
     message_ids: list[str],
     flag_color: str,
+    account: str | None = None,
+    mailbox: str | None = None,
+    return_fields: list[str] | None = None,
 ) -> dict[str, Any]:
     """
     Set flag color on messages.
@@ -799,6 +998,10 @@ def flag_message(
     Args:
         message_ids: List of message IDs to flag
         flag_color: Flag color name (none, orange, red, yellow, blue, green, purple, gray)
+        account: Account holding the messages (optional, speeds up lookup)
+        mailbox: Mailbox holding the messages (optional, speeds up lookup)
+        return_fields: Keys to keep in a successful response, e.g. ["count"]
+            (optional, default: all; "success" is always kept)
 
     Returns:
         Dictionary with success status and number of messages flagged
@@ -809,53 +1012,50 @@ def flag_message(
             flag_color="red"
         )
     """
-    try:
-        if not message_ids:
-            return {
-                "success": True,
-                "count": 0,
-                "message": "No messages to flag",
-            }
+    if not message_ids:
+        return _project({
+            "success": True,
+            "count": 0,
+            "message": "No messages to flag",
+        }, return_fields)
+    is_valid, error_msg = validate_bulk_operation(len(message_ids), max_items=_MAX_BULK_IDS)
+    if not is_valid:
+        return _validation_error(error_msg)
 
-        logger.info(f"Flagging {len(message_ids)} message(s) with color {flag_color}")
+    try:
+        logger.info("Flagging %s message(s) with color %s", len(message_ids), flag_color)
 
         # Flag the messages
-        count = mail.flag_message(
+        count = await _run_blocking(
+            mail.flag_message,
             message_ids=message_ids,
             flag_color=flag_color,
+            account=account,
+            mailbox=mailbox,
         )
 
-        return {
+        return _project({
             "success": True,
             "count": count,
             "flag_color": flag_color,
-        }
+        }, return_fields)
 
     except ValueError as e:
-        logger.error(f"Invalid flag color: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "validation_error",
-        }
+        error = str(e)
+        logger.error("Invalid flag color: %s", error)
+        return _error_response("validation_error", error)
     except MailMessageNotFoundError as e:
-        logger.error(f"Message not found: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "message_not_found",
-        }
+        error = str(e)
+        logger.error("Message not found: %s", error)
+        return _error_response("message_not_found", error)
     except Exception as e:
-        logger.error(f"Error flagging messages: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
-        }
+        error = str(e)
+        logger.error("Error flagging messages: %s", error)
+        return _error_response("unknown", error)
 
 
 @mcp.tool()
-def create_mailbox(
+async def create_mailbox(
     account: str,
     name: str,
     parent_mailbox: str | None = None,
@@ -880,16 +1080,13 @@ def create_mailbox(
     """
     try:
         if not name or not name.strip():
-            return {
-                "success": False,
-                "error": "Mailbox name cannot be empty",
-                "error_type": "validation_error",
-            }
+            return _error_response("validation_error", "Mailbox name cannot be empty")
 
-        logger.info(f"Creating mailbox '{name}' in account {account}")
+        logger.info("Creating mailbox '%s' in account %s", name, account)
 
         # Create the mailbox
-        success = mail.create_mailbox(
+        success = await _run_blocking(
+            mail.create_mailbox,
             account=account,
             name=name,
             parent_mailbox=parent_mailbox,
@@ -903,39 +1100,29 @@ def create_mailbox(
         }
 
     except ValueError as e:
-        logger.error(f"Validation error: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "validation_error",
-        }
+        error = str(e)
+        logger.error("Validation error: %s", error)
+        return _error_response("validation_error", error)
     except MailAccountNotFoundError as e:
-        logger.error(f"Account not found: {e}")
-        return {
-            "success": False,
-            "error": f"Account '{account}' not found",
-            "error_type": "account_not_found",
-        }
+        logger.error("Account not found: %s", e)
+        return _error_response("account_not_found", f"Account '{account}' not found")
     except MailAppleScriptError as e:
-        logger.error(f"AppleScript error: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "applescript_error",
-        }
+        error = str(e)
+        logger.error("AppleScript error: %s", error)
+        return _error_response("applescript_error", error)
     except Exception as e:
-        logger.error(f"Error creating mailbox: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
-        }
+        error = str(e)
+        logger.error("Error creating mailbox: %s", error)
+        return _error_response("unknown", error)
 
 
 @mcp.tool()
-def delete_messages(
+async def delete_messages(
     message_ids: list[str],
     permanent: bool = False,
+    account: str | None = None,
+    mailbox: str | None = None,
+    return_fields: list[str] | None = None,
 ) -> dict[str, Any]:
     """
     Delete messages (move to trash or permanently delete).
@@ -943,6 +1130,10 @@ def delete_messages(
     Args:
         message_ids: List of message IDs to delete
         permanent: If True, permanently delete; if False, move to Trash (default: False)
+        account: Account holding the messages (optional, speeds up lookup)
+        mailbox: Mailbox holding the messages (optional, speeds up lookup)
+        return_fields: Keys to keep in a successful response, e.g. ["count"]
+            (optional, default: all; "success" is always kept)
 
     Returns:
         Dictionary with success status and number of messages deleted
@@ -957,66 +1148,57 @@ def delete_messages(
         Bulk deletions are limited to 100 messages for safety.
         Permanent deletion cannot be undone - use with caution.
     """
-    try:
-        if not message_ids:
-            return {
-                "success": True,
-                "count": 0,
-                "message": "No messages to delete",
-            }
-
-        # Validate bulk operation limit
-        if len(message_ids) > 100:
-            return {
-                "success": False,
-                "error": f"Cannot delete {len(message_ids)} messages at once (max: 100)",
-                "error_type": "validation_error",
-            }
+    if not message_ids:
+        return _project({
+            "success": True,
+            "count": 0,
+            "message": "No messages to delete",
+        }, return_fields)
+    is_valid, error_msg = validate_bulk_operation(len(message_ids), max_items=_MAX_BULK_IDS)
+    if not is_valid:
+        return _validation_error(error_msg)
 
+    try:
         delete_type = "permanently" if permanent else "to trash"
-        logger.info(f"Deleting {len(message_ids)} message(s) {delete_type}")
+        logger.info("Deleting %s message(s) %s", len(message_ids), delete_type)
 
         # Delete the messages
-        count = mail.delete_messages(
+        count = await _run_blocking(
+            mail.delete_messages,
             message_ids=message_ids,
             permanent=permanent,
             skip_bulk_check=False,  # Enforce limit
+            account=account,
+            mailbox=mailbox,
         )
 
-        return {
+        return _project({
             "success": True,
             "count": count,
             "permanent": permanent,
-        }
+        }, return_fields)
 
     except ValueError as e:
-        logger.error(f"Validation error: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "validation_error",
-        }
+        error = str(e)
+        logger.error("Validation error: %s", error)
+        return _error_response("validation_error", error)
     except MailMessageNotFoundError as e:
-        logger.error(f"Message not found: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "message_not_found",
-        }
+        error = str(e)
+        logger.error("Message not found: %s", error)
+        return _error_response("message_not_found", error)
     except Exception as e:
-        logger.error(f"Error deleting messages: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
-        }
+        error = str(e)
+        logger.error("Error deleting messages: %s", error)
+        return _error_response("unknown", error)
 
 
 @mcp.tool()
-def reply_to_message(
+async def reply_to_message(
     message_id: str,
     body: str,
     reply_all: bool = False,
+    account: str | None = None,
+    mailbox: str | None = None,
 ) -> dict[str, Any]:
     """
     Reply to a message.
@@ -1025,6 +1207,8 @@ def reply_to_message(
         message_id: ID of the message to reply to
         body: Reply body text
         reply_all: If True, reply to all recipients; if False, reply only to sender (default: False)
+        account: Account holding the message (optional, speeds up lookup)
+        mailbox: Mailbox holding the message (optional, speeds up lookup)
 
     Returns:
         Dictionary with success status and reply message ID
@@ -1037,13 +1221,16 @@ def reply_to_message(
         )
     """
     try:
-        logger.info(f"Creating reply to message {message_id}")
+        logger.info("Creating reply to message %s", message_id)
 
         # Reply to the message
-        reply_id = mail.reply_to_message(
+        reply_id = await _run_blocking(
+            mail.reply_to_message,
             message_id=message_id,
             body=body,
             reply_all=reply_all,
+            account=account,
+            mailbox=mailbox,
         )
 
         return {
@@ -1054,28 +1241,23 @@ def reply_to_message(
         }
 
     except MailMessageNotFoundError as e:
-        logger.error(f"Message not found: {e}")
-        return {
-            "success": False,
-            "error": f"Message '{message_id}' not found",
-            "error_type": "message_not_found",
-        }
+        logger.error("Message not found: %s", e)
+        return _error_response("message_not_found", f"Message '{message_id}' not found")
     except Exception as e:
-        logger.error(f"Error replying to message: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
-        }
+        error = str(e)
+        logger.error("Error replying to message: %s", error)
+        return _error_response("unknown", error)
 
 
 @mcp.tool()
-def forward_message(
+async def forward_message(
     message_id: str,
     to: list[str],
     body: str = "",
     cc: list[str] | None = None,
     bcc: list[str] | None = None,
+    account: str | None = None,
+    mailbox: str | None = None,
 ) -> dict[str, Any]:
     """
     Forward a message to recipients.
@@ -1086,6 +1268,8 @@ def forward_message(
         body: Optional body text to add before forwarded content (default: "")
         cc: Optional CC recipients
         bcc: Optional BCC recipients
+        account: Account holding the message (optional, speeds up lookup)
+        mailbox: Mailbox holding the message (optional, speeds up lookup)
 
     Returns:
         Dictionary with success status and forwarded message ID
@@ -1102,21 +1286,20 @@ def forward_message(
     """
     try:
         if not to:
-            return {
-                "success": False,
-                "error": "At least one recipient required",
-                "error_type": "validation_error",
-            }
+            return _error_response("validation_error", "At least one recipient required")
 
-        logger.info(f"Forwarding message {message_id} to {len(to)} recipient(s)")
+        logger.info("Forwarding message %s to %s recipient(s)", message_id, len(to))
 
         # Forward the message
-        forward_id = mail.forward_message(
+        forward_id = await _run_blocking(
+            mail.forward_message,
             message_id=message_id,
             to=to,
             body=body,
             cc=cc,
             bcc=bcc,
+            account=account,
+            mailbox=mailbox,
         )
 
         return {
@@ -1129,32 +1312,192 @@ def forward_message(
         }
 
     except ValueError as e:
-        logger.error(f"Validation error: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "validation_error",
-        }
+        error = str(e)
+        logger.error("Validation error: %s", error)
+        return _error_response("validation_error", error)
     except MailMessageNotFoundError as e:
-        logger.error(f"Message not found: {e}")
-        return {
-            "success": False,
-            "error": f"Message '{message_id}' not found",
-            "error_type": "message_not_found",
-        }
+        logger.error("Message not found: %s", e)
+        return _error_response("message_not_found", f"Message '{message_id}' not found")
     except Exception as e:
-        logger.error(f"Error forwarding message: {e}")
-        return {
-            "success": False,
-            "error": str(e),
-            "error_type": "unknown",
+        error = str(e)
+        logger.error("Error forwarding message: %s", error)
+        return _error_response("unknown", error)
+
+
+# Tools batch_execute can run. Sending and deleting are left out because
+# they need an explicit confirmation of their own.
+_BATCH_TOOLS: dict[str, Callable[..., Awaitable[dict[str, Any]]]] = {
+    "get_message": get_message.fn,
+    "get_messages": get_messages.fn,
+    "get_attachments": get_attachments.fn,
+    "mark_as_read": mark_as_read.fn,
+    "flag_message": flag_message.fn,
+    "move_messages": move_messages.fn,
+}
+
+# Bulk tools whose consecutive batch operations are merged into one call when
+# all their arguments other than message_ids match
+_MERGEABLE_BATCH_TOOLS = {"mark_as_read", "flag_message", "move_messages"}
+
+# Most operations batch_execute accepts, and most message IDs per merged call
+_MAX_BATCH_OPERATIONS = 50
+_MAX_MERGED_IDS = 100
+
+
+@functools.cache
+def _batch_signature(tool: str) -> tuple[inspect.Signature, dict[str, TypeAdapter[Any]]]:
+    """Return a batch tool's signature and a validator for each parameter."""
+    fn = _BATCH_TOOLS[tool]
+    hints = get_type_hints(fn)
+    signature = inspect.signature(fn)
+    return signature, {name: TypeAdapter(hints[name]) for name in signature.parameters}
+
+
+def _batch_params(operation: Any) -> tuple[str, dict[str, Any]] | str:
+    """
+    Validate a batch operation the way FastMCP validates a direct tool call.
+
+    Returns:
+        (tool, params) with params coerced to the tool's parameter types, or
+        an error message if the operation is malformed
+    """
+    if not isinstance(operation, dict):
+        return "Unsupported operation"
+    tool = operation.get("tool")
+    params = operation.get("params", {})
+    if tool not in _BATCH_TOOLS or not isinstance(params, dict):
+        return "Unsupported operation"
+
+    signature, validators = _batch_signature(tool)
+    try:
+        bound = signature.bind(**params)
+    except TypeError as e:
+        return f"Invalid parameters for {tool}: {e}"
+    try:
+        validated = {
+            name: validators[name].validate_python(value)
+            for name, value in bound.arguments.items()
         }
+    except ValidationError as e:
+        return f"Invalid parameters for {tool}: {e}"
+    return tool, validated
+
+
+def _merge_key(params: dict[str, Any]) -> tuple[tuple[str, Any], ...] | None:
+    """Return what must match for two operations to merge, or None if unmergeable."""
+    if not isinstance(params.get("message_ids"), list):
+        return None
+    try:
+        return tuple(sorted((k, v) for k, v in params.items() if k != "message_ids"))
+    except TypeError:
+        return None
+
+
+@mcp.tool()
+async def batch_execute(
+    operations: list[dict[str, Any]],
+    stop_on_error: bool = False,
+) -> dict[str, Any]:
+    """
+    Run several message operations in one call.
+
+    Each operation names a tool and its arguments, for example
+    {"tool": "flag_message", "params": {"message_ids": ["12345"], "flag_color": "red"}}.
+    Supported tools: get_message, get_messages, get_attachments, mark_as_read,
+    flag_message and move_messages. Consecutive mark_as_read, flag_message or
+    move_messages operations with otherwise identical arguments run as a
+    single call on all their message IDs.
+
+    Args:
+        operations: Operations to run, in order (max 50)
+        stop_on_error: Skip the remaining operations once one fails (default: false)
+
+    Returns:
+        Dictionary with one result per operation, in order, and success counts
+
+    Example:
+        >>> batch_execute([
+        ...     {"tool": "mark_as_read", "params": {"message_ids": ["12345"]}},
+        ...     {"tool": "move_messages", "params": {
+        ...         "message_ids": ["12345"], "destination_mailbox": "Archive",
+        ...         "account": "Gmail"}},
+        ... ])
+        {"success": True, "results": [...], "succeeded": 2, "failed": 0}
+    """
+    is_valid, error_msg = validate_bulk_operation(
+        len(operations), max_items=_MAX_BATCH_OPERATIONS
+    )
+    if not is_valid:
+        return _validation_error(error_msg)
+
+    logger.info("Running batch of %s operations", len(operations))
+
+    results: list[dict[str, Any]] = []
+    index = 0
+    while index < len(operations):
+        parsed = _batch_params(operations[index])
+        if isinstance(parsed, str):
+            results.append(_error_response("validation_error", f"{parsed} at index {index}"))
+            index += 1
+        else:
+            tool, params = parsed
+            group = [index]
+            key = _merge_key(params) if tool in _MERGEABLE_BATCH_TOOLS else None
+            if key is not None:
+                params = {**params, "message_ids": list(params["message_ids"])}
+                while group[-1] + 1 < len(operations):
+                    following = _batch_params(operations[group[-1] + 1])
+                    if isinstance(following, str) or following[0] != tool:
+                        break
+                    if _merge_key(following[1]) != key:
+                        break
+                    following_ids = following[1]["message_ids"]
+                    if len(params["message_ids"]) + len(following_ids) > _MAX_MERGED_IDS:
+                        break
+                    params["message_ids"] += following_ids
+                    group.append(group[-1] + 1)
+
+            result = await _BATCH_TOOLS[tool](**params)
+            for position in group:
+                if len(group) > 1:
+                    results.append(
+                        {**result, "merged_with": [i for i in group if i != position]}
+                    )
+                else:
+                    results.append(result)
+            index = group[-1] + 1
+
+        if stop_on_error and not results[-1]["success"]:
+            results.extend(
+                _error_response("skipped", "Skipped after an earlier operation failed")
+                for _ in range(index, len(operations))
+            )
+            break
+
+    succeeded = sum(1 for result in results if result["success"])
+
+    operation_logger.log_operation(
+        "batch_execute",
+        {"count": len(operations), "succeeded": succeeded},
+        "success" if succeeded == len(operations) else "failure",
+    )
+
+    return {
+        "success": succeeded == len(operations),
+        "results": results,
+        "succeeded": succeeded,
+        "failed": len(operations) - succeeded,
+    }
 
 
 def main() -> None:
     """Run the MCP server."""
     logger.info("Starting Apple Mail MCP server")
-    mcp.run()
+    try:
+        mcp.run()
+    finally:
+        operation_logger.flush()
+        mail.close()
 
 
 if __name__ == "__main__":
@@ -2,9 +2,37 @@
 Utility functions for Apple Mail MCP.
 """
 
+import functools
 import re
+from collections.abc import Iterable, Iterator
+from itertools import filterfalse
 from typing import Any
 
+# Backslash and double quote escapes, applied in one pass by str.translate
+_APPLESCRIPT_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+_RELATIVE_DATE_RE = re.compile(r"(\d+)\s+(day|week|month|year)s?\s+ago")
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+# Filename characters replaced by sanitize_filename
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^a-zA-Z0-9._-]")
+# Trailing "/" and "/." components, which name the directory before them
+_TRAILING_DIR_RE = re.compile(r"(/\.?)+$")
+# Null bytes, path separators and dangerous characters dropped from mailbox names
+_MAILBOX_DROP = dict.fromkeys(map(ord, '\x00/\\<>:"|?*'))
+
+# AppleScript flag index per flag color name; "none" clears the flag
+FLAG_INDEXES = {
+    "none": -1,
+    "orange": 0,
+    "red": 1,
+    "yellow": 2,
+    "blue": 3,
+    "green": 4,
+    "purple": 5,
+    "gray": 6,
+}
+
 
 def escape_applescript_string(s: str) -> str:
     """
@@ -22,7 +50,7 @@ def escape_applescript_string(s: str) -> str:
         >>> escape_applescript_string('Path\\to\\file')
         'Path\\\\to\\\\file'
     """
-    return s.replace("\\", "\\\\").replace('"', '\\"')
+    return s.translate(_APPLESCRIPT_ESCAPES)
 
 
 def parse_applescript_list(result: str) -> list[str]:
@@ -37,21 +65,19 @@ def parse_applescript_list(result: str) -> list[str]:
     Returns:
         List of strings
     """
-    if not result or result == "":
-        return []
-
-    # Handle empty list
-    if result.strip() in ["{}", ""]:
-        return []
+    result = result.strip()
 
     # Remove braces if present
-    result = result.strip()
     if result.startswith("{") and result.endswith("}"):
         result = result[1:-1]
 
-    # Split by comma and clean up
-    items = [item.strip() for item in result.split(",") if item.strip()]
-    return items
+    # Empty and single-item lists need no split
+    if "," not in result:
+        result = result.strip()
+        return [result] if result else []
+
+    # Split by comma and clean up, stripping each item once
+    return [item for item in map(str.strip, result.split(",")) if item]
 
 
 def format_applescript_list(items: list[str]) -> str:
@@ -68,8 +94,11 @@ def format_applescript_list(items: list[str]) -> str:
         >>> format_applescript_list(['a', 'b', 'c'])
         '{"a", "b", "c"}'
     """
-    escaped_items = [f'"{escape_applescript_string(item)}"' for item in items]
-    return "{" + ", ".join(escaped_items) + "}"
+    if not items:
+        return "{}"
+    # Items are escaped one by one: escaping the joined string would also
+    # escape the quotes of the '", "' separators
+    return '{"' + '", "'.join(map(escape_applescript_string, items)) + '"}'
 
 
 def parse_date_filter(date_str: str) -> str:
@@ -82,9 +111,10 @@ def parse_date_filter(date_str: str) -> str:
     Returns:
         AppleScript date expression
     """
+    lowered = date_str.lower()
+
     # Handle relative dates
-    pattern = r"(\d+)\s+(day|week|month|year)s?\s+ago"
-    match = re.match(pattern, date_str.lower())
+    match = _RELATIVE_DATE_RE.match(lowered)
 
     if match:
         amount = int(match.group(1))
@@ -92,30 +122,61 @@ def parse_date_filter(date_str: str) -> str:
         return f"(current date) - ({amount} * {unit}s)"
 
     # Handle "last X"
-    if date_str.lower().startswith("last "):
+    if lowered.startswith("last "):
         unit = date_str[5:].strip().rstrip("s") + "s"
         return f"(current date) - (1 * {unit})"
 
     # Handle ISO dates (YYYY-MM-DD)
-    if re.match(r"\d{4}-\d{2}-\d{2}", date_str):
+    if _ISO_DATE_RE.match(date_str):
         return f'date "{date_str}"'
 
     # Default: return as is
     return f'date "{date_str}"'
 
 
+@functools.lru_cache(maxsize=4096)
 def validate_email(email: str) -> bool:
     """
     Validate email address format.
 
+    Results are memoized, since the same recipients recur across sends.
+
     Args:
         email: Email address to validate
 
     Returns:
         True if valid, False otherwise
     """
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    return bool(re.match(pattern, email))
+    return _EMAIL_RE.fullmatch(email) is not None
+
+
+def find_invalid_email(emails: Iterable[str]) -> str | None:
+    """
+    Return the first address that fails validate_email, if any.
+
+    Args:
+        emails: Email addresses to check
+
+    Returns:
+        The first invalid address, or None if all are valid
+    """
+    return next(iter_invalid_emails(emails), None)
+
+
+def iter_invalid_emails(emails: Iterable[str]) -> Iterator[str]:
+    """
+    Yield the addresses that fail validate_email, lazily and in order.
+
+    The loop runs in C (filterfalse over the memoized validate_email), so
+    repeated addresses cost one cache lookup each.
+
+    Args:
+        emails: Email addresses to check
+
+    Returns:
+        Iterator over the invalid addresses
+    """
+    return filterfalse(validate_email, emails)
 
 
 def sanitize_input(value: Any) -> str:
@@ -131,18 +192,13 @@ def sanitize_input(value: Any) -> str:
     if value is None:
         return ""
 
-    # Convert to string
-    s = str(value)
-
-    # Remove null bytes
-    s = s.replace("\x00", "")
-
-    # Limit length
+    # Convert to string and limit length first, so oversized input is only
+    # scanned up to the limit (slicing a short string returns it unchanged)
     max_length = 10000
-    if len(s) > max_length:
-        s = s[:max_length]
+    s = str(value)[:max_length]
 
-    return s
+    # Remove null bytes (returns s itself when there are none)
+    return s.replace("\x00", "")
 
 
 def sanitize_filename(filename: str) -> str:
@@ -163,18 +219,17 @@ def sanitize_filename(filename: str) -> str:
         >>> sanitize_filename("my-file_v2.txt")
         'my-file_v2.txt'
     """
-    import re
-    from pathlib import Path
-
     # Remove null bytes
     filename = filename.replace("\x00", "")
 
-    # Get basename only (no path components)
-    filename = Path(filename).name
+    # Get basename only (no path components), as Path.name would: "report/"
+    # and "report/." name "report". Backslashes are not separators on macOS
+    # and are replaced below
+    filename = _TRAILING_DIR_RE.sub("", filename).rpartition("/")[2]
 
     # Replace dangerous characters with underscore
     # Keep: letters, numbers, dash, underscore, period
-    filename = re.sub(r'[^a-zA-Z0-9._-]', '_', filename)
+    filename = _UNSAFE_FILENAME_CHARS_RE.sub('_', filename)
 
     # Remove leading dots (hidden files)
     filename = filename.lstrip('.')
@@ -213,23 +268,9 @@ def sanitize_mailbox_name(name: str) -> str:
         >>> sanitize_mailbox_name("../../../etc")
         ''
     """
-    import re
-
-    # Remove null bytes
-    name = name.replace("\x00", "")
-
-    # Remove path traversal attempts
-    name = name.replace("..", "")
-    name = name.replace("/", "")
-    name = name.replace("\\", "")
-
-    # Remove dangerous characters but keep spaces, dashes, underscores
-    name = re.sub(r'[<>:"|?*]', '', name)
-
-    # Trim whitespace
-    name = name.strip()
-
-    return name
+    # Drop null bytes, separators and dangerous characters in one pass, then
+    # path traversal attempts (so separators cannot hide a "..")
+    return name.translate(_MAILBOX_DROP).replace("..", "").strip()
 
 
 def validate_flag_color(color: str) -> bool:
@@ -248,8 +289,7 @@ def validate_flag_color(color: str) -> bool:
         >>> validate_flag_color("invalid")
         False
     """
-    valid_colors = {"none", "orange", "red", "yellow", "blue", "green", "purple", "gray"}
-    return color.lower() in valid_colors
+    return color.lower() in FLAG_INDEXES
 
 
 def get_flag_index(color: str) -> int:
@@ -271,22 +311,11 @@ def get_flag_index(color: str) -> int:
         >>> get_flag_index("none")
         -1
     """
-    color_map = {
-        "none": -1,
-        "orange": 0,
-        "red": 1,
-        "yellow": 2,
-        "blue": 3,
-        "green": 4,
-        "purple": 5,
-        "gray": 6,
-    }
-
     color_lower = color.lower()
-    if color_lower not in color_map:
+    if color_lower not in FLAG_INDEXES:
         raise ValueError(
             f"Invalid flag color: {color}. "
-            f"Valid colors: {', '.join(color_map.keys())}"
+            f"Valid colors: {', '.join(FLAG_INDEXES)}"
         )
 
-    return color_map[color_lower]
+    return FLAG_INDEXES[color_lower]
@@ -9,16 +9,21 @@ These tests require:
 Run with: pytest tests/integration/ -v
 """
 
+import sys
+
 import pytest
 
 from apple_mail_mcp.mail_connector import AppleMailConnector
 
 # Skip all integration tests by default
 # Run with: pytest --run-integration
-pytestmark = pytest.mark.skipif(
-    "not config.getoption('--run-integration')",
-    reason="Integration tests disabled by default. Use --run-integration to run."
-)
+pytestmark = [
+    pytest.mark.skipif(
+        "not config.getoption('--run-integration')",
+        reason="Integration tests disabled by default. Use --run-integration to run."
+    ),
+    pytest.mark.skipif(sys.platform != "darwin", reason="Apple Mail is macOS-only"),
+]
 
 
 @pytest.fixture
@@ -0,0 +1,11 @@
+"""Shared fixtures for unit tests."""
+
+import pytest
+
+from apple_mail_mcp.mail_connector import AppleMailConnector
+
+
+@pytest.fixture
+def connector() -> AppleMailConnector:
+    """Create a connector instance."""
+    return AppleMailConnector(timeout=30)
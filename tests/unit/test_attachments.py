@@ -15,11 +15,6 @@ from apple_mail_mcp.mail_connector import AppleMailConnector
 class TestSendWithAttachments:
     """Tests for sending emails with attachments."""
 
-    @pytest.fixture
-    def connector(self) -> AppleMailConnector:
-        """Create a connector instance."""
-        return AppleMailConnector(timeout=30)
-
     @pytest.fixture
     def test_file(self, tmp_path: Path) -> Path:
         """Create a test file."""
@@ -42,9 +37,8 @@ class TestSendWithAttachments:
         )
 
         assert result is True
-        call_args = mock_run.call_args[0][0]
-        assert str(test_file) in call_args
-        assert "make new attachment" in call_args
+        assert "make new attachment" in mock_run.call_args[0][0]
+        assert mock_run.call_args[1]["args"][5] == str(test_file)
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_send_with_multiple_attachments(
@@ -67,9 +61,8 @@ class TestSendWithAttachments:
         )
 
         assert result is True
-        call_args = mock_run.call_args[0][0]
-        assert str(file1) in call_args
-        assert str(file2) in call_args
+        attachment_paths = mock_run.call_args[1]["args"][5].split("\n")
+        assert attachment_paths == [str(file1), str(file2)]
 
     def test_send_with_nonexistent_file(self, connector: AppleMailConnector) -> None:
         """Test error when attachment file doesn't exist."""
@@ -107,17 +100,15 @@ class TestSendWithAttachments:
 class TestGetAttachments:
     """Tests for getting attachment information."""
 
-    @pytest.fixture
-    def connector(self) -> AppleMailConnector:
-        """Create a connector instance."""
-        return AppleMailConnector(timeout=30)
-
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_get_attachments_list(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test listing attachments from a message."""
-        mock_run.return_value = "document.pdf|application/pdf|524288|true\nimage.jpg|image/jpeg|102400|true"
+        mock_run.return_value = (
+            b"document.pdf\x1fapplication/pdf\x1f524288\x1ftrue\x1e"
+            b"image.jpg\x1fimage/jpeg\x1f102400\x1ftrue"
+        )
 
         result = connector.get_attachments("12345")
 
@@ -132,7 +123,7 @@ class TestGetAttachments:
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test getting attachments from message with none."""
-        mock_run.return_value = ""
+        mock_run.return_value = b""
 
         result = connector.get_attachments("12345")
 
@@ -152,11 +143,6 @@ class TestGetAttachments:
 class TestSaveAttachments:
     """Tests for saving attachments."""
 
-    @pytest.fixture
-    def connector(self) -> AppleMailConnector:
-        """Create a connector instance."""
-        return AppleMailConnector(timeout=30)
-
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_save_single_attachment(
         self, mock_run: MagicMock, connector: AppleMailConnector, tmp_path: Path
@@ -171,8 +157,36 @@ class TestSaveAttachments:
         )
 
         assert result == 1
-        call_args = mock_run.call_args[0][0]
-        assert str(tmp_path) in call_args
+        assert mock_run.call_args[1]["args"][3:] == [str(tmp_path.resolve()), "1"]
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_save_selected_attachments(
+        self, mock_run: MagicMock, connector: AppleMailConnector, tmp_path: Path
+    ) -> None:
+        """Test indices are passed as 1-based argv, keeping the script constant."""
+        mock_run.return_value = "2"
+
+        connector.save_attachments(
+            message_id="12345", save_directory=tmp_path, attachment_indices=[0, 2]
+        )
+        script = mock_run.call_args[0][0]
+        connector.save_attachments(message_id="12345", save_directory=tmp_path)
+
+        assert mock_run.call_args_list[0][1]["args"][4] == "1,3"
+        assert mock_run.call_args[1]["args"][4] == ""
+        assert mock_run.call_args[0][0] == script
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_save_no_attachment_indices(
+        self, mock_run: MagicMock, connector: AppleMailConnector, tmp_path: Path
+    ) -> None:
+        """Test an empty index list saves nothing without running a script."""
+        result = connector.save_attachments(
+            message_id="12345", save_directory=tmp_path, attachment_indices=[]
+        )
+
+        assert result == 0
+        mock_run.assert_not_called()
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_save_all_attachments(
@@ -228,6 +242,11 @@ class TestAttachmentSecurity:
         assert validate_attachment_type("image.jpg") is True
         assert validate_attachment_type("data.csv") is True
 
+        # Only the last extension counts, case-insensitively
+        assert validate_attachment_type("INSTALL.TAR.SH") is False
+        assert validate_attachment_type(".bash") is False
+        assert validate_attachment_type("report.exe.txt") is True
+
     def test_validates_file_size(self) -> None:
         """Test file size validation."""
         from apple_mail_mcp.security import validate_attachment_size
@@ -248,6 +267,10 @@ class TestAttachmentSecurity:
         assert sanitize_filename("file:name.txt") == "file_name.txt"
         assert sanitize_filename("file\x00name.txt") == "filename.txt"
 
+        # Trailing separators name the directory before them
+        assert sanitize_filename("report/") == "report"
+        assert sanitize_filename("a/.") == "a"
+
         # Preserve safe names
         assert sanitize_filename("document.pdf") == "document.pdf"
         assert sanitize_filename("my-file_v2.txt") == "my-file_v2.txt"
@@ -0,0 +1,187 @@
+"""Tests for the Envelope Index reader."""
+
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from apple_mail_mcp.envelope_index import EnvelopeIndex
+from apple_mail_mcp.exceptions import MailIndexUnavailableError
+
+ACCOUNT_ID = "1A2B3C4D-0000-1111-2222-333344445555"
+
+
+def make_index(mail_dir: Path, with_comment: bool = True) -> Path:
+    """Create a minimal Envelope Index under mail_dir/V10."""
+    data_dir = mail_dir / "V10" / "MailData"
+    data_dir.mkdir(parents=True)
+    database = data_dir / "Envelope Index"
+    comment_column = ", comment TEXT" if with_comment else ""
+    conn = sqlite3.connect(database)
+    conn.executescript(
+        f"""
+        CREATE TABLE mailboxes (ROWID INTEGER PRIMARY KEY, url TEXT);
+        CREATE TABLE subjects (ROWID INTEGER PRIMARY KEY, subject TEXT);
+        CREATE TABLE addresses (ROWID INTEGER PRIMARY KEY, address TEXT{comment_column});
+        CREATE TABLE messages (
+            ROWID INTEGER PRIMARY KEY, subject INTEGER, sender INTEGER,
+            date_received INTEGER, read INTEGER, mailbox INTEGER, deleted INTEGER
+        );
+        INSERT INTO mailboxes VALUES (1, 'imap://{ACCOUNT_ID}/INBOX');
+        INSERT INTO mailboxes VALUES (2, 'imap://{ACCOUNT_ID}/Projects/Client%20Work');
+        INSERT INTO mailboxes VALUES (3, 'imap://OTHER-ACCOUNT/INBOX');
+        """
+    )
+    if with_comment:
+        conn.executescript(
+            """
+            INSERT INTO subjects VALUES (1, 'Quarterly report'), (2, 'Lunch?'), (3, '100% done');
+            INSERT INTO addresses VALUES (1, 'boss@example.com', 'The Boss'),
+                                         (2, 'friend@example.com', NULL);
+            INSERT INTO messages VALUES (101, 1, 1, 1700000000, 1, 1, 0);
+            INSERT INTO messages VALUES (102, 2, 2, 1700000100, 0, 1, 0);
+            INSERT INTO messages VALUES (103, 1, 2, 1700000200, 0, 1, 1);
+            INSERT INTO messages VALUES (104, 1, 1, 1700000300, 0, 3, 0);
+            INSERT INTO messages VALUES (105, 3, 2, 1700000400, 1, 2, 0);
+            """
+        )
+    conn.commit()
+    conn.close()
+    return database
+
+
+class TestEnvelopeIndex:
+    """Tests for EnvelopeIndex.search."""
+
+    @pytest.fixture
+    def index(self, tmp_path: Path) -> Iterator[EnvelopeIndex]:
+        """Create a reader over a fake Mail directory."""
+        make_index(tmp_path)
+        index = EnvelopeIndex(mail_dir=tmp_path)
+        yield index
+        index.close()
+
+    def test_search_subject(self, index: EnvelopeIndex) -> None:
+        """Test subject matches are returned newest first, skipping deleted rows."""
+        results = index.search(ACCOUNT_ID, "INBOX", "report")
+
+        assert [m["id"] for m in results] == ["101"]
+        assert results[0]["subject"] == "Quarterly report"
+        assert results[0]["sender"] == "The Boss <boss@example.com>"
+        assert results[0]["read_status"] is True
+
+    def test_search_sender(self, index: EnvelopeIndex) -> None:
+        """Test sender address matches, case-insensitively."""
+        results = index.search(ACCOUNT_ID, "INBOX", "FRIEND@")
+
+        assert [m["id"] for m in results] == ["102"]
+        assert results[0]["sender"] == "friend@example.com"
+
+    def test_search_limit_and_order(self, index: EnvelopeIndex) -> None:
+        """Test results are ordered by date received, newest first."""
+        results = index.search(ACCOUNT_ID, "INBOX", "example.com", limit=1)
+
+        assert [m["id"] for m in results] == ["102"]
+
+    def test_search_nested_mailbox_and_wildcards(self, index: EnvelopeIndex) -> None:
+        """Test percent-encoded mailbox paths and literal LIKE wildcards."""
+        assert [m["id"] for m in index.search(ACCOUNT_ID, "Projects/Client Work", "100%")] == [
+            "105"
+        ]
+        assert index.search(ACCOUNT_ID, "INBOX", "%") == []
+
+    def test_find_combines_filters(self, index: EnvelopeIndex) -> None:
+        """Test find applies every filter, matching the displayed sender."""
+        assert [m["id"] for m in index.find(ACCOUNT_ID, "INBOX")] == ["102", "101"]
+        assert [m["id"] for m in index.find(ACCOUNT_ID, "INBOX", read_status=False)] == ["102"]
+        assert [
+            m["id"] for m in index.find(ACCOUNT_ID, "INBOX", sender_contains="boss <boss@")
+        ] == ["101"]
+        assert index.find(
+            ACCOUNT_ID, "INBOX", subject_contains="report", read_status=False
+        ) == []
+        assert [m["id"] for m in index.find(ACCOUNT_ID, "INBOX", limit=1)] == ["102"]
+
+    def test_invalidate_forces_copy(self, tmp_path: Path) -> None:
+        """Test invalidate makes the next search copy the database again."""
+        database = make_index(tmp_path)
+        index = EnvelopeIndex(mail_dir=tmp_path, ttl=3600)
+
+        assert index.find(ACCOUNT_ID, "INBOX")
+        index.invalidate()
+        database.unlink()
+        with pytest.raises(MailIndexUnavailableError):
+            index.find(ACCOUNT_ID, "INBOX")
+        index.close()
+
+    def test_refresh_swaps_in_new_copy(self, tmp_path: Path) -> None:
+        """Test an expired copy is replaced by one holding the latest rows."""
+        database = make_index(tmp_path)
+        index = EnvelopeIndex(mail_dir=tmp_path, ttl=0)
+
+        assert [m["id"] for m in index.find(ACCOUNT_ID, "INBOX")] == ["102", "101"]
+        with sqlite3.connect(database) as conn:
+            conn.execute("INSERT INTO messages VALUES (106, 2, 2, 1700000500, 0, 1, 0)")
+        assert [m["id"] for m in index.find(ACCOUNT_ID, "INBOX")] == ["106", "102", "101"]
+        index.close()
+
+    def test_stale_copy_used_during_refresh(self, tmp_path: Path) -> None:
+        """Test searches read the previous copy instead of waiting for a refresh."""
+        database = make_index(tmp_path)
+        index = EnvelopeIndex(mail_dir=tmp_path, ttl=0)
+
+        assert index.find(ACCOUNT_ID, "INBOX")
+        database.unlink()
+        with index._refresh_lock:
+            assert [m["id"] for m in index.find(ACCOUNT_ID, "INBOX")] == ["102", "101"]
+        index.close()
+
+    def test_unknown_mailbox(self, index: EnvelopeIndex) -> None:
+        """Test a mailbox missing from the index raises so callers can fall back."""
+        with pytest.raises(MailIndexUnavailableError, match="not found"):
+            index.search(ACCOUNT_ID, "Archive", "report")
+
+    def test_missing_database(self, tmp_path: Path) -> None:
+        """Test a missing database raises MailIndexUnavailableError."""
+        index = EnvelopeIndex(mail_dir=tmp_path)
+        with pytest.raises(MailIndexUnavailableError):
+            index.search(ACCOUNT_ID, "INBOX", "report")
+        index.close()
+
+    def test_unsupported_schema_is_remembered(self, tmp_path: Path) -> None:
+        """Test a schema without a needed column fails without re-copying."""
+        database = make_index(tmp_path, with_comment=False)
+        index = EnvelopeIndex(mail_dir=tmp_path)
+
+        with pytest.raises(MailIndexUnavailableError, match="addresses lacks comment"):
+            index.search(ACCOUNT_ID, "INBOX", "report")
+        database.unlink()
+        with pytest.raises(MailIndexUnavailableError, match="addresses lacks comment"):
+            index.search(ACCOUNT_ID, "INBOX", "report")
+        index.close()
+
+    def test_copy_reused_within_ttl(self, tmp_path: Path) -> None:
+        """Test the database is copied once per TTL window."""
+        database = make_index(tmp_path)
+        index = EnvelopeIndex(mail_dir=tmp_path, ttl=3600)
+
+        assert index.search(ACCOUNT_ID, "INBOX", "report")
+        database.unlink()
+        # Served from the existing copy
+        assert index.search(ACCOUNT_ID, "INBOX", "report")
+        index.close()
+
+    def test_copy_includes_write_ahead_log(self, tmp_path: Path) -> None:
+        """Test changes still in Mail's write-ahead log are part of the copy."""
+        database = make_index(tmp_path)
+        writer = sqlite3.connect(database)
+        writer.execute("PRAGMA journal_mode=WAL")
+        writer.execute("PRAGMA wal_autocheckpoint=0")
+        writer.execute("INSERT INTO messages VALUES (106, 1, 1, 1700000500, 0, 1, 0)")
+        writer.commit()
+        index = EnvelopeIndex(mail_dir=tmp_path)
+
+        assert [m["id"] for m in index.search(ACCOUNT_ID, "INBOX", "report")] == ["106", "101"]
+        index.close()
+        writer.close()
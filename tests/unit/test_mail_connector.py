@@ -1,5 +1,12 @@
 """Unit tests for mail connector."""
 
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -7,30 +14,34 @@ import pytest
 from apple_mail_mcp.exceptions import (
     MailAccountNotFoundError,
     MailAppleScriptError,
+    MailIndexUnavailableError,
     MailMailboxNotFoundError,
     MailMessageNotFoundError,
 )
-from apple_mail_mcp.mail_connector import AppleMailConnector
+from apple_mail_mcp.mail_connector import AppleMailConnector, _AppleScriptWorker
+
+# Sample separator-delimited result from _search_messages_direct
+DIRECT_RESULT = (
+    b"101\x1fMeeting Notes\x1falice@exchange.com\x1fMon Jan 1 2024\x1ftrue\x1e"
+    b"102\x1fProject Update\x1fbob@exchange.com\x1fTue Jan 2 2024\x1ffalse\x1e"
+    b"103\x1fLunch Plans\x1fcarol@exchange.com\x1fWed Jan 3 2024\x1ftrue"
+)
+
+# A single-message direct-fetch result, and the error Exchange accounts give
+# for whose clauses
+EXCHANGE_MESSAGE = b"101\x1fSubject\x1fsender@exchange.com\x1fMon Jan 1 2024\x1ffalse"
+WHOSE_ERROR = "Illegal comparison or logical (-1726)"
 
 
 class TestAppleMailConnector:
     """Tests for AppleMailConnector."""
 
-    @pytest.fixture
-    def connector(self) -> AppleMailConnector:
-        """Create a connector instance."""
-        return AppleMailConnector(timeout=30)
-
     @patch("subprocess.run")
     def test_run_applescript_success(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test successful AppleScript execution."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="result",
-            stderr=""
-        )
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=b"result", stderr=b"")
 
         result = connector._run_applescript("test script")
         assert result == "result"
@@ -39,18 +50,29 @@ class TestAppleMailConnector:
         args = mock_run.call_args
         assert args[0][0] == ["/usr/bin/osascript", "-"]
 
+    @patch("subprocess.run")
+    def test_run_applescript_passes_args(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test script arguments are passed on the command line, not in the source."""
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=b"sent", stderr=b"")
+
+        connector._run_applescript("on run argv\nend run", args=['a "quoted" value', ""])
+
+        args = mock_run.call_args
+        assert args[0][0] == ["/usr/bin/osascript", "-", 'a "quoted" value', ""]
+        assert args[1]["input"] == b"on run argv\nend run"
+
     @patch("subprocess.run")
     def test_run_applescript_account_not_found(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test account not found error."""
-        mock_run.return_value = MagicMock(
-            returncode=1,
-            stdout="",
-            stderr="Can't get account \"NonExistent\""
+        mock_run.return_value = subprocess.CompletedProcess(
+            [], 1, stdout=b"", stderr=b"Can't get account \"NonExistent\""
         )
 
-        with pytest.raises(MailAccountNotFoundError):
+        with pytest.raises(MailAccountNotFoundError, match="Can't get account"):
             connector._run_applescript("test script")
 
     @patch("subprocess.run")
@@ -58,13 +80,11 @@ class TestAppleMailConnector:
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test mailbox not found error."""
-        mock_run.return_value = MagicMock(
-            returncode=1,
-            stdout="",
-            stderr="Can't get mailbox \"NonExistent\""
+        mock_run.return_value = subprocess.CompletedProcess(
+            [], 1, stdout=b"", stderr=b"Can't get mailbox \"NonExistent\""
         )
 
-        with pytest.raises(MailMailboxNotFoundError):
+        with pytest.raises(MailMailboxNotFoundError, match="Can't get mailbox"):
             connector._run_applescript("test script")
 
     @patch("subprocess.run")
@@ -72,28 +92,268 @@ class TestAppleMailConnector:
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test timeout handling."""
-        import subprocess
         mock_run.side_effect = subprocess.TimeoutExpired("cmd", 30)
 
         with pytest.raises(MailAppleScriptError, match="timeout"):
             connector._run_applescript("test script")
 
+    @patch("subprocess.run")
+    def test_repeated_script_runs_compiled(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test a script seen twice is compiled once and then run from the .scpt."""
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=b"ok", stderr=b"")
+
+        for value in ("a", "b", "c"):
+            connector._run_applescript("on run argv\nend run", args=[value])
+
+        commands = [c[0][0] for c in mock_run.call_args_list]
+        assert commands[0] == ["/usr/bin/osascript", "-", "a"]
+        assert commands[1][0] == "/usr/bin/osacompile"
+        compiled = commands[1][2]
+        assert commands[2] == ["/usr/bin/osascript", compiled, "b"]
+        assert commands[3] == ["/usr/bin/osascript", compiled, "c"]
+        assert len(commands) == 4
+
+        connector.close()
+        assert connector._compile_dir is None
+
+    @patch("subprocess.run")
+    def test_compile_failure_falls_back_to_stdin(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test scripts keep running via stdin when osacompile is unavailable."""
+        def run(cmd: list[str], **kwargs: object) -> subprocess.CompletedProcess[bytes]:
+            if cmd[0] == "/usr/bin/osacompile":
+                raise FileNotFoundError(cmd[0])
+            return subprocess.CompletedProcess([], 0, stdout=b"ok", stderr=b"")
+
+        mock_run.side_effect = run
+
+        for _ in range(3):
+            assert connector._run_applescript("test script") == "ok"
+
+        commands = [c[0][0] for c in mock_run.call_args_list]
+        assert commands.count(["/usr/bin/osascript", "-"]) == 3
+        assert sum(cmd[0] == "/usr/bin/osacompile" for cmd in commands) == 1
+        connector.close()
+
+    @patch("subprocess.run")
+    def test_slow_compile_does_not_block_other_scripts(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test scripts keep running while another script is being compiled."""
+        compiling = threading.Event()
+        release = threading.Event()
+
+        def run(cmd: list[str], **kwargs: object) -> subprocess.CompletedProcess[bytes]:
+            if cmd[0] == "/usr/bin/osacompile" and "slow" in Path(cmd[3]).read_text():
+                compiling.set()
+                release.wait(5)
+            return subprocess.CompletedProcess([], 0, stdout=b"ok", stderr=b"")
+
+        mock_run.side_effect = run
+        for script in ("fast", "fast", "slow"):
+            connector._run_applescript(script)
+
+        slow = threading.Thread(target=connector._run_applescript, args=("slow",))
+        slow.start()
+        try:
+            assert compiling.wait(5)
+            # Compiled already, and a second caller of the slow script uses stdin
+            assert connector._run_applescript("fast") == "ok"
+            assert connector._run_applescript("slow") == "ok"
+            assert slow.is_alive()
+        finally:
+            release.set()
+            slow.join(5)
+        connector.close()
+
+    def test_persistent_worker_result(self) -> None:
+        """Test scripts are routed through the persistent worker."""
+        connector = AppleMailConnector(persistent=True)
+        with patch.object(
+            connector._worker, "execute", return_value=(True, b"result\n")
+        ) as mock_execute, patch("subprocess.run") as mock_run:
+            assert connector._run_applescript("test script") == "result"
+
+        mock_execute.assert_called_once_with("test script", 60, None)
+        mock_run.assert_not_called()
+
+    def test_persistent_worker_error_mapping(self) -> None:
+        """Test worker error replies map to mail exceptions."""
+        connector = AppleMailConnector(persistent=True)
+        with patch.object(
+            connector._worker,
+            "execute",
+            return_value=(False, b"Can't get message 123. (-1728)"),
+        ):
+            with pytest.raises(MailMessageNotFoundError, match="Can't get message 123"):
+                connector._run_applescript("test script")
+
+    @patch("subprocess.run")
+    @patch("subprocess.Popen", side_effect=FileNotFoundError("osascript"))
+    def test_persistent_worker_falls_back(
+        self, mock_popen: MagicMock, mock_run: MagicMock
+    ) -> None:
+        """Test a one-shot osascript call is used when the worker cannot start."""
+        mock_run.return_value = subprocess.CompletedProcess([], 0, stdout=b"result", stderr=b"")
+        connector = AppleMailConnector(persistent=True)
+
+        assert connector._run_applescript("test script") == "result"
+        mock_popen.assert_called_once()
+        mock_run.assert_called_once()
+
+        # The failed spawn is remembered rather than retried on every call
+        assert connector._run_applescript("test script") == "result"
+        mock_popen.assert_called_once()
+
+    def test_worker_reply_read_in_chunks(self) -> None:
+        """Test a reply arriving in several pieces is read up to its newline."""
+        worker = _AppleScriptWorker()
+        worker._proc = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import sys, time; sys.stdin.readline(); sys.stdout.write('Oc2Vu'); "
+                "sys.stdout.flush(); time.sleep(0.1); print('dA==', flush=True)",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+        assert worker.execute("test script", 5) == (True, b"sent")
+        worker.close()
+
+    def test_worker_timeout_covers_partial_reply(self) -> None:
+        """Test a worker stalling partway through a reply times out and is stopped."""
+        worker = _AppleScriptWorker()
+        worker._proc = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import sys, time; sys.stdin.readline(); sys.stdout.write('Oc2Vu'); "
+                "sys.stdout.flush(); time.sleep(30)",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            worker.execute("test script", 0.3)
+        assert worker._proc is None
+
+    @patch("subprocess.Popen")
+    def test_busy_worker_hands_call_back(self, mock_popen: MagicMock) -> None:
+        """Test a call made while the worker is running a script falls back."""
+        worker = _AppleScriptWorker()
+
+        with worker._lock:
+            assert worker.execute("test script", 60) is None
+        mock_popen.assert_not_called()
+
+    def test_idle_worker_is_stopped(self) -> None:
+        """Test the worker process is shut down after the idle timeout."""
+        worker = _AppleScriptWorker(idle_timeout=0.01)
+        proc = MagicMock()
+        proc.poll.return_value = None
+        worker._proc = proc
+
+        with worker._lock:
+            worker._schedule_idle_close()
+        deadline = time.monotonic() + 2
+        while worker._proc is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert worker._proc is None
+        proc.kill.assert_called_once()
+        worker.close()
+
+    def test_context_manager_closes_worker(self) -> None:
+        """Test leaving the with block shuts the persistent worker down."""
+        with patch("apple_mail_mcp.mail_connector._AppleScriptWorker.close") as mock_close:
+            with AppleMailConnector(persistent=True):
+                pass
+        mock_close.assert_called_once()
+
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_list_mailboxes(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test listing mailboxes."""
-        mock_run.return_value = "mailbox data"
+        mock_run.return_value = b"INBOX\x1f5\x1eSent\x1f0"
 
         result = connector.list_mailboxes("Gmail")
-        assert len(result) > 0
+
+        assert result == [
+            {"name": "INBOX", "unread_count": 5},
+            {"name": "Sent", "unread_count": 0},
+        ]
+        assert mock_run.call_args[1]["args"] == ["Gmail"]
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_list_mailboxes_cached(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test mailboxes are reused per account until refreshed."""
+        mock_run.return_value = b"INBOX\x1f5"
+
+        first = connector.list_mailboxes("Gmail")
+        first[0]["unread_count"] = 99
+        assert connector.list_mailboxes("Gmail") == [{"name": "INBOX", "unread_count": 5}]
+        assert mock_run.call_count == 1
+
+        connector.list_mailboxes("Work")
+        connector.list_mailboxes("Gmail", refresh=True)
+        assert mock_run.call_count == 3
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_list_mailboxes_cache_invalidated(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test creating a mailbox or acting on messages drops cached lists."""
+        mock_run.return_value = b"INBOX\x1f5"
+        connector.list_mailboxes("Gmail")
+
+        mock_run.return_value = "success"
+        connector.create_mailbox("Gmail", "Projects")
+        mock_run.return_value = b"INBOX\x1f5"
+        connector.list_mailboxes("Gmail")
+        assert mock_run.call_count == 3
+
+        mock_run.return_value = "1"
+        connector.mark_as_read(["12345"], account="Gmail", mailbox="INBOX")
+        mock_run.return_value = b"INBOX\x1f4"
+        assert connector.list_mailboxes("Gmail") == [{"name": "INBOX", "unread_count": 4}]
+        assert mock_run.call_count == 5
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_list_accounts(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test accounts are parsed and their names cached."""
+        mock_run.return_value = (
+            b"Gmail\x1fme@gmail.com\x1falias@gmail.com\x1eOn My Mac"
+        )
+
+        result = connector.list_accounts()
+
+        assert result == [
+            {"name": "Gmail", "emails": ["me@gmail.com", "alias@gmail.com"]},
+            {"name": "On My Mac", "emails": []},
+        ]
+        assert connector._get_account_names() == ["Gmail", "On My Mac"]
+        mock_run.assert_called_once()
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_search_messages_basic(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test basic message search."""
-        mock_run.return_value = "12345|Test Subject|sender@example.com|Mon Jan 1 2024|false"
+        mock_run.return_value = (
+            b"12345\x1fTest Subject\x1fsender@example.com"
+            b"\x1fMon Jan 1 2024\x1ffalse"
+        )
 
         result = connector.search_messages("Gmail", "INBOX")
 
@@ -104,13 +364,200 @@ class TestAppleMailConnector:
         assert result[0]["read_status"] is False
         call_args = mock_run.call_args[0][0]
         assert "whose true" not in call_args
+        # Unfiltered listings read each property for the whole range at once
+        assert "subject of messages 1 thru msgCount of mailboxRef" in call_args
+        assert "repeat with msg in" not in call_args
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_search_messages_unfiltered_limit(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test a limit on an unfiltered listing shortens the range read."""
+        mock_run.return_value = b""
+
+        assert connector.search_messages("Gmail", "INBOX", limit=5) == []
+
+        assert "if msgCount > limitCount then set msgCount to limitCount" in (
+            mock_run.call_args[0][0]
+        )
+        assert mock_run.call_args[1]["args"][5] == "5"
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_search_messages_fts_uses_index(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test the Envelope Index answers the search when it is usable."""
+        mock_run.return_value = "ACCOUNT-UUID"
+        hits = [{"id": "101", "subject": "Report", "sender": "a@example.com",
+                 "date_received": "2023-11-14T22:13:20", "read_status": True}]
+
+        with patch.object(connector._envelope_index, "search", return_value=hits) as search:
+            assert connector.search_messages_fts("Gmail", "INBOX", "report") == hits
+            connector.search_messages_fts("Gmail", "INBOX", "report")
+
+        search.assert_called_with("ACCOUNT-UUID", "INBOX", "report", 50)
+        # The account ID is looked up once
+        mock_run.assert_called_once()
+        assert connector._message_locations["101"] == ("Gmail", "INBOX")
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_search_messages_fts_falls_back(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test an unusable index falls back to subject and sender searches."""
+        mock_run.side_effect = [
+            "ACCOUNT-UUID",
+            b"1\x1fReport\x1fa@example.com\x1fMon Jan 1 2024\x1ftrue",
+            b"2\x1fHello\x1freport@example.com\x1fMon Jan 1 2024\x1ffalse\x1e"
+            b"1\x1fReport\x1fa@example.com\x1fMon Jan 1 2024\x1ftrue",
+        ]
+
+        with patch.object(
+            connector._envelope_index,
+            "search",
+            side_effect=MailIndexUnavailableError("no access"),
+        ):
+            results = connector.search_messages_fts("Gmail", "INBOX", "report")
+
+        assert [m["id"] for m in results] == ["1", "2"]
+        assert mock_run.call_args_list[1][1]["args"][3] == "report"
+        assert mock_run.call_args_list[2][1]["args"][2] == "report"
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_search_messages_uses_index(self, mock_run: MagicMock) -> None:
+        """Test index_search answers search_messages from the Envelope Index."""
+        connector = AppleMailConnector(index_search=True)
+        mock_run.return_value = "ACCOUNT-UUID"
+        hits = [{"id": "101", "subject": "Report", "sender": "a@example.com",
+                 "date_received": "2023-11-14T22:13:20", "read_status": False}]
+
+        with patch.object(connector._envelope_index, "find", return_value=hits) as find:
+            results = connector.search_messages(
+                "Gmail", subject_contains="report", read_status=False, limit=5
+            )
+
+        assert results == hits
+        find.assert_called_once_with(
+            "ACCOUNT-UUID", "INBOX", sender_contains=None, subject_contains="report",
+            read_status=False, limit=5,
+        )
+        mock_run.assert_called_once()
+        assert connector._message_locations["101"] == ("Gmail", "INBOX")
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_search_messages_index_falls_back(self, mock_run: MagicMock) -> None:
+        """Test an unusable index falls back to the AppleScript search."""
+        connector = AppleMailConnector(index_search=True)
+        mock_run.side_effect = [
+            "ACCOUNT-UUID",
+            b"1\x1fReport\x1fa@example.com\x1fMon Jan 1 2024\x1ftrue",
+        ]
+
+        with patch.object(
+            connector._envelope_index,
+            "find",
+            side_effect=MailIndexUnavailableError("no access"),
+        ):
+            results = connector.search_messages("Gmail", subject_contains="report")
+
+        assert [m["id"] for m in results] == ["1"]
+        assert mock_run.call_args_list[1][1]["args"][3] == "report"
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_search_messages_dates_match_index(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test the AppleScript search writes dates in the index's ISO 8601 form."""
+        mock_run.return_value = b""
+
+        connector.search_messages("Gmail", "INBOX", subject_contains="report")
+
+        assert "as «class isot» as string" in mock_run.call_args.args[0]
+
+    @pytest.mark.parametrize("kwargs", [{"subject_contains": "report"}, {}])
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_search_messages_rereads_changed_mailbox(
+        self, mock_run: MagicMock, connector: AppleMailConnector, kwargs: dict
+    ) -> None:
+        """Test the search retries the bulk reads until the IDs stay the same."""
+        mock_run.return_value = b""
+
+        connector.search_messages("Gmail", "INBOX", **kwargs)
+
+        script = mock_run.call_args.args[0]
+        assert "= msgIds then exit repeat" in script
+        assert 'error "Mailbox changed while reading messages"' in script
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_message_action_keeps_index_copy(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test acting on messages leaves the Envelope Index copy to its TTL."""
+        mock_run.return_value = "1"
+
+        with patch.object(connector._envelope_index, "invalidate") as invalidate:
+            connector.mark_as_read(["12345"], account="Gmail", mailbox="INBOX")
+
+        invalidate.assert_not_called()
+
+    def test_parse_message_results_multiple_rows(self) -> None:
+        """Test parsing keeps pipes and newlines in fields and skips malformed rows."""
+        result = (
+            b"1\x1fQ3 | Budget\x1fa@example.com\x1fMon Jan 1 2024\x1ftrue\x1e"
+            b"not a message row\x1e"
+            b"2\x1fSecond\nline\x1fb@example.com\x1fTue Jan 2 2024\x1ffalse"
+        )
+
+        messages = AppleMailConnector._parse_message_results(result)
+
+        assert [m["id"] for m in messages] == ["1", "2"]
+        assert messages[0]["subject"] == "Q3 | Budget"
+        assert messages[0]["read_status"] is True
+        assert messages[1]["subject"] == "Second\nline"
+        assert messages[1]["read_status"] is False
+
+    def test_filter_messages_stops_parsing_at_limit(self) -> None:
+        """Test records past the limit are never parsed."""
+        result = (
+            b"1\x1fFirst\x1fa@example.com\x1fMon Jan 1 2024\x1ftrue\x1e"
+            b"2\x1f\xff invalid utf-8\x1fb@example.com\x1fTue Jan 2 2024\x1ffalse"
+        )
+
+        messages = AppleMailConnector._filter_messages(
+            AppleMailConnector._iter_message_results(result), None, None, None, 1
+        )
+
+        assert [m["id"] for m in messages] == ["1"]
+
+    def test_filter_direct_results_skips_parsing_without_match(self) -> None:
+        """Test output lacking a filter string is rejected before parsing."""
+        result = b"1\x1f\xff invalid utf-8\x1fa@example.com\x1fMon Jan 1 2024\x1ftrue"
+
+        messages = AppleMailConnector._filter_direct_results(
+            result, "nobody@example.com", None, None, 10
+        )
+
+        assert messages == []
+
+    def test_filter_direct_results_requires_every_filter(self) -> None:
+        """Test a match on one filter is still checked against the other."""
+        result = (
+            b"1\x1fWeekly Meeting\x1fjohn@example.com\x1fMon Jan 1 2024\x1ftrue\x1e"
+            b"2\x1fLunch\x1fJOHN@example.com\x1fTue Jan 2 2024\x1ffalse"
+        )
+
+        messages = AppleMailConnector._filter_direct_results(
+            result, "John@", "meeting", None, 10
+        )
+
+        assert [m["id"] for m in messages] == ["1"]
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_search_messages_with_filters(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test message search with filters."""
-        mock_run.return_value = ""
+        mock_run.return_value = b""
 
         connector.search_messages(
             "Gmail",
@@ -123,25 +570,317 @@ class TestAppleMailConnector:
 
         # Verify the script includes filter conditions
         call_args = mock_run.call_args[0][0]
-        assert 'sender contains "john@example.com"' in call_args
-        assert 'subject contains "meeting"' in call_args
-        assert "read status is false" in call_args
-        assert "items 1 thru 10" in call_args
+        assert "sender contains senderFilter" in call_args
+        assert "subject contains subjectFilter" in call_args
+        assert "read status is statusFilter" in call_args
+        # Separator characters inside free text cannot split a record
+        assert "my cleanField(item i of my msgSubjects)" in call_args
+        # Matches are read one property at a time, not one message at a time
+        assert "subject of matchedRef" in call_args
+        assert "repeat with msg in" not in call_args
+        assert "if msgCount > limitCount then set msgCount to limitCount" in call_args
+        # Filter values travel as argv, not script text
+        assert mock_run.call_args[1]["args"] == [
+            "Gmail", "INBOX", "john@example.com", "meeting", "false", "10"
+        ]
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_search_messages_reuses_script_for_same_filters(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test searches with the same set of filters share one script."""
+        mock_run.return_value = b""
+
+        connector.search_messages("Gmail", "INBOX", sender_contains="a", limit=5)
+        first_script = mock_run.call_args[0][0]
+        connector.search_messages("Work", "Sent", sender_contains="b", limit=50)
+
+        assert mock_run.call_args[0][0] is first_script
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_search_messages_read_toggle_only_changes_args(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test toggling read/unread reuses the script and only changes argv."""
+        mock_run.return_value = b""
+
+        connector.search_messages("Gmail", "INBOX", subject_contains="x", read_status=True)
+        first_script = mock_run.call_args[0][0]
+        first_args = mock_run.call_args[1]["args"]
+        connector.search_messages("Gmail", "INBOX", subject_contains="x", read_status=False)
+
+        assert mock_run.call_args[0][0] is first_script
+        assert first_args[4] == "true"
+        assert mock_run.call_args[1]["args"][4] == "false"
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_get_message(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test getting a message."""
-        mock_run.return_value = "12345|Subject|sender@example.com|Mon Jan 1 2024|true|false|Message body"
+        connector._account_names = ["Gmail"]
+
+        def run(script: str, binary: bool, args: list[str]) -> bytes:
+            # The body is written to the file named by the fourth argument
+            Path(args[3]).write_text("Message body \u2713", encoding="utf-8")
+            return (
+                b"12345\x1fSubject\x1fsender@example.com"
+                b"\x1fMon Jan 1 2024\x1ftrue\x1ffalse\x1fGmail\x1fINBOX"
+            )
+
+        mock_run.side_effect = run
 
         result = connector.get_message("12345", include_content=True)
 
         assert result["id"] == "12345"
         assert result["subject"] == "Subject"
-        assert result["content"] == "Message body"
+        assert result["content"] == "Message body \u2713"
         assert result["read_status"] is True
         assert result["flagged"] is False
+        call_args = mock_run.call_args[0][0]
+        assert "messages of every mailbox of acc whose id is targetId" in call_args
+        # The per-mailbox fallback stops at the first mailbox holding the ID
+        assert "if mailboxHits is not {} then exit repeat" in call_args
+        args = mock_run.call_args[1]["args"]
+        assert args[:3] == ["12345", "", ""]
+        # The temporary body file is removed afterwards
+        assert not Path(args[3]).exists()
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_get_message_truncates_body(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test max_body_bytes cuts the body at a character boundary."""
+        connector._account_names = ["Gmail"]
+
+        def run(script: str, binary: bool, args: list[str]) -> bytes:
+            Path(args[3]).write_text("ab✓cd", encoding="utf-8")
+            return (
+                b"12345\x1fSubject\x1fsender@example.com"
+                b"\x1fMon Jan 1 2024\x1ftrue\x1ffalse\x1fGmail\x1fINBOX"
+            )
+
+        mock_run.side_effect = run
+
+        result = connector.get_message("12345", max_body_bytes=4)
+        assert result["content"] == "ab"
+        assert result["truncated"] is True
+        assert result["next_offset"] == 2
+
+        result = connector.get_message("12345", max_body_bytes=100)
+        assert result["content"] == "ab✓cd"
+        assert result["truncated"] is False
+        assert "next_offset" not in result
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_get_message_body_chunks_join_up(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test following next_offset reads the whole body without splitting characters."""
+        connector._account_names = ["Gmail"]
+        body = "café ✓ \U0001f600 done"
+
+        def run(script: str, binary: bool, args: list[str]) -> bytes:
+            Path(args[3]).write_text(body, encoding="utf-8")
+            return (
+                b"12345\x1fSubject\x1fsender@example.com"
+                b"\x1fMon Jan 1 2024\x1ftrue\x1ffalse\x1fGmail\x1fINBOX"
+            )
+
+        mock_run.side_effect = run
+
+        chunks = []
+        offset = 0
+        while True:
+            chunk = connector.get_message_body_chunk("12345", offset=offset, length=5)
+            chunks.append(chunk["content"])
+            offset = chunk["next_offset"]
+            if not chunk["has_more"]:
+                break
+
+        assert "".join(chunks) == body
+        assert chunk["body_bytes"] == len(body.encode("utf-8"))
+        # A start inside a character skips to the next one
+        assert connector.get_message_body_chunk("12345", offset=4, length=5)["content"] == " ✓"
+
+    def test_get_message_body_chunk_rejects_bad_range(
+        self, connector: AppleMailConnector
+    ) -> None:
+        """Test negative offsets and lengths too short for a character are rejected."""
+        with pytest.raises(ValueError, match="offset"):
+            connector.get_message_body_chunk("12345", offset=-1)
+        with pytest.raises(ValueError, match="length"):
+            connector.get_message_body_chunk("12345", length=3)
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_get_message_without_content(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test no body file is requested when content is not wanted."""
+        connector._account_names = ["Gmail"]
+        mock_run.return_value = (
+            b"12345\x1fSubject\x1fsender@example.com"
+            b"\x1fMon Jan 1 2024\x1ftrue\x1ffalse\x1fGmail\x1fINBOX"
+        )
+
+        result = connector.get_message("12345", include_content=False)
+
+        assert result["content"] == ""
+        assert mock_run.call_args[1]["args"] == ["12345", "", "", ""]
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_get_message_uses_cached_location(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test a known location is tried before searching all accounts."""
+        connector._message_locations["12345"] = ("Gmail", "INBOX")
+        mock_run.return_value = (
+            b"12345\x1fSubject\x1fsender@example.com\x1fMon Jan 1 2024"
+            b"\x1ftrue\x1ffalse\x1fGmail\x1fINBOX"
+        )
+
+        connector.get_message("12345", include_content=False)
+
+        assert mock_run.call_args[1]["args"] == ["12345", "Gmail", "INBOX", ""]
+        assert (
+            "message id targetId of mailbox cachedMailbox of account cachedAccount"
+            in mock_run.call_args[0][0]
+        )
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_get_message_probes_accounts_in_parallel(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test an unknown location is probed with one script per account."""
+        connector._account_names = ["Gmail", "Work", "iCloud"]
+
+        def probe(script: str, binary: bool, args: list[str]) -> bytes:
+            if args[1] != "Work":
+                raise MailAppleScriptError("Message not found")
+            return (
+                b"12345\x1fSubject\x1fsender@example.com\x1fMon Jan 1 2024"
+                b"\x1ftrue\x1ffalse\x1fWork\x1fINBOX"
+            )
+
+        mock_run.side_effect = probe
+
+        result = connector.get_message("12345")
+
+        assert result["subject"] == "Subject"
+        assert connector._message_locations["12345"] == ("Work", "INBOX")
+        probed = sorted(call.args[2][1] for call in mock_run.call_args_list)
+        assert probed == ["Gmail", "Work", "iCloud"]
+        assert all(call.args[2][2] == "" for call in mock_run.call_args_list)
+        # Every probe is given the same body file
+        assert len({call.args[2][3] for call in mock_run.call_args_list}) == 1
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_get_messages(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test several messages are fetched with one script, in request order."""
+        connector._remember_location("12346", "Gmail", "INBOX")
+
+        def run(script: str, binary: bool, args: list[str]) -> bytes:
+            Path(args[1]).write_bytes(b"First body\x1eSecond body\x1e")
+            return (
+                b"12346\x1fSecond\x1fb@example.com\x1fTue Jan 2 2024"
+                b"\x1ffalse\x1ftrue\x1fGmail\x1fINBOX\x1e"
+                b"12345\x1fFirst\x1fa@example.com\x1fMon Jan 1 2024"
+                b"\x1ftrue\x1ffalse\x1fWork\x1fArchive"
+            )
+
+        mock_run.side_effect = run
+
+        result = connector.get_messages(["12345", "12346", "99999"], include_content=True)
+
+        assert [m["id"] for m in result] == ["12345", "12346"]
+        assert result[0]["content"] == "Second body"
+        assert result[1]["content"] == "First body"
+        assert result[1]["flagged"] is True
+        assert connector._message_locations["12345"] == ("Work", "Archive")
+        mock_run.assert_called_once()
+        args = mock_run.call_args[1]["args"]
+        assert args[0] == "12345,99999"
+        assert args[2:] == ["Gmail", "INBOX", "12346"]
+        assert not Path(args[1]).exists()
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_get_messages_without_content(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test no body file is used when content is not requested."""
+        mock_run.return_value = b""
+
+        assert connector.get_messages(["12345"], account="Gmail", mailbox="INBOX") == []
+        assert mock_run.call_args[1]["args"] == ["", "", "Gmail", "INBOX", "12345"]
+
+    def test_get_messages_empty_list(self, connector: AppleMailConnector) -> None:
+        """Test an empty request does not run a script."""
+        assert connector.get_messages([]) == []
+
+    def test_location_cache_evicts_least_recently_used(
+        self, connector: AppleMailConnector
+    ) -> None:
+        """Test the location cache is bounded and keeps recently used entries."""
+        with patch("apple_mail_mcp.mail_connector._LOCATION_CACHE_SIZE", 2):
+            connector._remember_location("1", "Gmail", "INBOX")
+            connector._remember_location("2", "Gmail", "INBOX")
+            connector._cached_location("1")
+            connector._remember_location("3", "Gmail", "Archive")
+
+        assert list(connector._message_locations) == ["1", "3"]
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_get_message_probes_all_missing(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test a message missing from every account raises."""
+        connector._account_names = ["Gmail", "Work"]
+        mock_run.side_effect = MailAppleScriptError("Message not found")
+
+        with pytest.raises(MailAppleScriptError, match="Message not found"):
+            connector.get_message("12345")
+
+    def test_probe_accounts_kills_losing_probes(self, connector: AppleMailConnector) -> None:
+        """Test probes still running when one finds the message are killed."""
+        killed = threading.Event()
+        processes: list[Any] = []
+
+        class FakeProcess:
+            """Probe process that finds the message in Work and runs until killed elsewhere."""
+
+            def __init__(self, command: list[str], **kwargs: Any) -> None:
+                self.account = command[3]
+                self.returncode: int | None = None
+                self.killed = False
+                processes.append(self)
+
+            def communicate(
+                self, stdin: bytes | None = None, timeout: float | None = None
+            ) -> tuple[bytes, bytes]:
+                if self.account == "Work":
+                    self.returncode = 0
+                    return b"found\n", b""
+                killed.wait(5)
+                self.returncode = -9
+                return b"", b""
+
+            def poll(self) -> int | None:
+                return self.returncode
+
+            def kill(self) -> None:
+                self.killed = True
+                killed.set()
+
+        with patch("subprocess.Popen", FakeProcess), patch.object(
+            connector, "_compiled_script", return_value=None
+        ):
+            result = connector._probe_accounts("probe script", ["12345", "", ""], ["Gmail", "Work"])
+
+        assert result == b"found"
+        # The Gmail probe was either killed or never started
+        assert all(p.killed for p in processes if p.account == "Gmail")
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_send_email_basic(
@@ -175,11 +914,12 @@ class TestAppleMailConnector:
 
         assert result is True
 
-        # Verify script includes recipients
-        call_args = mock_run.call_args[0][0]
-        assert "recipient@example.com" in call_args
-        assert "cc@example.com" in call_args
-        assert "bcc@example.com" in call_args
+        # Verify recipients are passed as script arguments
+        script_args = mock_run.call_args[1]["args"]
+        assert script_args[2] == "recipient@example.com"
+        assert script_args[3] == "cc@example.com"
+        assert script_args[4] == "bcc@example.com"
+        assert "recipient@example.com" not in mock_run.call_args[0][0]
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_mark_as_read(
@@ -203,9 +943,85 @@ class TestAppleMailConnector:
 
         assert result == 1
 
-        # Verify script sets read status to false
+        # Verify the read action is run with status false
+        assert mock_run.call_args[1]["args"][1:3] == ["read", "false"]
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_mark_as_read_known_mailbox(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test messages in a known mailbox are updated with one bulk set."""
+        mock_run.return_value = "2"
+
+        result = connector.mark_as_read(
+            ["12345", "12346"], read=True, account="Gmail", mailbox="INBOX"
+        )
+
+        assert result == 2
         call_args = mock_run.call_args[0][0]
-        assert "set read status of msg to false" in call_args
+        assert "whose id is in idList" in call_args
+        assert mock_run.call_args[1]["args"] == [
+            "", "read", "true", "", "Gmail", "INBOX", "12345,12346"
+        ]
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_mark_as_read_uses_search_locations(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test locations from search results skip the mailbox scan."""
+        mock_run.return_value = b"12345\x1fSubject\x1fsender@example.com\x1fMon Jan 1 2024\x1ffalse"
+        connector.search_messages("Gmail", "INBOX")
+
+        mock_run.return_value = "2"
+        connector.mark_as_read(["12345", "99999"])
+
+        # Only the unknown ID is scanned for
+        assert mock_run.call_args[1]["args"] == [
+            "99999", "read", "true", "", "Gmail", "INBOX", "12345"
+        ]
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_message_actions_share_one_script(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test bulk actions differ only in argv, so the script compiles once."""
+        mock_run.return_value = "1"
+
+        connector.mark_as_read(["12345"], read=True)
+        connector.mark_as_read(["12345"], read=False)
+        connector.flag_message(["12345"], flag_color="red")
+        connector.delete_messages(["12345"])
+
+        scripts = {id(call.args[0]) for call in mock_run.call_args_list}
+        assert len(scripts) == 1
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_mark_as_read_account_only(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test an account without a mailbox limits the scan to that account."""
+        mock_run.return_value = "1"
+
+        connector.mark_as_read(["12345"], account="Gmail")
+
+        assert mock_run.call_args[1]["args"] == ["", "read", "true", "", "Gmail", "", "12345"]
+        assert "searchMailboxes(mailboxes of acc, groupIds)" in mock_run.call_args[0][0]
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_get_message_account_only(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test an account hint restricts the locate search without probing."""
+        connector._account_names = ["Gmail", "Work"]
+        mock_run.return_value = (
+            b"12345\x1fSubject\x1fsender@example.com\x1fMon Jan 1 2024"
+            b"\x1ftrue\x1ffalse\x1fWork\x1fINBOX"
+        )
+
+        connector.get_message("12345", include_content=False, account="Work")
+
+        mock_run.assert_called_once()
+        assert mock_run.call_args[1]["args"] == ["12345", "Work", "", ""]
 
     def test_mark_as_read_empty_list(self, connector: AppleMailConnector) -> None:
         """Test marking with empty list."""
@@ -219,35 +1035,37 @@ class TestAppleMailConnector:
         with pytest.raises(ValueError, match="Invalid message ID"):
             connector.mark_as_read(["12345", "abc"])
 
+    def test_mark_as_read_rejects_non_ascii_digits(
+        self, connector: AppleMailConnector
+    ) -> None:
+        """Test Unicode digits that AppleScript cannot coerce are rejected."""
+        with pytest.raises(ValueError, match="Invalid message ID"):
+            connector.mark_as_read(["\u0661\u0662"])
+        with pytest.raises(ValueError, match="Invalid message ID"):
+            connector.mark_as_read(["12\u00b2"])
+
 
 class TestSearchMessagesExchangeFallback:
     """Tests for Exchange account fallback in search_messages."""
 
     @pytest.fixture
-    def connector(self) -> AppleMailConnector:
-        """Create a connector instance."""
-        return AppleMailConnector(timeout=30)
-
-    @pytest.fixture
-    def direct_result(self) -> str:
-        """Sample pipe-delimited result from _search_messages_direct."""
-        return (
-            "101|Meeting Notes|alice@exchange.com|Mon Jan 1 2024|true\n"
-            "102|Project Update|bob@exchange.com|Tue Jan 2 2024|false\n"
-            "103|Lunch Plans|carol@exchange.com|Wed Jan 3 2024|true"
-        )
+    def exchange_cached(self, connector: AppleMailConnector) -> None:
+        """Mark ExchangeAccount as not supporting whose clauses."""
+        connector._whose_unsupported_accounts.add("ExchangeAccount")
 
+    @pytest.mark.parametrize(
+        "error",
+        [WHOSE_ERROR, "Can't get items 1 thru 50 of messages whose true"],
+        ids=["illegal_comparison", "cant_get_items"],
+    )
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_search_messages_exchange_fallback(
-        self, mock_run: MagicMock, connector: AppleMailConnector
+        self, mock_run: MagicMock, connector: AppleMailConnector, error: str
     ) -> None:
         """Verify that when whose-based script raises Exchange error, fallback is used."""
         # First call (whose-based) fails with Exchange error
         # Second call (direct index-based) succeeds
-        mock_run.side_effect = [
-            MailAppleScriptError("Illegal comparison or logical (-1726)"),
-            "101|Subject|sender@exchange.com|Mon Jan 1 2024|false",
-        ]
+        mock_run.side_effect = [MailAppleScriptError(error), EXCHANGE_MESSAGE]
 
         result = connector.search_messages("ExchangeAccount", "INBOX")
 
@@ -259,19 +1077,27 @@ class TestSearchMessagesExchangeFallback:
         assert mock_run.call_count == 2
 
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_search_messages_exchange_fallback_cant_get_items(
+    def test_search_messages_cached_until_message_action(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
-        """Verify fallback triggers on 'Can't get items' whose error."""
-        mock_run.side_effect = [
-            MailAppleScriptError("Can't get items 1 thru 50 of messages whose true"),
-            "101|Subject|sender@exchange.com|Mon Jan 1 2024|false",
-        ]
+        """Verify repeated searches reuse results until messages are changed."""
+        mock_run.return_value = b"101\x1fSubject\x1fsender@example.com\x1fMon Jan 1 2024\x1ffalse"
 
-        result = connector.search_messages("ExchangeAccount", "INBOX")
+        first = connector.search_messages("Gmail", "INBOX", read_status=False)
+        first[0]["subject"] = "changed"
+        assert connector.search_messages("Gmail", "INBOX", read_status=False)[0]["subject"] == (
+            "Subject"
+        )
+        assert mock_run.call_count == 1
 
-        assert len(result) == 1
-        assert "ExchangeAccount" in connector._whose_unsupported_accounts
+        connector.search_messages("Gmail", "INBOX", read_status=True)
+        assert mock_run.call_count == 2
+
+        mock_run.return_value = "1"
+        connector.mark_as_read(["101"])
+        mock_run.return_value = b""
+        assert connector.search_messages("Gmail", "INBOX", read_status=False) == []
+        assert mock_run.call_count == 4
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_search_messages_exchange_fallback_unicode_apostrophe(
@@ -283,7 +1109,7 @@ class TestSearchMessagesExchangeFallback:
                 "Can’t get items 1 thru 50 of every message of mailbox "
                 '"Inbox" whose read status = false. (-1728)'
             ),
-            "101|Subject|sender@exchange.com|Mon Jan 1 2024|false",
+            EXCHANGE_MESSAGE,
         ]
 
         result = connector.search_messages(
@@ -296,15 +1122,40 @@ class TestSearchMessagesExchangeFallback:
         assert len(result) == 1
         assert "ExchangeAccount" in connector._whose_unsupported_accounts
 
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_whose_unsupported_accounts_persisted(
+        self, mock_run: MagicMock, tmp_path: Path
+    ) -> None:
+        """Verify a new connector skips the whose attempt for a remembered account."""
+        cache_path = tmp_path / "cache" / "whose_unsupported.json"
+        mock_run.side_effect = [
+            MailAppleScriptError(WHOSE_ERROR),
+            EXCHANGE_MESSAGE,
+        ]
+        AppleMailConnector(whose_cache_path=cache_path).search_messages(
+            "ExchangeAccount", "INBOX"
+        )
+        assert json.loads(cache_path.read_text()) == ["ExchangeAccount"]
+
+        restarted = AppleMailConnector(whose_cache_path=cache_path)
+        assert "ExchangeAccount" in restarted._whose_unsupported_accounts
+
+    def test_whose_cache_unreadable(self, tmp_path: Path) -> None:
+        """Verify a corrupt cache file is ignored."""
+        cache_path = tmp_path / "whose_unsupported.json"
+        cache_path.write_text("{not json")
+
+        connector = AppleMailConnector(whose_cache_path=cache_path)
+
+        assert connector._whose_unsupported_accounts == set()
+
+    @pytest.mark.usefixtures("exchange_cached")
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_search_messages_exchange_cached(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Verify second call skips directly to fallback (no whose attempt)."""
-        # Pre-populate the cache
-        connector._whose_unsupported_accounts.add("ExchangeAccount")
-
-        mock_run.return_value = "101|Subject|sender@exchange.com|Mon Jan 1 2024|false"
+        mock_run.return_value = EXCHANGE_MESSAGE
 
         result = connector.search_messages("ExchangeAccount", "INBOX")
 
@@ -316,44 +1167,37 @@ class TestSearchMessagesExchangeFallback:
         assert "whose" not in call_args
         assert "messages 1 thru" in call_args
 
+    @pytest.mark.usefixtures("exchange_cached")
+    @pytest.mark.parametrize(
+        ("filters", "expected_id"),
+        [
+            ({"sender_contains": "alice"}, "101"),
+            ({"subject_contains": "project"}, "102"),
+            ({"read_status": False}, "102"),
+        ],
+    )
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_search_messages_direct_filtering(
-        self, mock_run: MagicMock, connector: AppleMailConnector, direct_result: str
+        self,
+        mock_run: MagicMock,
+        connector: AppleMailConnector,
+        filters: dict[str, Any],
+        expected_id: str,
     ) -> None:
         """Verify Python-side sender/subject/read_status filtering works."""
-        connector._whose_unsupported_accounts.add("ExchangeAccount")
-        mock_run.return_value = direct_result
-
-        # Filter by sender
-        result = connector.search_messages(
-            "ExchangeAccount", "INBOX", sender_contains="alice"
-        )
-        assert len(result) == 1
-        assert result[0]["sender"] == "alice@exchange.com"
+        mock_run.return_value = DIRECT_RESULT
 
-        # Filter by subject
-        mock_run.return_value = direct_result
-        result = connector.search_messages(
-            "ExchangeAccount", "INBOX", subject_contains="project"
-        )
-        assert len(result) == 1
-        assert result[0]["subject"] == "Project Update"
+        result = connector.search_messages("ExchangeAccount", "INBOX", **filters)
 
-        # Filter by read_status=False (unread only)
-        mock_run.return_value = direct_result
-        result = connector.search_messages(
-            "ExchangeAccount", "INBOX", read_status=False
-        )
-        assert len(result) == 1
-        assert result[0]["id"] == "102"
+        assert [msg["id"] for msg in result] == [expected_id]
 
+    @pytest.mark.usefixtures("exchange_cached")
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_search_messages_direct_limit(
-        self, mock_run: MagicMock, connector: AppleMailConnector, direct_result: str
+        self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Verify limit is respected after filtering."""
-        connector._whose_unsupported_accounts.add("ExchangeAccount")
-        mock_run.return_value = direct_result
+        mock_run.return_value = DIRECT_RESULT
 
         # All 3 messages match (no filter), but limit=2
         result = connector.search_messages(
@@ -361,12 +1205,32 @@ class TestSearchMessagesExchangeFallback:
         )
         assert len(result) == 2
 
+    @pytest.mark.usefixtures("exchange_cached")
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_search_messages_direct_read_status_in_script(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Verify read status is checked in AppleScript before other properties."""
+        mock_run.return_value = DIRECT_RESULT
+
+        connector.search_messages("ExchangeAccount", "INBOX", read_status=False)
+
+        call_args = mock_run.call_args[0][0]
+        assert "messageRecords(count of msgIds, false)" in call_args
+        assert "read status of messages 1 thru fetchCount" in call_args
+        assert "= msgIds then exit repeat" in call_args
+        assert "whose" not in call_args
+        assert mock_run.call_args[1]["args"] == ["ExchangeAccount", "INBOX", "200"]
+
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_search_messages_imap_no_fallback(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Verify no-filter IMAP query avoids `whose true` and no fallback is used."""
-        mock_run.return_value = "12345|Test Subject|sender@gmail.com|Mon Jan 1 2024|false"
+        mock_run.return_value = (
+            b"12345\x1fTest Subject\x1fsender@gmail.com"
+            b"\x1fMon Jan 1 2024\x1ffalse"
+        )
 
         result = connector.search_messages("Gmail", "INBOX")
 
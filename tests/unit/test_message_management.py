@@ -11,83 +11,102 @@ from apple_mail_mcp.exceptions import (
 )
 from apple_mail_mcp.mail_connector import AppleMailConnector
 
+VALID_FLAG_COLORS = ["none", "orange", "red", "yellow", "blue", "green", "purple", "gray"]
+
 
 class TestMoveMessages:
     """Tests for moving messages between mailboxes."""
 
-    @pytest.fixture
-    def connector(self) -> AppleMailConnector:
-        """Create a connector instance."""
-        return AppleMailConnector(timeout=30)
-
+    @pytest.mark.parametrize(
+        ("message_ids", "destination"),
+        [
+            (["12345"], "Archive"),
+            (["12345", "12346", "12347"], "Archive"),
+            (["12345"], "Projects/Client Work"),
+        ],
+        ids=["single", "multiple", "nested_mailbox"],
+    )
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_move_single_message(
-        self, mock_run: MagicMock, connector: AppleMailConnector
+    def test_move_messages(
+        self,
+        mock_run: MagicMock,
+        connector: AppleMailConnector,
+        message_ids: list[str],
+        destination: str,
     ) -> None:
-        """Test moving a single message."""
-        mock_run.return_value = "1"
+        """Test moving messages, including to a nested mailbox."""
+        mock_run.return_value = str(len(message_ids))
 
         result = connector.move_messages(
-            message_ids=["12345"],
-            destination_mailbox="Archive",
+            message_ids=message_ids,
+            destination_mailbox=destination,
             account="Gmail"
         )
 
-        assert result == 1
-        call_args = mock_run.call_args[0][0]
-        assert "Archive" in call_args
-        assert "12345" in call_args
+        assert result == len(message_ids)
+        args = mock_run.call_args[1]["args"]
+        assert args[0] == ",".join(message_ids)
+        assert args[1:4] == ["move", "Gmail", destination]
 
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_move_multiple_messages(
+    def test_move_with_gmail_handling(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
-        """Test moving multiple messages."""
-        mock_run.return_value = "3"
+        """Test Gmail-specific move handling (copy + delete)."""
+        mock_run.return_value = "1"
 
         result = connector.move_messages(
-            message_ids=["12345", "12346", "12347"],
+            message_ids=["12345"],
             destination_mailbox="Archive",
-            account="Gmail"
+            account="Gmail",
+            gmail_mode=True
         )
 
-        assert result == 3
+        assert result == 1
+        # Should use copy + delete approach for Gmail
+        call_args = mock_run.call_args[0][0]
+        # Gmail mode uses different AppleScript pattern
+        assert "duplicate (messages of mb whose id is in idList)" in call_args
+        assert mock_run.call_args[1]["args"][1] == "copy_delete"
 
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_move_to_nested_mailbox(
+    def test_move_batches_known_locations(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
-        """Test moving to nested mailbox."""
-        mock_run.return_value = "1"
+        """Test known source mailboxes are moved in one batch per mailbox."""
+        connector._message_locations["12345"] = ("Gmail", "INBOX")
+        connector._message_locations["12346"] = ("Gmail", "INBOX")
+        mock_run.return_value = "3"
 
-        result = connector.move_messages(
-            message_ids=["12345"],
-            destination_mailbox="Projects/Client Work",
+        connector.move_messages(
+            message_ids=["12345", "12346", "99999"],
+            destination_mailbox="Archive",
             account="Gmail"
         )
 
-        assert result == 1
-        call_args = mock_run.call_args[0][0]
-        assert "Projects/Client Work" in call_args
+        assert "move (messages of mb whose id is in idList)" in mock_run.call_args[0][0]
+        assert mock_run.call_args[1]["args"] == [
+            "99999", "move", "Gmail", "Archive", "Gmail", "INBOX", "12345,12346"
+        ]
 
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_move_with_gmail_handling(
+    def test_move_with_source_mailbox(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
-        """Test Gmail-specific move handling (copy + delete)."""
-        mock_run.return_value = "1"
+        """Test a given source mailbox skips the mailbox scan."""
+        mock_run.return_value = "2"
 
         result = connector.move_messages(
-            message_ids=["12345"],
+            message_ids=["12345", "12346"],
             destination_mailbox="Archive",
             account="Gmail",
-            gmail_mode=True
+            source_mailbox="INBOX",
         )
 
-        assert result == 1
-        # Should use copy + delete approach for Gmail
-        call_args = mock_run.call_args[0][0]
-        # Gmail mode uses different AppleScript pattern
+        assert result == 2
+        assert mock_run.call_args[1]["args"] == [
+            "", "move", "Gmail", "Archive", "Gmail", "INBOX", "12345,12346"
+        ]
 
     def test_move_empty_list(self, connector: AppleMailConnector) -> None:
         """Test moving with empty message list."""
@@ -105,7 +124,7 @@ class TestMoveMessages:
         """Test error when destination mailbox doesn't exist."""
         mock_run.side_effect = MailMailboxNotFoundError("Mailbox not found")
 
-        with pytest.raises(MailMailboxNotFoundError):
+        with pytest.raises(MailMailboxNotFoundError, match="Mailbox not found"):
             connector.move_messages(
                 message_ids=["12345"],
                 destination_mailbox="NonExistent",
@@ -116,90 +135,114 @@ class TestMoveMessages:
 class TestFlagMessage:
     """Tests for flagging messages."""
 
-    @pytest.fixture
-    def connector(self) -> AppleMailConnector:
-        """Create a connector instance."""
-        return AppleMailConnector(timeout=30)
-
+    @pytest.mark.parametrize(
+        ("message_ids", "flag_color", "action_args"),
+        [
+            (["12345"], "red", ["1", "true"]),  # Red is index 1
+            (["12345"], "none", ["-1", "false"]),  # None clears the flag
+            (["12345", "12346", "12347"], "blue", ["3", "true"]),
+        ],
+        ids=["red", "none", "multiple"],
+    )
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_flag_with_red(
-        self, mock_run: MagicMock, connector: AppleMailConnector
+    def test_flag_messages(
+        self,
+        mock_run: MagicMock,
+        connector: AppleMailConnector,
+        message_ids: list[str],
+        flag_color: str,
+        action_args: list[str],
     ) -> None:
-        """Test flagging message with red flag."""
-        mock_run.return_value = "1"
+        """Test flagging messages, or removing their flag."""
+        mock_run.return_value = str(len(message_ids))
 
         result = connector.flag_message(
-            message_ids=["12345"],
-            flag_color="red"
+            message_ids=message_ids,
+            flag_color=flag_color
         )
 
-        assert result == 1
-        call_args = mock_run.call_args[0][0]
-        assert "flag index" in call_args
-        assert "1" in call_args  # Red is index 1
+        assert result == len(message_ids)
+        assert "flag index" in mock_run.call_args[0][0]
+        assert mock_run.call_args[1]["args"][1:4] == ["flag", *action_args]
 
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_flag_with_none(
+    def test_flag_color_case_insensitive(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
-        """Test removing flag from message."""
+        """Test capitalized color names map to the same flag arguments."""
         mock_run.return_value = "1"
 
-        result = connector.flag_message(
-            message_ids=["12345"],
-            flag_color="none"
+        connector.flag_message(message_ids=["12345"], flag_color="None")
+        assert mock_run.call_args[1]["args"][1:4] == ["flag", "-1", "false"]
+
+        connector.flag_message(message_ids=["12345"], flag_color="Red")
+        assert mock_run.call_args[1]["args"][1:4] == ["flag", "1", "true"]
+
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_flag_repeated_ids_sent_once(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test repeated IDs are passed to the single script run once."""
+        mock_run.return_value = "2"
+
+        connector.flag_message(
+            message_ids=["12345", "12346", "12345"],
+            flag_color="red",
+            account="Gmail",
+            mailbox="INBOX",
         )
 
-        assert result == 1
-        call_args = mock_run.call_args[0][0]
-        assert "-1" in call_args  # None is index -1
+        mock_run.assert_called_once()
+        assert mock_run.call_args[1]["args"][-1] == "12345,12346"
 
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_flag_multiple_messages(
+    def test_flag_known_mailbox(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
-        """Test flagging multiple messages."""
-        mock_run.return_value = "3"
+        """Test messages in a given mailbox are flagged with one bulk set."""
+        mock_run.return_value = "2"
 
         result = connector.flag_message(
-            message_ids=["12345", "12346", "12347"],
-            flag_color="blue"
+            message_ids=["12345", "12346"],
+            flag_color="red",
+            account="Gmail",
+            mailbox="INBOX",
         )
 
-        assert result == 3
+        assert result == 2
+        assert (
+            "set flag index of (messages of mb whose id is in idList) to (actionArg1 as integer)"
+            in mock_run.call_args[0][0]
+        )
+        assert mock_run.call_args[1]["args"] == [
+            "", "flag", "1", "true", "Gmail", "INBOX", "12345,12346"
+        ]
 
     def test_flag_invalid_color(self, connector: AppleMailConnector) -> None:
         """Test error with invalid flag color."""
-        with pytest.raises(ValueError):
+        with pytest.raises(ValueError, match="Invalid flag color"):
             connector.flag_message(
                 message_ids=["12345"],
                 flag_color="invalid"
             )
 
+    @pytest.mark.parametrize("color", VALID_FLAG_COLORS)
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_flag_all_colors(
-        self, mock_run: MagicMock, connector: AppleMailConnector
+        self, mock_run: MagicMock, connector: AppleMailConnector, color: str
     ) -> None:
         """Test all valid flag colors."""
-        valid_colors = ["none", "orange", "red", "yellow", "blue", "green", "purple", "gray"]
-
-        for color in valid_colors:
-            mock_run.return_value = "1"
-            result = connector.flag_message(
-                message_ids=["12345"],
-                flag_color=color
-            )
-            assert result == 1
+        mock_run.return_value = "1"
+        result = connector.flag_message(
+            message_ids=["12345"],
+            flag_color=color
+        )
+        assert result == 1
 
 
 class TestCreateMailbox:
     """Tests for creating mailboxes."""
 
-    @pytest.fixture
-    def connector(self) -> AppleMailConnector:
-        """Create a connector instance."""
-        return AppleMailConnector(timeout=30)
-
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_create_top_level_mailbox(
         self, mock_run: MagicMock, connector: AppleMailConnector
@@ -213,9 +256,8 @@ class TestCreateMailbox:
         )
 
         assert result is True
-        call_args = mock_run.call_args[0][0]
-        assert "Archive" in call_args
-        assert "make new mailbox" in call_args
+        assert "make new mailbox" in mock_run.call_args.args[0]
+        assert mock_run.call_args.kwargs["args"] == ["Gmail", "", "Archive"]
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_create_nested_mailbox(
@@ -231,9 +273,7 @@ class TestCreateMailbox:
         )
 
         assert result is True
-        call_args = mock_run.call_args[0][0]
-        assert "Client Work" in call_args
-        assert "Projects" in call_args
+        assert mock_run.call_args.kwargs["args"] == ["Gmail", "Projects", "Client Work"]
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_create_mailbox_already_exists(
@@ -242,7 +282,7 @@ class TestCreateMailbox:
         """Test error when mailbox already exists."""
         mock_run.side_effect = MailAppleScriptError("Mailbox already exists")
 
-        with pytest.raises(MailAppleScriptError):
+        with pytest.raises(MailAppleScriptError, match="already exists"):
             connector.create_mailbox(
                 account="Gmail",
                 name="INBOX"  # Already exists
@@ -250,7 +290,7 @@ class TestCreateMailbox:
 
     def test_create_mailbox_invalid_name(self, connector: AppleMailConnector) -> None:
         """Test error with invalid mailbox name."""
-        with pytest.raises(ValueError):
+        with pytest.raises(ValueError, match="Invalid mailbox name"):
             connector.create_mailbox(
                 account="Gmail",
                 name=""  # Empty name
@@ -270,21 +310,13 @@ class TestCreateMailbox:
         )
 
         assert result is True
-        call_args = mock_run.call_args[0][0]
-        # Should not contain path traversal
-        assert "../" not in call_args
-        # Should contain sanitized name
-        assert "etc" in call_args
+        # Only the sanitized name reaches the script
+        assert mock_run.call_args.kwargs["args"][2] == "etc"
 
 
 class TestDeleteMessages:
     """Tests for deleting messages."""
 
-    @pytest.fixture
-    def connector(self) -> AppleMailConnector:
-        """Create a connector instance."""
-        return AppleMailConnector(timeout=30)
-
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_delete_single_message(
         self, mock_run: MagicMock, connector: AppleMailConnector
@@ -315,6 +347,24 @@ class TestDeleteMessages:
 
         assert result == 3
 
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_delete_uses_search_locations(
+        self, mock_run: MagicMock, connector: AppleMailConnector
+    ) -> None:
+        """Test known locations are deleted in bulk and then forgotten."""
+        connector._message_locations["12345"] = ("Gmail", "INBOX")
+        mock_run.return_value = "2"
+
+        connector.delete_messages(message_ids=["12345", "99999"])
+
+        assert "delete (messages of mb whose id is in idList)" in mock_run.call_args[0][0]
+        # Unlocated IDs are searched for in bulk and dropped once found
+        assert "my withoutIds(remaining, foundIds)" in mock_run.call_args[0][0]
+        assert mock_run.call_args[1]["args"] == [
+            "99999", "delete", "", "", "Gmail", "INBOX", "12345"
+        ]
+        assert "12345" not in connector._message_locations
+
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_permanent_delete(
         self, mock_run: MagicMock, connector: AppleMailConnector
@@ -353,27 +403,3 @@ class TestDeleteMessages:
                 permanent=False,
                 skip_bulk_check=False
             )
-
-
-class TestMessageManagementSecurity:
-    """Tests for message management security features."""
-
-    def test_validates_mailbox_name(self) -> None:
-        """Test mailbox name validation."""
-        from apple_mail_mcp.utils import sanitize_mailbox_name
-
-        # Should remove dangerous characters
-        assert sanitize_mailbox_name("Valid Name") == "Valid Name"
-        assert sanitize_mailbox_name("../../../") == ""
-        assert sanitize_mailbox_name("Name<>:") == "Name"
-
-    def test_flag_color_validation(self) -> None:
-        """Test flag color validation."""
-        from apple_mail_mcp.utils import validate_flag_color
-
-        valid_colors = ["none", "orange", "red", "yellow", "blue", "green", "purple", "gray"]
-        for color in valid_colors:
-            assert validate_flag_color(color) is True
-
-        assert validate_flag_color("invalid") is False
-        assert validate_flag_color("") is False
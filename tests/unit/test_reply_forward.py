@@ -1,5 +1,6 @@
 """Tests for reply and forward functionality."""
 
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -10,127 +11,96 @@ from apple_mail_mcp.mail_connector import AppleMailConnector
 
 @pytest.fixture
 def connector() -> AppleMailConnector:
-    """Create a mail connector instance."""
-    return AppleMailConnector()
+    """Create a mail connector instance with a single known account."""
+    connector = AppleMailConnector()
+    connector._account_names = ["Gmail"]
+    return connector
 
 
 class TestReplyToMessage:
     """Tests for replying to messages."""
 
+    @pytest.mark.parametrize(
+        ("body", "reply_all", "quote_original"),
+        [
+            ("Thanks for your email!", False, True),
+            ("Thanks everyone!", True, True),
+            ("See my comments below.", False, True),
+            ("Quick response!", False, False),
+            # Should work - some replies might have no text
+            ("", False, True),
+        ],
+        ids=["basic", "reply_all", "with_quote", "without_quote", "empty_body"],
+    )
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_reply_basic(
-        self, mock_run: MagicMock, connector: AppleMailConnector
+    def test_reply(
+        self,
+        mock_run: MagicMock,
+        connector: AppleMailConnector,
+        body: str,
+        reply_all: bool,
+        quote_original: bool,
     ) -> None:
-        """Test basic reply to a message."""
-        mock_run.return_value = "67890"
+        """Test replying with different bodies and reply options."""
+        mock_run.return_value = b"67890"
 
         result = connector.reply_to_message(
             message_id="12345",
-            body="Thanks for your email!",
-            reply_all=False,
+            body=body,
+            reply_all=reply_all,
+            quote_original=quote_original,
         )
 
         assert result == "67890"
-        call_args = mock_run.call_args[0][0]
-        assert "12345" in call_args
-        assert "Thanks for your email!" in call_args
-        assert "reply" in call_args.lower()
+        # Quoting is left to Mail's reply command
+        assert "reply msg reply to all replyAll" in mock_run.call_args.args[0]
+        assert mock_run.call_args.kwargs["args"] == [
+            "12345", "", "", body, "true" if reply_all else "false"
+        ]
 
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_reply_all(
+    def test_reply_uses_cached_location(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
-        """Test reply all to a message."""
-        mock_run.return_value = "67890"
+        """Test a remembered location is passed to the locate script."""
+        connector._remember_location("12345", "Gmail", "INBOX")
+        mock_run.return_value = b"67890"
 
-        result = connector.reply_to_message(
-            message_id="12345",
-            body="Thanks everyone!",
-            reply_all=True,
-        )
+        connector.reply_to_message(message_id="12345", body="Thanks!")
 
-        assert result == "67890"
-        call_args = mock_run.call_args[0][0]
-        assert "12345" in call_args
-        assert "reply to all" in call_args.lower() or "reply all" in call_args.lower()
+        assert mock_run.call_args.kwargs["args"][:3] == ["12345", "Gmail", "INBOX"]
 
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_reply_with_quote(
+    def test_reply_uses_given_location(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
-        """Test reply with original message quoted."""
-        mock_run.return_value = "67890"
+        """Test an explicit account and mailbox override the cache."""
+        connector._remember_location("12345", "Gmail", "INBOX")
+        mock_run.return_value = b"67890"
 
-        result = connector.reply_to_message(
-            message_id="12345",
-            body="See my comments below.",
-            reply_all=False,
-            quote_original=True,
-        )
-
-        assert result == "67890"
-        call_args = mock_run.call_args[0][0]
-        assert "12345" in call_args
-        # AppleScript should handle quoting via reply command
-
-    @patch.object(AppleMailConnector, "_run_applescript")
-    def test_reply_without_quote(
-        self, mock_run: MagicMock, connector: AppleMailConnector
-    ) -> None:
-        """Test reply without quoting original message."""
-        mock_run.return_value = "67890"
-
-        result = connector.reply_to_message(
-            message_id="12345",
-            body="Quick response!",
-            reply_all=False,
-            quote_original=False,
+        connector.reply_to_message(
+            message_id="12345", body="Thanks!", account="Work", mailbox="Archive"
         )
 
-        assert result == "67890"
-        call_args = mock_run.call_args[0][0]
-        assert "12345" in call_args
-
-    @patch.object(AppleMailConnector, "_run_applescript")
-    def test_reply_message_not_found(
-        self, mock_run: MagicMock, connector: AppleMailConnector
-    ) -> None:
-        """Test reply when message doesn't exist."""
-        mock_run.side_effect = MailMessageNotFoundError("Message not found")
-
-        with pytest.raises(MailMessageNotFoundError):
-            connector.reply_to_message(
-                message_id="99999",
-                body="This should fail",
-                reply_all=False,
-            )
+        assert mock_run.call_args.kwargs["args"][:3] == ["12345", "Work", "Archive"]
 
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_reply_empty_body(
+    def test_reply_probes_accounts_in_parallel(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
-        """Test reply with empty body."""
-        mock_run.return_value = "67890"
+        """Test an unknown location is probed with one script per account."""
+        connector._account_names = ["Gmail", "Work"]
 
-        # Should work - some replies might have no text
-        result = connector.reply_to_message(
-            message_id="12345",
-            body="",
-            reply_all=False,
-        )
+        def probe(script: str, binary: bool, args: list[str]) -> bytes:
+            if args[1] != "Work":
+                raise MailMessageNotFoundError("Message not found")
+            return b"67890\n"
 
-        assert result == "67890"
+        mock_run.side_effect = probe
 
-    def test_reply_rejects_invalid_message_id(
-        self, connector: AppleMailConnector
-    ) -> None:
-        """Test validation rejects non-numeric message IDs."""
-        with pytest.raises(ValueError, match="Invalid message ID"):
-            connector.reply_to_message(
-                message_id="abc",
-                body="This should fail",
-                reply_all=False,
-            )
+        assert connector.reply_to_message(message_id="12345", body="Thanks!") == "67890"
+        probed = sorted(call.args[2][1] for call in mock_run.call_args_list)
+        assert probed == ["Gmail", "Work"]
 
 
 class TestForwardMessage:
@@ -141,7 +111,7 @@ class TestForwardMessage:
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test forwarding to a single recipient."""
-        mock_run.return_value = "67890"
+        mock_run.return_value = b"67890"
 
         result = connector.forward_message(
             message_id="12345",
@@ -150,17 +120,17 @@ class TestForwardMessage:
         )
 
         assert result == "67890"
-        call_args = mock_run.call_args[0][0]
-        assert "12345" in call_args
-        assert "colleague@example.com" in call_args
-        assert "forward" in call_args.lower()
+        assert "set fwdMsg to forward msg" in mock_run.call_args.args[0]
+        assert mock_run.call_args.kwargs["args"] == [
+            "12345", "", "", "FYI - see below.", "colleague@example.com", "", ""
+        ]
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_forward_multiple_recipients(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test forwarding to multiple recipients."""
-        mock_run.return_value = "67890"
+        mock_run.return_value = b"67890"
 
         result = connector.forward_message(
             message_id="12345",
@@ -169,16 +139,16 @@ class TestForwardMessage:
         )
 
         assert result == "67890"
-        call_args = mock_run.call_args[0][0]
-        assert "colleague1@example.com" in call_args
-        assert "colleague2@example.com" in call_args
+        assert mock_run.call_args.kwargs["args"][4] == (
+            "colleague1@example.com\ncolleague2@example.com"
+        )
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_forward_with_cc(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test forwarding with CC recipients."""
-        mock_run.return_value = "67890"
+        mock_run.return_value = b"67890"
 
         result = connector.forward_message(
             message_id="12345",
@@ -188,16 +158,16 @@ class TestForwardMessage:
         )
 
         assert result == "67890"
-        call_args = mock_run.call_args[0][0]
-        assert "colleague@example.com" in call_args
-        assert "manager@example.com" in call_args
+        assert mock_run.call_args.kwargs["args"][4:] == [
+            "colleague@example.com", "manager@example.com", ""
+        ]
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_forward_with_attachments(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test forwarding with attachments included."""
-        mock_run.return_value = "67890"
+        mock_run.return_value = b"67890"
 
         result = connector.forward_message(
             message_id="12345",
@@ -207,15 +177,17 @@ class TestForwardMessage:
         )
 
         assert result == "67890"
-        call_args = mock_run.call_args[0][0]
-        # AppleScript forward should preserve attachments by default
+        script = mock_run.call_args.args[0]
+        # Mail's forward command keeps the original attachments
+        assert "forward msg" in script
+        assert "delete" not in script
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_forward_without_attachments(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
         """Test forwarding without attachments."""
-        mock_run.return_value = "67890"
+        mock_run.return_value = b"67890"
 
         result = connector.forward_message(
             message_id="12345",
@@ -227,53 +199,85 @@ class TestForwardMessage:
         assert result == "67890"
 
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_forward_empty_recipient_list(
+    def test_forward_uses_given_location(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
-        """Test forwarding with no recipients raises error."""
-        with pytest.raises(ValueError):
-            connector.forward_message(
-                message_id="12345",
-                to=[],
-                body="This should fail",
-            )
+        """Test an explicit account and mailbox skip the message search."""
+        mock_run.return_value = b"67890"
 
+        connector.forward_message(
+            message_id="12345",
+            to=["colleague@example.com"],
+            account="Gmail",
+            mailbox="INBOX",
+        )
+
+        assert mock_run.call_args.kwargs["args"][:3] == ["12345", "Gmail", "INBOX"]
+
+
+class TestReplyForwardErrors:
+    """Tests for reply and forward error handling."""
+
+    @pytest.mark.parametrize(
+        ("method", "kwargs", "match"),
+        [
+            ("reply_to_message", {"message_id": "abc"}, "Invalid message ID"),
+            (
+                "forward_message",
+                {"message_id": "abc", "to": ["safe@example.com"]},
+                "Invalid message ID",
+            ),
+            ("forward_message", {"message_id": "12345", "to": []}, "At least one recipient"),
+            (
+                "forward_message",
+                {"message_id": "12345", "to": ["invalid-email"]},
+                "Invalid email address",
+            ),
+        ],
+        ids=[
+            "reply_invalid_message_id",
+            "forward_invalid_message_id",
+            "forward_empty_recipient_list",
+            "forward_invalid_email",
+        ],
+    )
     @patch.object(AppleMailConnector, "_run_applescript")
-    def test_forward_message_not_found(
-        self, mock_run: MagicMock, connector: AppleMailConnector
+    def test_rejects_invalid_input(
+        self,
+        mock_run: MagicMock,
+        connector: AppleMailConnector,
+        method: str,
+        kwargs: dict[str, Any],
+        match: str,
     ) -> None:
-        """Test forwarding non-existent message."""
+        """Test invalid input is rejected before any AppleScript runs."""
+        with pytest.raises(ValueError, match=match):
+            getattr(connector, method)(body="This should fail", **kwargs)
+
+        mock_run.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("method", "kwargs"),
+        [
+            ("reply_to_message", {}),
+            ("forward_message", {"to": ["someone@example.com"]}),
+        ],
+        ids=["reply", "forward"],
+    )
+    @patch.object(AppleMailConnector, "_run_applescript")
+    def test_message_not_found(
+        self,
+        mock_run: MagicMock,
+        connector: AppleMailConnector,
+        method: str,
+        kwargs: dict[str, Any],
+    ) -> None:
+        """Test replying to or forwarding a message that doesn't exist."""
         mock_run.side_effect = MailMessageNotFoundError("Message not found")
 
         with pytest.raises(MailMessageNotFoundError):
-            connector.forward_message(
-                message_id="99999",
-                to=["someone@example.com"],
-                body="This should fail",
-            )
+            getattr(connector, method)(message_id="99999", body="This should fail", **kwargs)
 
-    @patch.object(AppleMailConnector, "_run_applescript")
-    def test_forward_validates_emails(
-        self, mock_run: MagicMock, connector: AppleMailConnector
-    ) -> None:
-        """Test email validation for forward recipients."""
-        with pytest.raises(ValueError):
-            connector.forward_message(
-                message_id="12345",
-                to=["invalid-email"],
-                body="This should fail",
-            )
-
-    def test_forward_rejects_invalid_message_id(
-        self, connector: AppleMailConnector
-    ) -> None:
-        """Test validation rejects non-numeric message IDs."""
-        with pytest.raises(ValueError, match="Invalid message ID"):
-            connector.forward_message(
-                message_id="abc",
-                to=["safe@example.com"],
-                body="This should fail",
-            )
 
 
 class TestReplyForwardSecurity:
@@ -283,32 +287,24 @@ class TestReplyForwardSecurity:
     def test_reply_sanitizes_body(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
-        """Test that reply body is sanitized."""
-        mock_run.return_value = "67890"
+        """Test the reply body is passed as an argument, never spliced into the script."""
+        mock_run.return_value = b"67890"
+        body = 'Dangerous "quotes" and \\backslashes\\'
 
-        connector.reply_to_message(
-            message_id="12345",
-            body='Dangerous "quotes" and \\backslashes\\',
-            reply_all=False,
-        )
+        connector.reply_to_message(message_id="12345", body=body, reply_all=False)
 
-        call_args = mock_run.call_args[0][0]
-        # Should have escaped special characters
-        assert '\\"' in call_args or "\\'" in call_args or "\\\\" in call_args
+        assert mock_run.call_args.kwargs["args"][3] == body
+        assert body not in mock_run.call_args.args[0]
 
     @patch.object(AppleMailConnector, "_run_applescript")
     def test_forward_sanitizes_body(
         self, mock_run: MagicMock, connector: AppleMailConnector
     ) -> None:
-        """Test that forward body is sanitized."""
-        mock_run.return_value = "67890"
+        """Test the forward body is passed as an argument, never spliced into the script."""
+        mock_run.return_value = b"67890"
+        body = 'Dangerous "quotes" and \\backslashes\\'
 
-        connector.forward_message(
-            message_id="12345",
-            to=["safe@example.com"],
-            body='Dangerous "quotes" and \\backslashes\\',
-        )
+        connector.forward_message(message_id="12345", to=["safe@example.com"], body=body)
 
-        call_args = mock_run.call_args[0][0]
-        # Should have escaped special characters
-        assert '\\"' in call_args or "\\'" in call_args or "\\\\" in call_args
+        assert mock_run.call_args.kwargs["args"][3] == body
+        assert body not in mock_run.call_args.args[0]
@@ -1,9 +1,15 @@
 """Unit tests for security module."""
 
+import logging
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
 import pytest
 
 from apple_mail_mcp.security import (
     OperationLogger,
+    rate_limit_check,
     validate_bulk_operation,
     validate_send_operation,
 )
@@ -21,6 +27,7 @@ class TestOperationLogger:
         assert operations[0]["operation"] == "test_op"
         assert operations[0]["parameters"] == {"key": "value"}
         assert operations[0]["result"] == "success"
+        assert datetime.fromisoformat(operations[0]["timestamp"])
 
     def test_limits_recent_operations(self) -> None:
         logger = OperationLogger()
@@ -31,6 +38,70 @@ class TestOperationLogger:
         recent = logger.get_recent_operations(limit=5)
         assert len(recent) == 5
         assert recent[-1]["operation"] == "op_19"
+        assert recent[0]["operation"] == "op_15"
+
+    def test_buffers_log_lines(self, caplog: pytest.LogCaptureFixture) -> None:
+        logger = OperationLogger()
+
+        with caplog.at_level(logging.INFO, logger="apple_mail_mcp.security"):
+            logger.log_operation("send_email", {}, "success")
+            assert caplog.records == []
+
+            logger.flush()
+
+        assert len(caplog.records) == 1
+        assert "send_email - success" in caplog.records[0].getMessage()
+
+    def test_log_lines_carry_event_time(self, caplog: pytest.LogCaptureFixture) -> None:
+        logger = OperationLogger()
+
+        with caplog.at_level(logging.INFO, logger="apple_mail_mcp.security"):
+            logger.log_operation("send_email", {}, "success")
+            logger.flush()
+
+        timestamp = logger.get_recent_operations(limit=1)[0]["timestamp"]
+        assert f"{timestamp} send_email - success" in caplog.records[0].getMessage()
+
+    def test_full_batch_written_in_background(self, caplog: pytest.LogCaptureFixture) -> None:
+        logger = OperationLogger()
+
+        with caplog.at_level(logging.INFO, logger="apple_mail_mcp.security"):
+            for _ in range(64):
+                logger.log_operation("mark_as_read", {}, "success")
+            deadline = time.monotonic() + 2
+            while not caplog.records and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        assert logger._flusher is not None
+        assert len(caplog.records) == 1
+        assert caplog.records[0].getMessage().count("mark_as_read - success") == 64
+
+    def test_partial_batch_written_after_interval(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        logger = OperationLogger(flush_interval=0.05)
+
+        with caplog.at_level(logging.INFO, logger="apple_mail_mcp.security"):
+            logger.log_operation("delete_messages", {}, "success")
+            assert logger._flusher is not None
+            deadline = time.monotonic() + 2
+            while not caplog.records and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        assert len(caplog.records) == 1
+        assert "delete_messages - success" in caplog.records[0].getMessage()
+
+    def test_discards_oldest_operations(self) -> None:
+        logger = OperationLogger(max_entries=3)
+
+        for i in range(5):
+            logger.log_operation(f"op_{i}", {}, "success")
+
+        assert [op["operation"] for op in logger.get_recent_operations(limit=10)] == [
+            "op_2",
+            "op_3",
+            "op_4",
+        ]
 
 
 class TestValidateSendOperation:
@@ -60,6 +131,22 @@ class TestValidateSendOperation:
         assert is_valid is False
         assert "invalid" in error.lower()
 
+    def test_lists_every_invalid_email(self) -> None:
+        is_valid, error = validate_send_operation(
+            ["bad1", "ok@example.com"], cc=["bad2"], bcc=["also@example.com"]
+        )
+        assert is_valid is False
+        assert error == "Invalid email addresses: bad1, bad2"
+
+    @patch("apple_mail_mcp.security.iter_invalid_emails")
+    def test_too_many_recipients_rejected_before_validation(
+        self, mock_iter: MagicMock
+    ) -> None:
+        is_valid, error = validate_send_operation(["invalid"] * 60, cc=["invalid"] * 60)
+        assert is_valid is False
+        assert "too many" in error.lower()
+        mock_iter.assert_not_called()
+
     def test_too_many_recipients(self) -> None:
         recipients = [f"user{i}@example.com" for i in range(150)]
         is_valid, error = validate_send_operation(recipients)
@@ -88,3 +175,31 @@ class TestValidateBulkOperation:
     def test_exactly_max_items(self) -> None:
         is_valid, error = validate_bulk_operation(100, max_items=100)
         assert is_valid is True
+
+
+@patch("apple_mail_mcp.security.operation_logger", new_callable=OperationLogger)
+@patch("apple_mail_mcp.security.time.monotonic")
+class TestRateLimitCheck:
+    """Tests for rate_limit_check."""
+
+    def test_blocks_after_max_operations(
+        self, mock_time: MagicMock, op_logger: OperationLogger
+    ) -> None:
+        mock_time.return_value = 100.0
+
+        for _ in range(2):
+            assert rate_limit_check("send_email", max_operations=2) is True
+            op_logger.log_operation("send_email", {})
+
+        assert rate_limit_check("send_email", max_operations=2) is False
+        # Other operations are counted separately
+        assert rate_limit_check("move_messages", max_operations=2) is True
+
+    def test_window_slides(self, mock_time: MagicMock, op_logger: OperationLogger) -> None:
+        mock_time.return_value = 100.0
+        op_logger.log_operation("send_email", {})
+
+        mock_time.return_value = 159.0
+        assert rate_limit_check("send_email", window_seconds=60, max_operations=1) is False
+        mock_time.return_value = 160.0
+        assert rate_limit_check("send_email", window_seconds=60, max_operations=1) is True
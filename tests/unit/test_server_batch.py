@@ -0,0 +1,118 @@
+"""Unit tests for the batch_execute tool."""
+
+from typing import Any
+
+import pytest
+
+from apple_mail_mcp import server
+from apple_mail_mcp.exceptions import MailMessageNotFoundError
+
+
+class DummyMail:
+    """Mail stub recording bulk calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, list[str], dict[str, Any]]] = []
+
+    def mark_as_read(self, message_ids: list[str], **kwargs: Any) -> int:
+        self.calls.append(("mark_as_read", message_ids, kwargs))
+        return len(message_ids)
+
+    def flag_message(self, message_ids: list[str], **kwargs: Any) -> int:
+        self.calls.append(("flag_message", message_ids, kwargs))
+        return len(message_ids)
+
+    def get_message(self, message_id: str, **kwargs: Any) -> dict[str, Any]:
+        self.calls.append(("get_message", [message_id], kwargs))
+        if message_id == "404":
+            raise MailMessageNotFoundError("Message not found")
+        return {"id": message_id}
+
+
+@pytest.fixture
+def dummy(monkeypatch: pytest.MonkeyPatch) -> DummyMail:
+    """Install the mail stub on the server module."""
+    mail = DummyMail()
+    monkeypatch.setattr(server, "mail", mail)
+    return mail
+
+
+async def test_merges_consecutive_bulk_operations(dummy: DummyMail) -> None:
+    """Matching consecutive operations run as one connector call."""
+    result = await server.batch_execute.fn(
+        [
+            {"tool": "mark_as_read", "params": {"message_ids": ["1", "2"]}},
+            {"tool": "mark_as_read", "params": {"message_ids": ["3"]}},
+            {"tool": "mark_as_read", "params": {"message_ids": ["4"], "read": False}},
+            {"tool": "get_message", "params": {"message_id": "5"}},
+        ]
+    )
+
+    assert result["success"] is True
+    assert result["succeeded"] == 4
+    assert [call[:2] for call in dummy.calls] == [
+        ("mark_as_read", ["1", "2", "3"]),
+        ("mark_as_read", ["4"]),
+        ("get_message", ["5"]),
+    ]
+    assert result["results"][0]["merged_with"] == [1]
+    assert result["results"][1]["merged_with"] == [0]
+    assert "merged_with" not in result["results"][2]
+    assert result["results"][3]["message"] == {"id": "5"}
+
+
+async def test_reports_invalid_operations(dummy: DummyMail) -> None:
+    """Unknown tools and bad parameters fail only their own operation."""
+    result = await server.batch_execute.fn(
+        [
+            {"tool": "delete_messages", "params": {"message_ids": ["1"]}},
+            {"tool": "get_message", "params": {"bogus": True}},
+            {"tool": "flag_message", "params": {"message_ids": ["1"], "flag_color": "red"}},
+        ]
+    )
+
+    assert result["success"] is False
+    assert [r["success"] for r in result["results"]] == [False, False, True]
+    assert result["results"][0]["error_type"] == "validation_error"
+    assert result["results"][1]["error_type"] == "validation_error"
+    assert result["failed"] == 2
+
+
+async def test_validates_parameter_types(dummy: DummyMail) -> None:
+    """Parameters are checked against the tool's types, as for a direct call."""
+    result = await server.batch_execute.fn(
+        [
+            {"tool": "mark_as_read", "params": {"message_ids": "12345"}},
+            {"tool": "mark_as_read", "params": {"message_ids": ["1"], "read": "maybe"}},
+            {"tool": "mark_as_read", "params": {"message_ids": ["2"], "read": "no"}},
+        ]
+    )
+
+    assert [r["success"] for r in result["results"]] == [False, False, True]
+    assert result["results"][0]["error_type"] == "validation_error"
+    assert result["results"][1]["error_type"] == "validation_error"
+    assert dummy.calls == [
+        ("mark_as_read", ["2"], {"read": False, "account": None, "mailbox": None})
+    ]
+
+
+async def test_stop_on_error_skips_remaining(dummy: DummyMail) -> None:
+    """With stop_on_error, operations after a failure are not run."""
+    result = await server.batch_execute.fn(
+        [
+            {"tool": "get_message", "params": {"message_id": "404"}},
+            {"tool": "mark_as_read", "params": {"message_ids": ["1"]}},
+        ],
+        stop_on_error=True,
+    )
+
+    assert [r.get("error_type") for r in result["results"]] == ["message_not_found", "skipped"]
+    assert [call[0] for call in dummy.calls] == ["get_message"]
+
+
+async def test_rejects_empty_batch(dummy: DummyMail) -> None:
+    """An empty batch is a validation error."""
+    result = await server.batch_execute.fn([])
+
+    assert result["success"] is False
+    assert result["error_type"] == "validation_error"
@@ -0,0 +1,40 @@
+"""Unit tests for running connector calls off the event loop."""
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from apple_mail_mcp import server
+
+
+class SlowMail:
+    """Mail stub that blocks like an osascript call and tracks overlap."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def list_mailboxes(self, account: str, refresh: bool = False) -> list[dict[str, Any]]:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+        return [{"name": "INBOX", "unread_count": 0}]
+
+
+async def test_calls_run_concurrently_up_to_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Blocking calls overlap in threads, capped by the semaphore."""
+    mail = SlowMail()
+    monkeypatch.setattr(server, "mail", mail)
+    monkeypatch.setattr(server, "_mail_semaphore", asyncio.Semaphore(2))
+
+    results = await asyncio.gather(*(server.list_mailboxes.fn(f"Account{i}") for i in range(6)))
+
+    assert all(result["success"] for result in results)
+    assert mail.max_running == 2
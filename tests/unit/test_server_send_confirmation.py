@@ -1,5 +1,6 @@
 """Unit tests for server-side send confirmation behavior."""
 
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -41,6 +42,26 @@ class DummyMail:
         return self.attachment_result
 
 
+@pytest.fixture(scope="session")
+def attachment_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Write one attachment file shared by the tests that only pass it along."""
+    path = tmp_path_factory.mktemp("attachments") / "doc.txt"
+    path.write_text("content")
+    return path
+
+
+@pytest.fixture
+def dummy_mail(monkeypatch: pytest.MonkeyPatch) -> Callable[..., DummyMail]:
+    """Return a factory that installs a DummyMail as the server's connector."""
+
+    def make(**kwargs: bool) -> DummyMail:
+        dummy = DummyMail(**kwargs)
+        monkeypatch.setattr(server, "mail", dummy)
+        return dummy
+
+    return make
+
+
 @pytest.fixture
 def valid_send(monkeypatch: pytest.MonkeyPatch) -> None:
     """Make recipient validation deterministic for tests."""
@@ -51,108 +72,96 @@ def valid_send(monkeypatch: pytest.MonkeyPatch) -> None:
     )
 
 
-def test_send_email_requires_confirmation(
-    monkeypatch: pytest.MonkeyPatch,
-    valid_send: None,
-) -> None:
-    """Send should fail closed without explicit confirmation."""
-    dummy = DummyMail(send_result=True)
-    monkeypatch.setattr(server, "mail", dummy)
-
-    result = server.send_email.fn(
-        subject="Test",
-        body="Body",
-        to=["recipient@example.com"],
-    )
-
-    assert result["success"] is False
-    assert result["error_type"] == "confirmation_required"
-    assert result["confirmation_required"] is True
-    assert dummy.send_calls == 0
-
-
-def test_send_email_confirmed_success(
-    monkeypatch: pytest.MonkeyPatch,
-    valid_send: None,
-) -> None:
-    """Confirmed send should call connector and return success."""
-    dummy = DummyMail(send_result=True)
-    monkeypatch.setattr(server, "mail", dummy)
-
-    result = server.send_email.fn(
-        subject="Test",
-        body="Body",
-        to=["recipient@example.com"],
-        confirmed=True,
-    )
-
-    assert result["success"] is True
-    assert dummy.send_calls == 1
-
-
-def test_send_email_confirmed_false_result_is_error(
-    monkeypatch: pytest.MonkeyPatch,
+@pytest.mark.parametrize(
+    ("with_attachments", "confirmed", "connector_result", "error_type", "calls"),
+    [
+        (False, False, True, "confirmation_required", 0),
+        (False, True, True, None, 1),
+        (False, True, False, "send_error", 1),
+        (True, False, True, "confirmation_required", 0),
+        (True, True, False, "send_error", 1),
+    ],
+    ids=[
+        "requires_confirmation",
+        "confirmed_success",
+        "confirmed_false_result_is_error",
+        "with_attachments_requires_confirmation",
+        "with_attachments_false_result_is_error",
+    ],
+)
+async def test_send_confirmation(
+    dummy_mail: Callable[..., DummyMail],
     valid_send: None,
+    attachment_path: Path,
+    with_attachments: bool,
+    confirmed: bool,
+    connector_result: bool,
+    error_type: str | None,
+    calls: int,
 ) -> None:
-    """Connector false return should map to send_error."""
-    dummy = DummyMail(send_result=False)
-    monkeypatch.setattr(server, "mail", dummy)
-
-    result = server.send_email.fn(
-        subject="Test",
-        body="Body",
-        to=["recipient@example.com"],
-        confirmed=True,
-    )
-
-    assert result["success"] is False
-    assert result["error_type"] == "send_error"
-    assert dummy.send_calls == 1
-
-
-def test_send_email_with_attachments_requires_confirmation(
-    monkeypatch: pytest.MonkeyPatch,
+    """Sends fail closed without confirmation, and a false connector result is an error."""
+    dummy = dummy_mail(send_result=connector_result, attachment_result=connector_result)
+    message: dict[str, Any] = {
+        "subject": "Test",
+        "body": "Body",
+        "to": ["recipient@example.com"],
+        "confirmed": confirmed,
+    }
+
+    if with_attachments:
+        result = await server.send_email_with_attachments.fn(
+            attachments=[str(attachment_path)], **message
+        )
+        made_calls = dummy.attachment_calls
+    else:
+        result = await server.send_email.fn(**message)
+        made_calls = dummy.send_calls
+
+    assert result["success"] is (error_type is None)
+    assert result.get("error_type") == error_type
+    if error_type == "confirmation_required":
+        assert result["confirmation_required"] is True
+    assert made_calls == calls
+
+
+async def test_send_email_with_attachments_reports_missing_files(
+    dummy_mail: Callable[..., DummyMail],
     valid_send: None,
     tmp_path: Path,
 ) -> None:
-    """Attachment send should fail closed without confirmation."""
-    dummy = DummyMail(attachment_result=True)
-    monkeypatch.setattr(server, "mail", dummy)
-    attachment = tmp_path / "doc.txt"
-    attachment.write_text("content")
+    """Only the attachments that do not exist are reported, before sending."""
+    dummy = dummy_mail()
+    present = tmp_path / "doc.txt"
+    present.write_text("content")
+    missing = tmp_path / "missing.txt"
 
-    result = server.send_email_with_attachments.fn(
+    result = await server.send_email_with_attachments.fn(
         subject="Test",
         body="Body",
         to=["recipient@example.com"],
-        attachments=[str(attachment)],
+        attachments=[str(present), str(missing)],
+        confirmed=True,
     )
 
-    assert result["success"] is False
-    assert result["error_type"] == "confirmation_required"
-    assert result["confirmation_required"] is True
+    assert result["error_type"] == "file_not_found"
+    assert str(missing) in result["error"]
+    assert str(present) not in result["error"]
     assert dummy.attachment_calls == 0
 
 
-def test_send_email_with_attachments_false_result_is_error(
-    monkeypatch: pytest.MonkeyPatch,
+async def test_send_email_confirmation_previews_body(
+    dummy_mail: Callable[..., DummyMail],
     valid_send: None,
-    tmp_path: Path,
 ) -> None:
-    """Connector false return should map to send_error for attachments."""
-    dummy = DummyMail(attachment_result=False)
-    monkeypatch.setattr(server, "mail", dummy)
-    attachment = tmp_path / "doc.txt"
-    attachment.write_text("content")
+    """Long bodies are cut to 100 characters in the confirmation details."""
+    dummy_mail()
 
-    result = server.send_email_with_attachments.fn(
-        subject="Test",
-        body="Body",
-        to=["recipient@example.com"],
-        attachments=[str(attachment)],
-        confirmed=True,
+    long_result = await server.send_email.fn(
+        subject="Test", body="x" * 150, to=["recipient@example.com"]
+    )
+    short_result = await server.send_email.fn(
+        subject="Test", body="x" * 100, to=["recipient@example.com"]
     )
 
-    assert result["success"] is False
-    assert result["error_type"] == "send_error"
-    assert dummy.attachment_calls == 1
+    assert long_result["details"]["body_preview"] == "x" * 100 + "..."
+    assert short_result["details"]["body_preview"] == "x" * 100
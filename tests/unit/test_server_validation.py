@@ -0,0 +1,63 @@
+"""Unit tests for argument checks done before a tool touches Mail."""
+
+from typing import Any
+
+import pytest
+
+from apple_mail_mcp import server
+
+
+class UnusedMail:
+    """Mail stub that fails the test if any connector method is called."""
+
+    def __getattr__(self, name: str) -> Any:
+        raise AssertionError(f"connector.{name} should not be called")
+
+
+@pytest.fixture(autouse=True)
+def unused_mail(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Install the failing mail stub on the server module."""
+    monkeypatch.setattr(server, "mail", UnusedMail())
+
+
+@pytest.mark.parametrize(
+    ("tool", "kwargs"),
+    [
+        (server.mark_as_read, {}),
+        (server.get_messages, {}),
+        (server.flag_message, {"flag_color": "red"}),
+        (server.move_messages, {"destination_mailbox": "Archive", "account": "Gmail"}),
+        (server.delete_messages, {}),
+    ],
+)
+async def test_too_many_ids_rejected_up_front(tool: Any, kwargs: dict[str, Any]) -> None:
+    """Every bulk tool rejects more than 100 IDs without calling the connector."""
+    ids = [str(i) for i in range(101)]
+
+    result = await tool.fn(message_ids=ids, **kwargs)
+
+    assert result["success"] is False
+    assert result["error_type"] == "validation_error"
+    assert "maximum is 100" in result["error"]
+
+
+async def test_empty_move_is_a_no_op() -> None:
+    """Moving no messages succeeds without calling the connector."""
+    result = await server.move_messages.fn(
+        message_ids=[], destination_mailbox="Archive", account="Gmail"
+    )
+
+    assert result == {"success": True, "count": 0, "message": "No messages to move"}
+
+
+async def test_return_fields_projects_success_only() -> None:
+    """return_fields trims successful responses but never hides an error."""
+    moved = await server.move_messages.fn(
+        message_ids=[], destination_mailbox="Archive", account="Gmail", return_fields=["count"]
+    )
+    rejected = await server.delete_messages.fn(
+        message_ids=[str(i) for i in range(101)], return_fields=["count"]
+    )
+
+    assert moved == {"success": True, "count": 0}
+    assert rejected["error_type"] == "validation_error"
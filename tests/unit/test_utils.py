@@ -4,13 +4,19 @@ import pytest
 
 from apple_mail_mcp.utils import (
     escape_applescript_string,
+    find_invalid_email,
     format_applescript_list,
+    iter_invalid_emails,
     parse_applescript_list,
     parse_date_filter,
     sanitize_input,
+    sanitize_mailbox_name,
     validate_email,
+    validate_flag_color,
 )
 
+VALID_FLAG_COLORS = ["none", "orange", "red", "yellow", "blue", "green", "purple", "gray"]
+
 
 class TestEscapeAppleScriptString:
     """Tests for escape_applescript_string."""
@@ -55,6 +61,10 @@ class TestParseAppleScriptList:
         result = parse_applescript_list("{item}")
         assert result == ["item"]
 
+    def test_blank_items_dropped(self) -> None:
+        assert parse_applescript_list(" { } ") == []
+        assert parse_applescript_list("{a, , b}") == ["a", "b"]
+
 
 class TestFormatAppleScriptList:
     """Tests for format_applescript_list."""
@@ -71,6 +81,10 @@ class TestFormatAppleScriptList:
         result = format_applescript_list(['hello "world"'])
         assert result == '{"hello \\"world\\""}'
 
+    def test_escapes_each_item(self) -> None:
+        result = format_applescript_list(['a"', "b\\", "c"])
+        assert result == '{"a\\"", "b\\\\", "c"}'
+
 
 class TestParseDateFilter:
     """Tests for parse_date_filter."""
@@ -105,6 +119,31 @@ class TestValidateEmail:
         assert validate_email("@example.com") is False
         assert validate_email("user@") is False
         assert validate_email("user example.com") is False
+        assert validate_email("user@example.com\n") is False
+
+
+class TestFindInvalidEmail:
+    """Tests for find_invalid_email."""
+
+    def test_all_valid(self) -> None:
+        assert find_invalid_email(["a@example.com", "b@example.org"]) is None
+        assert find_invalid_email([]) is None
+
+    def test_returns_first_invalid(self) -> None:
+        assert find_invalid_email(["a@example.com", "bad", "worse@"]) == "bad"
+
+
+class TestIterInvalidEmails:
+    """Tests for iter_invalid_emails."""
+
+    def test_yields_invalid_in_order(self) -> None:
+        emails = ["a@example.com", "bad", "b@example.org", "worse@"]
+        assert list(iter_invalid_emails(emails)) == ["bad", "worse@"]
+
+    def test_is_lazy(self) -> None:
+        invalid = iter_invalid_emails(iter(["bad", "a@example.com", "worse@"]))
+        assert next(invalid) == "bad"
+        assert list(invalid) == ["worse@"]
 
 
 class TestSanitizeInput:
@@ -126,3 +165,30 @@ class TestSanitizeInput:
         long_string = "a" * 20000
         result = sanitize_input(long_string)
         assert len(result) == 10000
+
+
+class TestSanitizeMailboxName:
+    """Tests for sanitize_mailbox_name."""
+
+    def test_validates_mailbox_name(self) -> None:
+        """Test mailbox name validation."""
+        # Should remove dangerous characters
+        assert sanitize_mailbox_name("Valid Name") == "Valid Name"
+        assert sanitize_mailbox_name("../../../") == ""
+        assert sanitize_mailbox_name("Name<>:") == "Name"
+        # Separators removed before ".." is, so they cannot split one up
+        assert sanitize_mailbox_name("./.") == ""
+
+
+class TestValidateFlagColor:
+    """Tests for validate_flag_color."""
+
+    @pytest.mark.parametrize("color", VALID_FLAG_COLORS)
+    def test_flag_color_validation(self, color: str) -> None:
+        """Test flag color validation."""
+        assert validate_flag_color(color) is True
+
+    def test_flag_color_validation_rejects_unknown(self) -> None:
+        """Test unknown and empty flag colors are rejected."""
+        assert validate_flag_color("invalid") is False
+        assert validate_flag_color("") is False